@@ -1,13 +1,48 @@
-from .b_scraper import ConsultaAmigable
-from .a_config import RouteConfig, LevelConfig
-from .e_export_yaml import guardar_ruta_yaml, cargar_ruta_yaml
+"""
+Los nombres públicos se importan al primer uso (PEP 562): `from consulta_amigable
+import RouteConfig` no carga Playwright, pandas ni questionary. `ConsultaAmigable`
+tampoco: Playwright, httpx y pandas se importan en los métodos que los usan.
+"""
+
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .a_config import LevelConfig, RouteConfig
+    from .b_scraper import ConsultaAmigable
+    from .e_export_yaml import cargar_ruta_yaml, guardar_ruta_yaml
+    from .j_network import BlockingProfile
+    from .m_cache import ResponseCache
+    from .o_store import PartitionedStore
+    from .p_metrics import RunMetrics
+    from .w_governor import ConcurrencyGovernor
 
 # from .a_config import ROUTE_MUNICIPALIDADES, ROUTE_SALUD, RouteConfig
 
-__all__ = [
-    "ConsultaAmigable",
-    "RouteConfig",
-    "LevelConfig",
-    "guardar_ruta_yaml",
-    "cargar_ruta_yaml",
-]
+# Nombre público -> módulo que lo define
+_EXPORTS = {
+    "ConsultaAmigable": ".b_scraper",
+    "RouteConfig": ".a_config",
+    "LevelConfig": ".a_config",
+    "guardar_ruta_yaml": ".e_export_yaml",
+    "cargar_ruta_yaml": ".e_export_yaml",
+    "BlockingProfile": ".j_network",
+    "ResponseCache": ".m_cache",
+    "PartitionedStore": ".o_store",
+    "RunMetrics": ".p_metrics",
+    "ConcurrencyGovernor": ".w_governor",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *__all__})
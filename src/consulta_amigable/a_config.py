@@ -40,6 +40,8 @@ class RouteConfig(BaseModel):
     route_name: str
     output_path: str
     levels: list[LevelConfig] = Field(default_factory=list)
+    # Ruta grabada sobre la consulta mensual (URL_MENSUAL): se ejecuta por año y mes
+    mensual: bool = False
 
 # =====================
 # 2: Selectores CSS
@@ -54,4 +56,7 @@ class Locators:
     table_data = "table.Data"
     buttons = "input[type='submit']"
     text_rows = "td[align='left']"
+    # Filas de encabezados (la segunda contiene los subencabezados agrupados)
+    header_row_0 = "ctl00_CPH1_Mt0_Row0"
+    header_row_1 = "ctl00_CPH1_Mt0_Row1"
     
\ No newline at end of file
@@ -27,85 +27,343 @@ Usage:
 # =====================
 # Importación de librerías
 # =====================
+import asyncio
+import copy
+import json
+import logging
+import time
 import warnings
+from contextlib import asynccontextmanager, nullcontext
 from pathlib import Path
-from typing import Iterable
-from playwright.async_api import async_playwright, TimeoutError, Page
-from rich.console import Console
+from typing import TYPE_CHECKING, Iterable, Literal
 
 from .a_config import LevelConfig, RouteConfig, Locators
-from .c_cleaner import CCleaner
-from .f_logger import setup_logger
+from .f_logger import configure_default_logger
 from .e_export_yaml import guardar_ruta_yaml, cargar_ruta_yaml
-from .d_cli import ConsultaCLI
+from .g_frontier import FrontierQueue, PathStep, SubtreeTask, first_iterate_level, keeps_table, shard_range
+from .j_network import BlockingProfile, RequestBlocker
+from .k_checkpoint import RunJournal
+from .m_cache import ResponseCache
+from .p_metrics import RunMetrics
+from .s_period import MESES, expand_periods, period_key, period_label, period_prefix, split_period
+from .v_buffer import RowBuffer
+from .w_governor import ConcurrencyGovernor
+
+# Playwright, httpx, pandas y rich se importan en los métodos que los usan:
+# importar `ConsultaAmigable` no los carga (ver `consulta_amigable.__init__`)
+if TYPE_CHECKING:
+    from playwright.async_api import Page
+    from rich.console import Console
+
+    from .c_cleaner import CCleaner
+    from .h_http_engine import NavegadorPage
+    from .i_snapshot import TableSnapshot
+    from .l_sink import RowSink
+    from .q_pool import PagePool
+    from .r_plan import SharedPrefixRunner
+
+logger = logging.getLogger("consulta_amigable")
+
+
+# Envía desde frame0 un formulario con los campos de un postback guardado
+SUBMIT_FORM_JS = """
+([action, fields]) => {
+    const form = document.createElement("form");
+    form.method = "post";
+    form.action = action;
+    for (const [name, value] of Object.entries(fields)) {
+        const input = document.createElement("input");
+        input.type = "hidden";
+        input.name = name;
+        input.value = value;
+        form.appendChild(input);
+    }
+    document.body.appendChild(form);
+    form.submit();
+}
+"""
+
 
-logger = setup_logger()
+class NavigationDesync(Exception):
+    """
+    La página de `frame0` no es la que corresponde al nivel actual de la ruta
+    (p. ej. porque un `go_back` no llegó a navegar).
+    """
 
 
 # =====================
 # Funciones de Utilidad
 # =====================
 class ConsultaAmigable:
+    # Consulta mensual: la página de la consulta, donde el año y el mes se eligen
+    # en sus listas desplegables, o una plantilla con `{}` para el año y el mes
     URL_MENSUAL = "https://apps5.mineco.gob.pe/transparencia/mensual/"
     URL_ANUAL = "https://apps5.mineco.gob.pe/transparencia/Navegador/default.aspx?y={}&ap=ActProy"
 
-    def __init__(self, timeout: int = 100, headless: bool = False):
+    def __init__(
+        self,
+        timeout: int | None = None,
+        headless: bool = False,
+        slow_mo: int = 0,
+        blocking: BlockingProfile | bool = True,
+        cache: ResponseCache | str | Path | None = None,
+        retries: int = 2,
+        backoff: float = 0.5,
+        navigation: Literal["back", "jump"] = "back",
+    ):
+        """
+        Parameters
+        ----------
+        timeout : int, optional
+            Obsoleto, equivale a `slow_mo`.
+        headless : bool, optional
+            Ejecuta Chromium sin ventana.
+        slow_mo : int, optional
+            Pausa en ms antes de cada acción de Playwright. Solo para depurar: la
+            navegación espera a que cada postback termine, no a un tiempo fijo.
+        blocking : BlockingProfile or bool, optional
+            Solicitudes a bloquear en los contextos del navegador (imágenes, hojas
+            de estilo, fuentes, analítica...). True usa `BlockingProfile()` por
+            defecto y False desactiva el bloqueo.
+        cache : ResponseCache or str or Path, optional
+            Caché en disco de las tablas ya extraídas (o directorio donde crearla).
+            Los años cerrados se sirven desde disco sin volver a navegarlos; los del
+            año en curso vencen según `ResponseCache.current_year_ttl`.
+        retries : int, optional
+            Reintentos de cada paso que falla (timeout, error de Playwright o de
+            HTTP) o que encuentra una página distinta de la esperada. Antes de
+            reintentar se vuelve a la página del nivel repitiendo su camino de
+            clicks desde la página inicial del año.
+        backoff : float, optional
+            Espera en segundos antes del primer reintento; se duplica en cada uno.
+        navigation : {"back", "jump"}, optional
+            Cómo pasar de una fila a la siguiente en los niveles `iterate`.
+            "back" (por defecto) retrocede con `go_back` hasta la tabla del nivel y
+            hace click en la fila y el botón. "jump" guarda el formulario de la
+            tabla del nivel (campos ocultos de WebForms) y entra a cada fila
+            reenviando ese postback desde donde esté la página: una sola carga por
+            fila y ningún `go_back`.
+        """
+        if timeout is not None:
+            warnings.warn(
+                "El parámetro timeout está obsoleto: la navegación ya espera a que cada "
+                "postback termine. Usa slow_mo solo para depurar.",
+                DeprecationWarning,
+                stacklevel=2,
+            )
+            slow_mo = timeout
         self._headless = headless
-        self._timeout = timeout
+        self._slow_mo = slow_mo
+        if blocking is True:
+            blocking = BlockingProfile()
+        self._blocker = RequestBlocker(blocking) if blocking else None
+        if isinstance(cache, (str, Path)):
+            cache = ResponseCache(cache)
+        self._cache = cache
+        self._retries = retries
+        self._backoff = backoff
+        if navigation not in ("back", "jump"):
+            raise ValueError(f"Navegación no soportada: {navigation}")
+        self._navigation = navigation
         self._playwright = None
         self._browser = None
-        self._page: Page
+        self._pool: PagePool | None = None
+        self._plan: SharedPrefixRunner | None = None
+        self._page: Page | None = None
         self._cleaner: CCleaner
-        self.logger = logger
+        # El logger se configura al crear el primer scraper, no al importar el paquete
+        self.logger = configure_default_logger()
 
         self.route_config: RouteConfig
+        # Años (consulta anual) o periodos año-mes como 202403 (consulta mensual)
         self.years: list[int]
         self._year = 0
 
-        self._extracted_data = []
+        self._extracted_data = RowBuffer()
         self._headers = []
         self._context = {}
+        self._order: dict[str, int] = {}
+        self._journal: RunJournal | None = None
+        self._sink: RowSink | None = None
+        # Tablas ya emitidas (periodo, clave de contexto, nivel), compartidas por
+        # los workers: un paso reintentado no las vuelve a enviar
+        self._emitted: set[tuple] = set()
         self._clicks_number = 0
+        self._extraction_times: list[float] = []
+        self.metrics = RunMetrics()
+        self._completed = False
         self.level_index = 0
-
-        self.console = Console()
-        if timeout < 50:
-            warnings.warn(
-                "Un timeout menor a 50 puede llevar a inconsistencias con la interacción de la página"
-            )
+        # Bloque (i, k) de las filas del primer nivel `iterate` a recorrer en cada
+        # periodo (ver `t_process` y `u_shard`); los periodos sin bloque se
+        # recorren completos
+        self._blocks: dict[int, tuple[int, int]] = {}
+        # Límite adaptativo de postbacks en vuelo (`navegar_ruta(adaptive=...)`),
+        # compartido por todos los workers
+        self._governor: ConcurrencyGovernor | None = None
+        self._console: Console | None = None
+
+    @property
+    def console(self) -> "Console":
+        from rich.console import Console
+
+        if self._console is None:
+            self._console = Console()
+        return self._console
 
     async def _initialize_driver(self):
         """
         Inicializa el driver de Playwright.
         """
+        await self._launch_browser()
+        self._page = await self._new_page()
+
+    async def _launch_browser(self):
+        """
+        Lanza Playwright y Chromium, sin abrir ninguna página.
+        """
+        from playwright.async_api import async_playwright
+
         self._playwright = await async_playwright().start()
         self._browser = await self._playwright.chromium.launch(
-            headless=self._headless, slow_mo=self._timeout
+            headless=self._headless, slow_mo=self._slow_mo
         )
+
+    async def _new_page(self) -> "Page":
+        """
+        Abre un contexto de navegador aislado (cookies, historial y sesión propios)
+        sobre `self._browser` y retorna una página nueva dentro de él. Si hay un
+        `PagePool` (ver `navegar_rutas`), la página se toma del pool.
+        """
+        if self._pool:
+            return await self._pool.acquire()
+        return await self._open_page()
+
+    async def _open_page(self) -> "Page":
         context = await self._browser.new_context(
             viewport={"width": 1000, "height": 720}
         )
-        self._page = await context.new_page()
-        self._page.set_default_timeout(15_000)
-        self._page.set_default_navigation_timeout(20_000)
+        if self._blocker:
+            await self._blocker.attach(context)
+        page = await context.new_page()
+        page.set_default_timeout(15_000)
+        page.set_default_navigation_timeout(20_000)
+        return page
+
+    async def _spawn_worker(self) -> "ConsultaAmigable":
+        """
+        Crea un worker que comparte el navegador y la ruta con esta instancia, pero
+        con su propio contexto de navegador y su propio estado de navegación
+        (`level_index`, `_context`, `_headers`, `_extracted_data`, clicks).
+        """
+        worker = copy.copy(self)
+        worker._page = await self._new_page()
+        worker._extracted_data = RowBuffer()
+        worker._headers = []
+        worker._context = {}
+        worker._order = {}
+        worker._clicks_number = 0
+        worker._extraction_times = []
+        worker.level_index = 0
+        worker._year = 0
+        return worker
+
+    def _spawn_route(self) -> "ConsultaAmigable":
+        """
+        Crea una instancia para ejecutar otra ruta con `navegar_ruta`. Comparte el
+        navegador, el pool de páginas, el bloqueador y la caché; todo el estado de
+        la ejecución (ruta, años, bitácora, sink, métricas) es propio.
+        """
+        route = copy.copy(self)
+        route._page = None
+        route._extracted_data = RowBuffer()
+        route._headers = []
+        route._context = {}
+        route._order = {}
+        route._journal = None
+        route._sink = None
+        route._emitted = set()
+        route._clicks_number = 0
+        route._extraction_times = []
+        route.metrics = RunMetrics()
+        route._completed = False
+        route.level_index = 0
+        route._year = 0
+        return route
+
+    async def _close_page(self) -> None:
+        """
+        Cierra el contexto de `self._page`, o lo devuelve al pool si lo hay.
+        """
+        if self._pool:
+            await self._pool.release(self._page)
+        else:
+            await self._page.context.close()
 
     async def _cerrar_navegador(self):
         """
         Cierra el navegador y libera los recursos.
         """
+        if self._blocker:
+            await self._blocker.close()
         if self._browser:
             await self._browser.close()
         if self._playwright:
             await self._playwright.stop()
 
-    async def _navigate_to_url(self, year: str | int, mensual: bool = False):
+    async def _navigate_to_url(self, year: str | int):
         """
-        Navega a la URL especificada utilizando el driver proporcionado.
+        Navega a la consulta anual del año o, si `year` es un periodo mensual
+        (202403), a la consulta mensual (`URL_MENSUAL`) de ese mes.
         """
-        if not mensual:
-            await self._page.goto(self.URL_ANUAL.format(str(year)))
-        else:
-            await self._page.goto(self.URL_MENSUAL)
+        from .h_http_engine import monthly_url_template
+
+        anio, mes = split_period(year)
+        with self.metrics.time("navigate"):
+            if mes is None:
+                await self._page.goto(self.URL_ANUAL.format(str(anio)))
+            elif monthly_url_template(self.URL_MENSUAL):
+                await self._page.goto(self.URL_MENSUAL.format(anio, mes))
+            else:
+                await self._page.goto(self.URL_MENSUAL)
+                await self._select_period(anio, mes)
+
+    async def _select_period(self, anio: int, mes: int) -> None:
+        """
+        Elige `anio` y `mes` en las listas desplegables de la consulta mensual,
+        enviando el mismo postback que WebForms envía al cambiarlas.
+        """
+        iframe = self._page.frame(Locators.main_frame)
+        await iframe.wait_for_selector(Locators.table_data)
+        for name, value in (await self._form_state()).period_fields(anio, mes):
+            action, fields = (await self._form_state()).select_data(name, value)
+            async with self._postback():
+                await self._page.frame(Locators.main_frame).evaluate(
+                    SUBMIT_FORM_JS, [action, fields]
+                )
+
+    @asynccontextmanager
+    async def _postback(self):
+        """
+        Espera a que la acción ejecutada dentro del bloque (click en un botón,
+        `history.back()`) termine de navegar `frame0` y a que la nueva
+        `table.Data` esté en el DOM, en lugar de esperar un tiempo fijo. Con un
+        gobernador, espera además a que haya cupo para otra navegación en vuelo.
+        """
+        iframe = self._page.frame(Locators.main_frame)
+        async with self._governor.slot() if self._governor else nullcontext():
+            async with iframe.expect_navigation(wait_until="domcontentloaded"):
+                yield
+            await iframe.wait_for_selector(Locators.table_data, state="attached")
+
+    async def _go_back(self) -> None:
+        """
+        Vuelve a la página anterior de `frame0`. `page.go_back()` espera una
+        navegación del frame principal que nunca llega (solo navega el iframe), por
+        eso se usa `history.back()` y se espera la navegación del propio iframe.
+        """
+        with self.metrics.time("go_back", self._level_name()):
+            async with self._postback():
+                await self._page.evaluate("history.back()")
 
     async def _click_on_element(self, element_text: str | Locators, row: bool = True):
         """
@@ -113,96 +371,90 @@ class ConsultaAmigable:
         """
         iframe = self._page.frame(Locators.main_frame)
         if row:
-            await (
-                iframe.locator(Locators.table_data)
-                .locator(Locators.text_rows)
-                .filter(has_text=element_text)
-                .click()
-            )
+            with self.metrics.time("click_row", self._level_name()):
+                await (
+                    iframe.locator(Locators.table_data)
+                    .locator(Locators.text_rows)
+                    .filter(has_text=element_text)
+                    .click()
+                )
         else:
             button = iframe.locator(Locators.buttons).filter(has_text=element_text)
-            await button.first.click()
+            with self.metrics.time("click_button", self._level_name()):
+                async with self._postback():
+                    await button.first.click()
         # if isinstance(element, str):
         #     await iframe.locator(element).click()
         # elif isinstance(element, Locator):
         #     await element.click()
         self._clicks_number += 1
 
-    async def _extract_table_data(self):
+    async def _form_state(self) -> "NavegadorPage":
         """
-        Extrae los datos de una tabla con clase 'Data' y retorna una lista de listas.
-
-        Returns
-        -------
-        list
-            Lista de listas donde cada sublista contiene los datos de una fila de la tabla.
+        Formulario WebForms de la página actual de `frame0` (acción, campos ocultos,
+        radios de las filas y botones), leído con el mismo parser que `HttpEngine`.
         """
-        # Lista para almacenar los datos extraídos
-        datos_tabla = []
+        from .h_http_engine import parse_navegador_page
+
+        iframe = self._page.frame(Locators.main_frame)
+        return parse_navegador_page(iframe.url, await iframe.content())
 
-        # Seleccionar todas las filas de la tabla con clase 'Data'
+    async def _jump(self, parent: "NavegadorPage", row_text: str, button_text: str) -> None:
+        """
+        Equivale a hacer click en `row_text` y en `button_text` sobre la página
+        `parent`, pero reenviando su postback desde la página actual, sin volver a
+        ella. El estado de WebForms viaja en los campos ocultos, así que el servidor
+        responde lo mismo que al click.
+        """
+        action, fields = parent.postback_data(row_text, button_text)
         iframe = self._page.frame(Locators.main_frame)
-        filas = await iframe.locator(Locators.table_data).locator("tr").all()
+        with self.metrics.time("jump", self._level_name()):
+            async with self._postback():
+                await iframe.evaluate(SUBMIT_FORM_JS, [action, fields])
+        self._clicks_number += 1
+        self.level_index += 1
 
-        # Extraer los datos de cada fila
-        for i, fila in enumerate(filas):
-            datos = await fila.locator("td").all_inner_texts()
-            datos = [dato.replace(",", "").strip() for dato in datos]
+    def _level_name(self) -> str:
+        levels = getattr(self, "route_config", None)
+        if levels is None or self.level_index >= len(levels.levels):
+            return ""
+        return levels.levels[self.level_index].name
 
-            # Agregar datos solo si la fila tiene contenido
-            if datos:
-                datos_tabla.append(datos)
-        self.logger.info(f"Se extrajeron datos de {int(len(filas))} filas.")
+    async def _snapshot_table(self) -> "TableSnapshot":
+        """
+        Captura encabezados y filas de `table.Data` con una sola llamada a
+        `evaluate` y registra la latencia de la extracción.
+        """
+        from .i_snapshot import take_snapshot
 
-        return datos_tabla
+        iframe = self._page.frame(Locators.main_frame)
+        snapshot = await take_snapshot(iframe)
+        self._extraction_times.append(snapshot.elapsed)
+        return snapshot
 
-    async def _get_final_headers(self) -> list:
+    async def _extract_table_data(self):
         """
-        Extrae encabezados manteniendo el orden de la tabla, omitiendo la primera columna
-        vacía (botón) y obteniendo los niveles inferiores cuando hay agrupación.
+        Extrae los datos de una tabla con clase 'Data' y retorna una lista de listas.
+        Si aún no hay encabezados, se guardan los de la misma captura.
 
         Returns
         -------
         list
-            Lista de encabezados extraídos de la tabla.
+            Lista de listas donde cada sublista contiene los datos de una fila de la tabla.
         """
-        if not self._headers:
-            try:
-                iframe = self._page.frame(Locators.main_frame)
-                primer_encabezado = iframe.locator("tr[id='ctl00_CPH1_Mt0_Row0']")
-                segundo_encabezado = iframe.locator("tr[id='ctl00_CPH1_Mt0_Row1']")
-                tds = await primer_encabezado.locator("td").all()
-
-                idx_inferior = (
-                    0  # Índice para recorrer fila_inferior cuando haya agrupación
-                )
+        snapshot = await self._snapshot_table()
+        level = self._level_name()
+        self.metrics.observe("extract", level, snapshot.elapsed)
+        self.metrics.add_rows(level, len(snapshot.rows))
+        if not self._headers and snapshot.headers:
+            self._headers = snapshot.headers
+            self.logger.info(f"Encabezados extraídos: {self._headers}")
+        self.logger.info(
+            f"Se extrajeron datos de {len(snapshot.rows)} filas "
+            f"en {snapshot.elapsed * 1000:.0f} ms."
+        )
 
-                for i, td in enumerate(tds):
-                    # Omitir la primera celda si está vacía (botón)
-                    if i == 0:
-                        continue
-
-                    colspan = await td.get_attribute("colspan")
-
-                    if (
-                        colspan
-                    ):  # Si hay agrupación, tomar encabezados del nivel inferior
-                        for _ in range(int(colspan)):
-                            encabezado = (
-                                await segundo_encabezado.locator("td")
-                                .nth(idx_inferior)
-                                .inner_text()
-                            )
-                            self._headers.append(encabezado.strip())
-                            idx_inferior += 1
-                    else:  # Si no hay agrupación, tomar el texto directamente
-                        encabezado = await td.inner_text()
-                        self._headers.append(encabezado.strip())
-
-                self.logger.info(f"Encabezados extraídos: {self._headers}")
-
-            except Exception as e:
-                print(f"Error al obtener encabezados: {e}")
+        return snapshot.rows
 
     async def _assert_extraction(self) -> None:
         """
@@ -212,38 +464,254 @@ class ConsultaAmigable:
         iframe = self._page.frame(Locators.main_frame)
         await iframe.wait_for_selector(Locators.table_data)
         if level.extract_table:
-            if not self._headers:
-                await self._get_final_headers()
-
             # self.logger.info(f"📊 Extrayendo datos de la tabla: {self.route_config.levels[self.level_index].name}")
             table_data = await self._extract_table_data()
 
-            # Construir cada fila incluyendo los niveles donde hubo iteración
-            for row in table_data:
-                formatted_row = (
-                    [self._year]
-                    + [self._context[level] for level in self._context.keys()]
-                    + row
+            if self._cache:
+                self._cache.put(
+                    "playwright", self._year, self._click_path(self.level_index), "table",
+                    {"headers": self._headers, "rows": table_data},
                 )
-                self._extracted_data.append(formatted_row)
+            path, key = self._context_path(self.level_index)
+            self._emit_rows(table_data, path, key, self.level_index)
 
-    async def _navigate_levels(self) -> None:
+    def _emit_rows(
+        self, table_data: list, path: list[str], key: tuple[int, ...], level_index: int
+    ) -> None:
         """
-        Navega a través de los niveles definidos en la configuración.
+        Agrega año y contexto a las filas de la tabla que extrajo el nivel
+        `level_index` y las envía al sink (o a `_extracted_data`) y a la bitácora.
+        Una tabla que ya se emitió (p. ej. en un intento anterior de un paso que
+        `_with_recovery` repite) se ignora, igual que las tablas comunes a todos
+        los bloques de un periodo que no le tocan a este (ver `keeps_table`).
+        """
+        if not keeps_table(self.route_config.levels, level_index, self._blocks.get(self._year)):
+            return
+        table_id = (self._year, tuple(key), level_index)
+        if table_id in self._emitted:
+            return
+        self._emitted.add(table_id)
+
+        if self._journal and self._journal.has_previous_rows(self._year, key, level_index):
+            # Al reanudar, las filas de ejecuciones anteriores ya se cargaron en
+            # `_extracted_data` (o están en el sink)
+            return
+
+        # Cada fila lleva los niveles donde hubo iteración
+        prefix = period_prefix(self._year) + [self._context[level] for level in self._context.keys()]
+        if self._sink is None:
+            # En memoria el prefijo se codifica una sola vez por tabla
+            self._extracted_data.append_table(prefix, table_data)
+        else:
+            self._write_to_sink([prefix + row for row in table_data])
 
-        Parameters
-        ----------
-        custom_row : str, optional
-            Fila personalizada para navegar, por defecto es cadena vacía.
+        if self._journal:
+            if self._headers and not self._journal.headers:
+                self._journal.record_headers(self._headers)
+            self._journal.record_rows(self._year, path, key, table_data, level_index, prefix)
+
+    def _write_to_sink(self, rows: list) -> None:
         """
-        level = self.route_config.levels[self.level_index]
+        Envía filas ya formateadas al sink; la primera vez fija sus columnas.
+        """
+        if self._sink.columns is None:
+            self._sink.columns = self._output_headers()
+        self._sink.write(rows)
+
+    def _context_path(self, upto: int) -> tuple[list[str], tuple[int, ...]]:
+        """
+        Filas elegidas (y su posición en la tabla) en los niveles iterados antes del
+        nivel `upto`. Identifican un subárbol dentro del año.
+        """
+        names = [level.name for level in self.route_config.levels[:upto]]
+        path = [self._context[name] for name in names if name in self._context]
+        key = tuple(self._order[name] for name in names if name in self._order)
+        return path, key
+
+    def _click_path(self, upto: int) -> tuple[tuple[str, str], ...]:
+        """
+        Clicks `(fila, botón)` que llevan desde la página inicial del año hasta la
+        página del nivel `upto`. Identifica la página en la caché.
+        """
+        return tuple(
+            (level.fila or self._context[level.name], level.button)
+            for level in self.route_config.levels[:upto]
+            if level.button
+        )
+
+    def _shard_rows(self, year: int, level_index: int, n: int) -> range:
+        """
+        Índices de las `n` filas del nivel `level_index` que le tocan a esta
+        instancia: todas, salvo en el primer nivel `iterate` de un periodo con
+        bloque en `_blocks`.
+        """
+        if level_index != first_iterate_level(self.route_config.levels):
+            return range(n)
+        return shard_range(n, self._blocks.get(year))
+
+    def _cached_tables(
+        self, year: int, level_index: int = 0, context: dict | None = None,
+        order: dict | None = None, path: tuple = (),
+    ) -> list[tuple[int, dict, dict, dict]] | None:
+        """
+        Recorre la ruta de `year` usando solo la caché, igual que `HttpEngine._walk`.
 
-        await self._assert_extraction()
-        if level.button:
+        Returns
+        -------
+        list or None
+            `(nivel, contexto, orden, tabla)` de cada tabla extraída en el orden del
+            recorrido, o None si falta alguna página en la caché.
+        """
+        context, order = context or {}, order or {}
+        levels = self.route_config.levels
+        tables = []
+        while level_index < len(levels):
+            level = levels[level_index]
+            if level.extract_table:
+                table = self._cache.get("playwright", year, path, "table")
+                if table is None:
+                    return None
+                tables.append((level_index, context, order, table))
+            if not level.button:
+                break
+            if level.fila:
+                path += ((level.fila, level.button),)
+                level_index += 1
+                continue
+            if level.iterate:
+                listing = self._cache.get("playwright", year, path, "rows")
+                if listing is None:
+                    return None
+                names = listing["row_names"]
+                for i in self._shard_rows(year, level_index, len(names)):
+                    name = names[i]
+                    child = self._cached_tables(
+                        year, level_index + 1, {**context, level.name: name},
+                        {**order, level.name: i}, path + ((name, level.button),),
+                    )
+                    if child is None:
+                        return None
+                    tables.extend(child)
+            break
+        return tables
+
+    def _extract_year_from_cache(self, year: int) -> bool:
+        """
+        Sirve un año completo desde la caché. Retorna False (sin extraer nada) si
+        falta alguna página, en cuyo caso el año se navega normalmente.
+        """
+        tables = self._cached_tables(year)
+        if tables is None:
+            return False
+        self.logger.info(f"💽 Periodo {period_label(year)} servido desde la caché ({len(tables)} tablas)")
+        self._year = year
+        for level_index, context, order, table in tables:
+            if not self._headers:
+                self._headers = table["headers"]
+            self._context, self._order = dict(context), dict(order)
+            self._emit_rows(table["rows"], list(context.values()), tuple(order.values()), level_index)
+        self._context, self._order = {}, {}
+        return True
+
+    async def _walk_levels(self) -> int:
+        """
+        Recorre la ruta desde `level_index` hasta su final: extrae la tabla de
+        cada nivel que lo pida, avanza por las filas fijas y, en un nivel
+        `iterate`, recorre todas sus filas (que vuelven cada una a esta página).
+
+        Returns
+        -------
+        int
+            Número de páginas que se avanzó por filas fijas (las que hay que
+            retroceder para volver a la página inicial).
+        """
+        levels = self.route_config.levels
+        depth = 0
+        while self.level_index < len(levels):
+            level = levels[self.level_index]
+            await self._assert_extraction()
+            if not level.button:
+                break
             if level.fila:
                 await self._navigate_level_simple(level.fila, level.button)
-            elif level.iterate:
+                depth += 1
+                continue
+            if level.iterate:
                 await self._iterate_over_levels(level.button)
+            break
+        return depth
+
+    async def _current_rows(self) -> list[str]:
+        iframe = self._page.frame(Locators.main_frame)
+        await iframe.wait_for_selector(Locators.table_data)
+        return await (
+            iframe.locator(Locators.table_data).locator(Locators.text_rows).all_inner_texts()
+        )
+
+    async def _replay_path(self, upto: int) -> None:
+        """
+        Vuelve a la página del nivel `upto` desde la página inicial del año,
+        repitiendo los clicks `(fila, botón)` de `_click_path(upto)`.
+        """
+        self.metrics.count("recovery")
+        await self._navigate_to_url(self._year)
+        iframe = self._page.frame(Locators.main_frame)
+        await iframe.wait_for_selector(Locators.table_data)
+        for row, button in self._click_path(upto):
+            await self._click_on_element(row, row=True)
+            await self._click_on_element(button, row=False)
+        self.level_index = upto
+
+    async def _with_recovery(
+        self, step, upto: int | None, expected_rows: list[str] | None = None
+    ):
+        """
+        Ejecuta `step` (una función async sin argumentos) desde la página del nivel
+        `upto`. Si la página no tiene las filas `expected_rows` o el paso falla,
+        espera (`backoff`, duplicándose), vuelve a la página con `_replay_path` y
+        reintenta, a lo sumo `retries` veces. Con `upto=None` el propio paso
+        navega desde el inicio y solo se reintenta.
+        """
+        from playwright.async_api import Error as PlaywrightError
+
+        attempt = 0
+        while True:
+            try:
+                if attempt and upto is not None:
+                    await self._replay_path(upto)
+                if expected_rows is not None and await self._current_rows() != expected_rows:
+                    self.metrics.count("desync")
+                    raise NavigationDesync(
+                        f"La página no corresponde a {self.route_config.levels[upto].name}"
+                    )
+                return await step()
+            except (PlaywrightError, NavigationDesync) as e:
+                if attempt >= self._retries:
+                    raise
+                attempt += 1
+                self.metrics.count("retry")
+                self.logger.warning(
+                    f"🔁 {type(e).__name__}: {str(e).splitlines()[0] if str(e) else ''} "
+                    f"(reintento {attempt}/{self._retries})"
+                )
+                await asyncio.sleep(self._backoff * 2 ** (attempt - 1))
+
+    async def _return_to(self, level_index: int, depth: int) -> None:
+        """
+        Retrocede `depth` páginas hasta la del nivel `level_index`. Si `go_back`
+        falla no se reintenta aquí: el siguiente paso comprueba la página y, si no
+        es la esperada, la recupera con `_replay_path`.
+        """
+        from playwright.async_api import Error as PlaywrightError
+
+        self.level_index = level_index
+        try:
+            for _ in range(depth):
+                await self._go_back()
+                self._clicks_number += 1
+        except PlaywrightError as e:
+            self.metrics.count("go_back_error")
+            self.logger.warning(f"↩️  No se pudo volver atrás: {str(e).splitlines()[0]}")
 
     async def _navigate_level_simple(self, row_text: str, button_text: str) -> None:
         """
@@ -276,52 +744,53 @@ class ConsultaAmigable:
         list
             Lista con los datos extraídos durante la iteración.
         """
-        level = self.route_config.levels[self.level_index]
-        iframe = self._page.frame(Locators.main_frame)
-        await iframe.wait_for_selector(Locators.table_data)
-        filas = (
-            await iframe.locator(Locators.table_data).locator(Locators.text_rows).all()
-        )
+        start = self.level_index
+        level = self.route_config.levels[start]
+        filas = await self._current_rows()
+        # En modo "jump" se guarda el postback de esta tabla para entrar a cada
+        # fila directamente
+        parent = await self._form_state() if self._navigation == "jump" else None
+        if self._cache:
+            self._cache.put(
+                "playwright", self._year, self._click_path(start), "rows",
+                {"row_names": filas},
+            )
         self.logger.info(
             f"📋 Se encontraron {len(filas)} filas para iterar en {level.name}."
         )
-        # > selector="table.Data >> td[align='left'] >> nth=0">
-        # > selector="table.Data >> td[align='left'] >> nth=0">, <Locator frame=<Frame name=frame0 url='https://apps5.mineco.gob.pe/transparencia/Navegador/Navegar_7.aspx?y=2020&ap=ActProy'> selector="table.Data >> td[align='left'] >> nth=1">, <Locator frame=<Frame name=frame0 url='https://apps5.mineco.gob.pe/transparencia/Navegador/Navegar_7.aspx?y=2020&ap=ActProy'> selector="table.Data >> td[align='left'] >> nth=2">, <Locator frame=<Frame name=frame0 url='https://apps5.mineco.gob.pe/transparencia/Navegador/Navegar_7.aspx?y=2020&ap=ActProy'> selector="table.Data >> td[align='left'] >> nth=3">, <Locator frame=<Frame name=frame0 url='https://apps5.mineco.gob.pe/transparencia/Navegador/Navegar_7.aspx?y=2020&ap=ActProy'> selector="table.Data >> td[align='left'] >> nth=4">, <Locator frame=<Frame name=frame0 url='https://apps5.mineco.gob.pe/transparencia/Navegador/Navegar_7.aspx?y=2020&ap=ActProy'> selector="table.Data >> td[align='left'] >> nth=5">, <Locator frame=<Frame name=frame0 url='https://apps5.mineco.gob.pe/transparencia/Navegador/Navegar_7.aspx?y=2020&ap=ActProy'> selector="table.Data >> td[align='left'] >> nth=6">, <Locator frame=<Frame name=frame0 url='https://apps5.mineco.gob.pe/transparencia/Navegador/Navegar_7.aspx?y=2020&ap=ActProy'> selector="table.Data >> td[align='left'] >> nth=7">, <Locator frame=<Frame name=frame0 url='https://apps5.mineco.gob.pe/transparencia/Navegador/Navegar_7.aspx?y=2020&ap=ActProy'> selector="table.Data >> td[align='left'] >> nth=8">, <Locator frame=<Frame name=frame0 url='https://apps5.mineco.gob.pe/transparencia/Navegador/Navegar_7.aspx?y=2020&ap=ActProy'> selector="table.Data >> td[align='left'] >> nth=9">, <Locator frame=<Frame name=frame0 url='https://apps5.mineco.gob.pe/transparencia/Navegador/Navegar_7.aspx?y=2020&ap=ActProy'> selector="table.Data >> td[align='left'] >> nth=10">, <Locator frame=<Frame name=frame0 url='https://apps5.mineco.gob.pe/transparencia/Navegador/Navegar_7.aspx?y=2020&ap=ActProy'> selector="table.Data >> td[align='left'] >> nth=11">, <Locator frame=<Frame name=frame0 url='https://apps5.mineco.gob.pe/transparencia/Navegador/Navegar_7.aspx?y=2020&ap=ActProy'> selector="table.Data >> td[align='left'] >> nth=12">, <Locator frame=<Frame name=frame0 url='https://apps5.mineco.gob.pe/transparencia/Navegador/Navegar_7.aspx?y=2020&ap=ActProy'> selector="table.Data >> td[align='left'] >> nth=13">, <Locator frame=<Frame name=frame0 url='https://apps5.mineco.gob.pe/transparencia/Navegador/Navegar_7.aspx?y=2020&ap=ActProy'> selector="table.Data >> td[align='left'] >> nth=14">, <Locator frame=<Frame name=frame0 url='https://apps5.mineco.gob.pe/transparencia/Navegador/Navegar_7.aspx?y=2020&ap=ActProy'> selector="table.Data >> td[align='left'] >> nth=15">, <Locator frame=<Frame name=frame0 url='https://apps5.mineco.gob.pe/transparencia/Navegador/Navegar_7.aspx?y=2020&ap=ActProy'> selector="table.Data >> td[align='left'] >> nth=16">, <Locator frame=<Frame name=frame0 url='https://apps5.mineco.gob.pe/transparencia/Navegador/Navegar_7.aspx?y=2020&ap=ActProy'> selector="table.Data >> td[align='left'] >> nth=17">, <Locator frame=<Frame name=frame0 url='https://apps5.mineco.gob.pe/transparencia/Navegador/Navegar_7.aspx?y=2020&ap=ActProy'> selector="table.Data >> td[align='left'] >> nth=18">, <Locator frame=<Frame name=frame0 url='https://apps5.mineco.gob.pe/transparencia/Navegador/Navegar_7.aspx?y=2020&ap=ActProy'> selector="table.Data >> td[align='left'] >> nth=19">, <Locator frame=<Frame name=frame0 url='https://apps5.mineco.gob.pe/transparencia/Navegador/Navegar_7.aspx?y=2020&ap=ActProy'> selector="table.Data >> td[align='left'] >> nth=20">, <Locator frame=<Frame name=frame0 url='https://apps5.mineco.gob.pe/transparencia/Navegador/Navegar_7.aspx?y=2020&ap=ActProy'> selector="table.Data >> td[align='left'] >> nth=21">, <Locator frame=<Frame name=frame0 url='https://apps5.mineco.gob.pe/transparencia/Navegador/Navegar_7.aspx?y=2020&ap=ActProy'> selector="table.Data >> td[align='left'] >> nth=22">, <Locator frame=<Frame name=frame0 url='https://apps5.mineco.gob.pe/transparencia/Navegador/Navegar_7.aspx?y=2020&ap=ActProy'> selector="table.Data >> td[align='left'] >> nth=23">, <Locator frame=<Frame name=frame0 url='https://apps5.mineco.gob.pe/transparencia/Navegador/Navegar_7.aspx?y=2020&ap=ActProy'> selector="table.Data >> td[align='left'] >> nth=24">, <Locator frame=<Frame name=frame0 url='https://apps5.mineco.gob.pe/transparencia/Navegador/Navegar_7.aspx?y=2020&ap=ActProy'> selector="table.Data >> td[align='left'] >> nth=25">]
-        for i in range(len(filas)):
-            fila = filas[i]
-            element_name = await fila.nth(0).all_inner_texts()
-            element_name = element_name[0]
-            # element_name = await fila.locator("td").nth(1).inner_text()
+        for i in self._shard_rows(self._year, start, len(filas)):
+            element_name = filas[i]
             self._context[level.name] = element_name  # Guardar el nombre en el contexto
+            self._order[level.name] = i
+            path, _ = self._context_path(start + 1)
+            if self._journal and self._journal.is_done(self._year, path):
+                self.logger.info(f"⏭️  Ya completado: {element_name}")
+                continue
             self.logger.info(f"➡️ Entrando en: {element_name}")
-
-            await self._navigate_level_simple(element_name, button_text)
-            levels_left = len(self.route_config.levels) - (self.level_index + 1)
-            
-            if levels_left > 0:
-                for _ in range(levels_left):
-                    await self._navigate_levels()
-                for _ in range(levels_left):  # TODO: Evaluar descomentar
-                    await iframe.wait_for_selector(Locators.table_data)
-                    try:
-                        await self._page.go_back(timeout=100)
-                    except TimeoutError:
-                        pass
-
-                    self.level_index -= 1
-                    self._clicks_number += 1
-                self.level_index -= levels_left
+            iteration_start = time.perf_counter()
+
+            async def visit(element_name=element_name) -> int:
+                if parent is None:
+                    await self._navigate_level_simple(element_name, button_text)
+                else:
+                    await self._jump(parent, element_name, button_text)
+                return 1 + await self._walk_levels()
+
+            # Con "back", antes de cada fila se comprueba que la página sea la de
+            # este nivel; con "jump" no hace falta volver a ella
+            depth = await self._with_recovery(
+                visit, upto=start, expected_rows=None if parent else filas
+            )
+            if self._journal:
+                self._journal.mark_done(self._year, path)
+            if parent is None:
+                await self._return_to(start, depth)
             else:
-                await iframe.wait_for_selector(Locators.table_data)
-                try:
-                    await self._page.go_back(timeout=100)
-                except TimeoutError:
-                    pass
-                self.level_index -= 1
-                self._clicks_number += 1
+                self.level_index = start
+            self.metrics.observe("iterate", level.name, time.perf_counter() - iteration_start)
 
         # Al terminar la iteración, se avanza de nivel
-        self.level_index += 1
+        self.level_index = start + 1
 
     # TODO: Save data every year (?)
     async def _extract_data_by_year(self) -> None:
@@ -330,40 +799,532 @@ class ConsultaAmigable:
         configuración de ruta establecida.
         """
         for year in self.years:
-            self._year = year
-            self.logger.info(
-                f"🗓️  Iniciando extracción para el año {year}, ruta: {self.route_config.route_name}"
-            )
-            await self._navigate_to_url(year)
+            await self._extract_year(year)
 
+    async def _extract_year(self, year: int) -> None:
+        """
+        Recorre la ruta completa para un único año, agregando las filas extraídas
+        a `self._extracted_data`.
+        """
+        self._year = year
+        if self._journal and self._journal.is_done(year, []):
+            self.logger.info(f"⏭️  Periodo {period_label(year)} ya completado")
+            return
+        if self._cache and self._extract_year_from_cache(year):
+            if self._journal:
+                self._journal.mark_done(year, [])
+            return
+        self.logger.info(
+            f"🗓️  Iniciando extracción para el año {year}, ruta: {self.route_config.route_name}"
+        )
+
+        async def walk_year() -> None:
+            self.level_index = 0
+            await self._navigate_to_url(year)
             iframe = self._page.frame(Locators.main_frame)
             await iframe.wait_for_selector(Locators.table_data)
-
             # Navegar a través de los niveles desde el primer nivel
-            for _ in self.route_config.levels:
-                await self._navigate_levels()
+            await self._walk_levels()
+
+        # Si falla algo que no se recuperó dentro de un nivel, se vuelve a empezar
+        # el año; los subárboles ya completados se saltan gracias a la bitácora
+        await self._with_recovery(walk_year, upto=None)
+
+        # Agregar metadatos: Año...
+        self.level_index = 0
+        if self._journal:
+            self._journal.mark_done(year, [])
+
+    async def _extract_data_concurrently(self, concurrency: int) -> None:
+        """
+        Extrae los años en paralelo usando `concurrency` contextos de navegador
+        aislados. Cada worker toma el siguiente año pendiente de una cola común y
+        al final las filas se combinan ordenadas por año, de modo que el resultado
+        es el mismo que el de `_extract_data_by_year`.
+
+        Parameters
+        ----------
+        concurrency : int
+            Número máximo de contextos de navegador trabajando a la vez.
+        """
+        pending_years: asyncio.Queue[int] = asyncio.Queue()
+        for year in self.years:
+            pending_years.put_nowait(year)
+        rows_by_year: dict[int, RowBuffer] = {}
+
+        async def run_worker() -> None:
+            worker = await self._spawn_worker()
+            try:
+                while not pending_years.empty():
+                    year = pending_years.get_nowait()
+                    try:
+                        await worker._extract_year(year)
+                    finally:
+                        # Se conservan también las filas de un año incompleto,
+                        # igual que en la ejecución secuencial
+                        rows_by_year[year] = worker._extracted_data
+                        worker._extracted_data = RowBuffer()
+                    if not self._headers and worker._headers:
+                        self._headers = worker._headers
+            finally:
+                self._clicks_number += worker._clicks_number
+                self._extraction_times.extend(worker._extraction_times)
+                await worker._close_page()
+
+        n_workers = max(1, min(concurrency, len(self.years)))
+        self.logger.info(f"🧵 Extrayendo {len(self.years)} años con {n_workers} contextos")
+        results = await asyncio.gather(
+            *(run_worker() for _ in range(n_workers)), return_exceptions=True
+        )
+
+        for year in sorted(rows_by_year):
+            self._extracted_data.extend(rows_by_year[year])
+
+        errors = [result for result in results if isinstance(result, BaseException)]
+        if errors:
+            raise errors[0]
+
+    async def _run_subtree(
+        self, task: SubtreeTask, frontier: FrontierQueue, rows_by_key: dict | None = None
+    ) -> dict:
+        """
+        Recorre un subárbol partiendo de la página inicial del año y repitiendo los
+        clicks de `task.path`. Al llegar a un nivel `iterate`, el worker continúa
+        con la primera fila en la misma página y publica el resto en `frontier`
+        para que otros workers las tomen.
+
+        Parameters
+        ----------
+        rows_by_key : dict, optional
+            Donde se agregan las filas. Al reintentar el subárbol se pasa el mismo
+            diccionario: las tablas del intento fallido ya están en él y
+            `_emit_rows` no las vuelve a agregar.
+
+        Returns
+        -------
+        dict
+            Filas extraídas agrupadas por `sort_key` del subárbol de origen.
+        """
+        rows_by_key = {} if rows_by_key is None else rows_by_key
+        levels = self.route_config.levels
+
+        self._year = task.year
+        self._context = dict(task.context)
+        self._order = dict(zip(task.context, task.order_key))
+        if self._journal and self._journal.is_done(task.year, list(task.context.values())):
+            return rows_by_key
+        if not task.path and self._cache and self._extract_year_from_cache(task.year):
+            rows_by_key[task.sort_key] = self._extracted_data
+            self._extracted_data = RowBuffer()
+            if self._journal:
+                self._journal.mark_done(task.year, [])
+            return rows_by_key
+        await self._navigate_to_url(task.year)
+        iframe = self._page.frame(Locators.main_frame)
+        await iframe.wait_for_selector(Locators.table_data)
+        for step in task.path:
+            await self._click_on_element(step.row, row=True)
+            await self._click_on_element(step.button, row=False)
+        self.level_index = task.level_index
+
+        try:
+            while self.level_index < len(levels):
+                level = levels[self.level_index]
+                await self._assert_extraction()
+                if not level.button:
+                    break
+                if level.fila:
+                    await self._navigate_level_simple(level.fila, level.button)
+                    task = SubtreeTask(
+                        year=task.year,
+                        path=task.path + (PathStep(level.fila, level.button),),
+                        context=task.context,
+                        order_key=task.order_key,
+                    )
+                    continue
+                if not level.iterate:
+                    break
 
-            # Agregar metadatos: Año...
+                iframe = self._page.frame(Locators.main_frame)
+                filas = await (
+                    iframe.locator(Locators.table_data)
+                    .locator(Locators.text_rows)
+                    .all_inner_texts()
+                )
+                self.logger.info(
+                    f"📋 Se encontraron {len(filas)} filas para iterar en {level.name}."
+                )
+                if not filas:
+                    break
+                children = [
+                    task.child(i, filas[i], level.button, level.name)
+                    for i in self._shard_rows(task.year, self.level_index, len(filas))
+                ]
+                if self._journal:
+                    children = [
+                        child
+                        for child in children
+                        if not self._journal.is_done(child.year, list(child.context.values()))
+                    ]
+                if not children:
+                    break
+                for child in children[1:]:
+                    frontier.put(child)
+
+                # Las filas del padre quedan con su propia clave antes de bajar
+                rows_by_key.setdefault(task.sort_key, RowBuffer()).extend(self._extracted_data)
+                self._extracted_data = RowBuffer()
+
+                task = children[0]
+                self._context = dict(task.context)
+                self._order = dict(zip(task.context, task.order_key))
+                self.logger.info(f"➡️ Entrando en: {task.path[-1].row}")
+                await self._navigate_level_simple(task.path[-1].row, level.button)
+
+            # El último subárbol recorrido en esta página quedó completo
+            if self._journal:
+                self._journal.mark_done(task.year, list(task.context.values()))
+        finally:
+            rows_by_key.setdefault(task.sort_key, RowBuffer()).extend(self._extracted_data)
+            self._extracted_data = RowBuffer()
             self.level_index = 0
 
-    def _save_data(self, output_dir: Path) -> str | Path:
+        return rows_by_key
+
+    async def _extract_data_work_stealing(self, concurrency: int) -> None:
+        """
+        Distribuye los subárboles de los niveles `iterate` entre `concurrency`
+        páginas. Cada año entra como una tarea raíz; cada worker toma de la cola
+        compartida el subárbol pendiente más profundo, navega hasta él repitiendo
+        su camino de clicks y publica a su vez los hijos que no recorre. Al final
+        las filas se combinan en el mismo orden que el recorrido secuencial.
+
+        Parameters
+        ----------
+        concurrency : int
+            Número de páginas (cada una en su propio contexto) trabajando a la vez.
+        """
+        frontier = FrontierQueue()
+        for year in self.years:
+            frontier.put(SubtreeTask(year=year))
+        rows_by_key: dict[tuple, RowBuffer] = {}
+
+        async def run_worker() -> None:
+            worker = await self._spawn_worker()
+            try:
+                while True:
+                    task = await frontier.get()
+                    try:
+                        # Un subárbol fallido se repite desde la página inicial del año
+                        await worker._with_recovery(
+                            lambda: worker._run_subtree(task, frontier, rows_by_key),
+                            upto=None,
+                        )
+                        if not self._headers and worker._headers:
+                            self._headers = worker._headers
+                    finally:
+                        frontier.task_done()
+            finally:
+                self._clicks_number += worker._clicks_number
+                self._extraction_times.extend(worker._extraction_times)
+                await worker._close_page()
+
+        self.logger.info(
+            f"🧵 Recorriendo {len(self.years)} años con {concurrency} páginas (work stealing)"
+        )
+        workers = [asyncio.create_task(run_worker()) for _ in range(concurrency)]
+        join = asyncio.create_task(frontier.join())
+        try:
+            # Termina cuando la cola se vacía o cuando algún worker falla
+            await asyncio.wait([join, *workers], return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for pending in [join, *workers]:
+                pending.cancel()
+            results = await asyncio.gather(join, *workers, return_exceptions=True)
+
+            for key in sorted(rows_by_key):
+                self._extracted_data.extend(rows_by_key[key])
+            self.logger.info(f"🧵 Se procesaron {frontier.published} subárboles")
+
+        errors = [
+            result
+            for result in results
+            if isinstance(result, BaseException)
+            and not isinstance(result, asyncio.CancelledError)
+        ]
+        if errors:
+            raise errors[0]
+
+    async def _extract_data_http(self, concurrency: int) -> None:
+        """
+        Extrae todos los años con `HttpEngine` (sin navegador), enviando a lo sumo
+        `concurrency` postbacks a la vez. Las filas se combinan ordenadas por año.
+        Si la ruta forma parte de un plan de prefijos compartidos (ver
+        `navegar_rutas`), los años se piden al plan en lugar de recorrerlos.
         """
-        Guarda los datos extraídos en un archivo Excel.
+        from .h_http_engine import HttpEngine
+
+        pending_years = [
+            year
+            for year in self.years
+            if not (self._journal and self._journal.is_done(year, []))
+        ]
+        if self._plan:
+            results = await asyncio.gather(
+                *(
+                    self._plan.extract_year(self.route_config, year, self.metrics)
+                    for year in pending_years
+                ),
+                return_exceptions=True,
+            )
+        else:
+            async with HttpEngine(
+                self.URL_ANUAL,
+                max_in_flight=max(1, concurrency),
+                cache=self._cache,
+                metrics=self.metrics,
+                url_mensual=self.URL_MENSUAL,
+                retries=self._retries,
+                backoff=self._backoff,
+                blocks=self._blocks,
+                governor=self._governor,
+            ) as engine:
+                self.logger.info(
+                    f"🌐 Extrayendo {len(self.years)} años por HTTP, ruta: {self.route_config.route_name}"
+                )
+                results = await asyncio.gather(
+                    *(engine.extract_year(self.route_config, year) for year in pending_years),
+                    return_exceptions=True,
+                )
+                self.logger.info(f"Se enviaron {engine.postbacks} postbacks")
+
+        errors = []
+        for year, result in sorted(zip(pending_years, results), key=lambda item: item[0]):
+            if isinstance(result, BaseException):
+                self.logger.error(f"❌ Falló la extracción del año {year}: {result}")
+                errors.append(result)
+                continue
+            headers, rows = result
+            if not self._headers and headers:
+                self._headers = headers
+            if self._sink is None:
+                self._extracted_data.extend(rows)
+            else:
+                self._write_to_sink(rows)
+            if self._journal:
+                if self._headers and not self._journal.headers:
+                    self._journal.record_headers(self._headers)
+                self._journal.record_rows(year, [], (), rows)
+                self._journal.mark_done(year, [])
+        if errors:
+            raise errors[0]
+
+    async def _extract(self, engine: str, concurrency: int, work_stealing: bool) -> None:
+        """
+        Extrae `self.years` con el modo que corresponde a los parámetros de
+        `navegar_ruta`. El driver (con "playwright") ya debe estar iniciado.
+
+        Con un `ConcurrencyGovernor` se reparten subárboles (como con
+        `work_stealing`) aunque haya un solo año: así siempre hay `concurrency`
+        páginas abiertas y el gobernador decide cuántas navegan a la vez.
         """
-        import pandas as pd
+        if engine == "http":
+            await self._extract_data_http(concurrency)
+        elif concurrency > 1 and (work_stealing or self._governor):
+            await self._extract_data_work_stealing(concurrency)
+        elif concurrency > 1 and len(self.years) > 1:
+            await self._extract_data_concurrently(concurrency)
+        else:
+            if engine == "playwright" and self._pool:
+                self._page = await self._new_page()
+            await self._extract_data_by_year()
 
-        df = pd.DataFrame(self._extracted_data, columns=self._headers)
-        output_path = output_dir / f"{self.route_config.route_name}.xlsx"
-        self._cleaner = CCleaner(input=df, output_path=output_path)
+    def _process_settings(self) -> dict:
+        """
+        Parámetros para recrear esta instancia en un proceso worker.
+        """
+        return {
+            "init": {
+                "headless": self._headless,
+                "slow_mo": self._slow_mo,
+                "blocking": self._blocker.profile if self._blocker else False,
+                "cache": self._cache,
+                "retries": self._retries,
+                "backoff": self._backoff,
+                "navigation": self._navigation,
+            },
+            "urls": (self.URL_ANUAL, self.URL_MENSUAL),
+            "log_level": self.logger.level,
+            # Cada proceso ajusta su propio límite
+            "governor": self._governor.config() if self._governor else None,
+        }
+
+    async def _navegar_procesos(
+        self,
+        output_dir: Path,
+        processes: int,
+        concurrency: int,
+        work_stealing: bool,
+        engine: str,
+        output_format: str,
+        export_excel: bool,
+    ) -> str:
+        """
+        `navegar_ruta` con `processes > 1`: extrae y limpia con `ProcessRunner` y
+        guarda los datos limpios en el formato pedido.
+        """
+        from .c_cleaner import CCleaner
+        from .o_store import PartitionedStore
+        from .t_process import ProcessRunner
+
+        route_name = self.route_config.route_name
+        output_dir.mkdir(parents=True, exist_ok=True)
+        runner = ProcessRunner(
+            self._process_settings(),
+            self.route_config,
+            processes,
+            engine=engine,
+            concurrency=concurrency,
+            work_stealing=work_stealing,
+        )
+        self.metrics = runner.metrics
+        output_path = None
+        try:
+            frames = await runner.run(self.years)
+            if frames:
+                self.logger.info("💾 Guardando datos...")
+                if output_format == "excel":
+                    import pandas as pd
+
+                    output_path = output_dir / f"{route_name}.xlsx"
+                    df = pd.concat(frames.values(), ignore_index=True)
+                    CCleaner(input=df, output_path=output_path).save_data()
+                else:
+                    output_path = output_dir / route_name
+                    store = PartitionedStore(output_path, output_format)
+                    for df in frames.values():
+                        store.write_frame(df)
+            if output_path and export_excel and output_format != "excel":
+                PartitionedStore(output_path, output_format).to_excel(
+                    output_dir / f"{route_name}.xlsx"
+                )
+        finally:
+            self._clicks_number += runner.clicks
+            self._completed = not runner.errors
+            for error in runner.errors:
+                self.logger.error(f"❌ Falló un proceso worker: {error}")
+            summary = {**runner.summary(), "seconds": self.metrics.elapsed}
+            (output_dir / f"{route_name}.processes.json").write_text(
+                json.dumps(summary, indent=2, ensure_ascii=False), encoding="utf-8"
+            )
+            self.logger.info(
+                f"🧮 {processes} procesos: extracción {runner.extract_seconds:.1f}s, "
+                f"total {summary['seconds']:.1f}s"
+            )
+            self.metrics.write_json(output_dir / f"{route_name}.metrics.json")
+            self.metrics.write_prometheus(output_dir / f"{route_name}.prom")
+            self.logger.info(self.metrics.summary())
+        return str(output_path)
+
+    @staticmethod
+    def _periods(
+        route: RouteConfig, years: Iterable[int] | int, months: Iterable[int] | int | None
+    ) -> list[int]:
+        """
+        Unidades de trabajo de una ruta: los años o, en la consulta mensual, los
+        periodos año-mes (ver `s_period`).
+        """
+        years = list(years) if isinstance(years, Iterable) else [years]
+        if months is None:
+            return expand_periods(years, MESES if route.mensual else None)
+        months = list(months) if isinstance(months, Iterable) else [months]
+        return expand_periods(years, months)
+
+    async def _report_metrics(self, interval: float) -> None:
+        """
+        Registra el resumen de métricas cada `interval` segundos hasta ser cancelada.
+        """
+        while True:
+            await asyncio.sleep(interval)
+            self.logger.info(self.metrics.summary())
+
+    def _output_headers(self) -> list[str]:
+        """
+        Encabezados de las filas guardadas: año (y mes en la consulta mensual), una columna por cada nivel
+        iterado (nombrada como el botón que abrió esa tabla, p. ej. "Departamento"),
+        la columna vacía del botón y los encabezados de la tabla extraída.
+        """
+        levels = self.route_config.levels
+        context_headers = [
+            levels[i - 1].button if i > 0 and levels[i - 1].button else level.name
+            for i, level in enumerate(levels)
+            if level.iterate
+        ]
+        period_headers = ["Año", "Mes"] if self.route_config.mensual else ["Año"]
+        return period_headers + context_headers + [""] + self._headers
+
+    def _save_data(self, output_dir: Path, output_format: str = "excel") -> str | Path:
+        """
+        Guarda los datos extraídos en un archivo Excel o, con un formato columnar,
+        en el almacén `<output_dir>/<route_name>/year=<año>/`.
+        """
+        from .c_cleaner import CCleaner
+
+        df = self._extracted_data.to_frame(self._headers)
+        if output_format == "excel":
+            output_path = output_dir / f"{self.route_config.route_name}.xlsx"
+        else:
+            output_path = output_dir / self.route_config.route_name
+        self._cleaner = CCleaner(input=df, output_path=output_path, output_format=output_format)
         return self._cleaner.clean()
 
+    def _open_sink(self, sink: "str | RowSink", output_dir: Path) -> "RowSink":
+        """
+        Sink de filas crudas (`<route_name>_raw.<formato>`). Al reanudar se vuelve a
+        escribir con las filas de la bitácora para que quede completo.
+        """
+        from .l_sink import SINKS, crear_sink
+
+        if isinstance(sink, str):
+            if sink not in SINKS:
+                raise ValueError(f"Formato no soportado: {sink}. Opciones: {list(SINKS)}")
+            name = f"{self.route_config.route_name}_raw{SINKS[sink].suffix}"
+            sink = crear_sink(sink, output_dir / name)
+        if self._journal and self._journal.headers:
+            self._headers = self._journal.headers
+            sink.columns = self._output_headers()
+            for row in self._journal.iter_rows(previous_only=True):
+                sink.write([row])
+        return sink
+
+    def _clean_sink(self, output_dir: Path, output_format: str = "excel") -> Path | None:
+        """
+        Cierra el sink de filas crudas y escribe su versión limpia bloque por
+        bloque: en `<route_name>.<formato del sink>` o, con un formato columnar, en
+        el almacén particionado por año.
+        """
+        from .c_cleaner import CCleaner
+        from .o_store import PartitionedStore
+
+        raw = self._sink
+        raw.close()
+        if not raw.rows_written:
+            return None
+        if output_format == "excel":
+            cleaned = type(raw)(output_dir / f"{self.route_config.route_name}{raw.suffix}")
+        else:
+            cleaned = PartitionedStore(output_dir / self.route_config.route_name, output_format)
+        return CCleaner.clean_chunks(raw.read_chunks(), cleaned)
+
     async def guardar_ruta_y_salir(self, output_dir: Path) -> None:
         route_path = output_dir / f"{self.route_config.route_name}.yaml"
         guardar_ruta_yaml(self.route_config, path=route_path)
         logger.info(f"Se guardó la ruta en {route_path}")
         await self._cerrar_navegador()
 
-    async def crear_ruta(self, route_name: str, output_dir: str | Path = ".") -> None:
+    async def crear_ruta(
+        self, route_name: str, output_dir: str | Path = ".", mensual: bool = False
+    ) -> None:
         """
         Interfaz interactiva en la terminal para construir y guardar una ruta de scraping.
 
@@ -384,6 +1345,9 @@ class ConsultaAmigable:
         output_dir : str, optional
             Ruta al directorio donde se guardará el archivo YAML con la configuración
             de la ruta. Por defecto se guardará en el directorio actual.
+        mensual : bool, optional
+            Si es True, la ruta se graba sobre la consulta mensual (`URL_MENSUAL`,
+            enero de 2024) y queda marcada como `mensual` para ejecutarse por mes.
 
         Returns
         -------
@@ -409,9 +1373,16 @@ class ConsultaAmigable:
         save_route_with_defaults : Guarda un `RouteConfig` en un archivo YAML con
             parámetros por defecto.
         """
+        # questionary solo hace falta en el modo interactivo
+        from .d_cli import ConsultaCLI
+
+        from .h_http_engine import monthly_url_template
+
         cli = ConsultaCLI()
         output_dir = Path(output_dir)
-        self.years = [2024]
+        if mensual:
+            monthly_url_template(self.URL_MENSUAL)
+        self.years = [period_key(2024, 1) if mensual else 2024]
         await self._initialize_driver()
         await self._navigate_to_url(self.years[0])
 
@@ -419,7 +1390,7 @@ class ConsultaAmigable:
         await iframe.wait_for_selector(Locators.table_data)
 
         self.route_config = RouteConfig(
-            route_name=route_name, output_path=str(output_dir)
+            route_name=route_name, output_path=str(output_dir), mensual=mensual
         )
         self.level_index = 1
 
@@ -499,6 +1470,19 @@ class ConsultaAmigable:
         route: str | Path | RouteConfig,
         years: Iterable[int] | int,
         output_dir: str | Path,
+        months: Iterable[int] | int | None = None,
+        concurrency: int = 1,
+        work_stealing: bool = False,
+        engine: Literal["playwright", "http"] = "playwright",
+        resume: bool = False,
+        journal: bool = False,
+        sink: 'Literal["csv", "jsonl", "parquet"] | RowSink | None' = None,
+        output_format: Literal["excel", "parquet", "feather"] = "excel",
+        export_excel: bool = False,
+        metrics_interval: float | None = None,
+        processes: int = 1,
+        shard: str | tuple[int, int] | None = None,
+        adaptive: bool | ConcurrencyGovernor = False,
     ):
         """
         Ejecuta el proceso de scraping siguiendo una ruta de navegación predefinida.
@@ -519,17 +1503,106 @@ class ConsultaAmigable:
         output_dir : str or Path
             Ruta al directorio donde se guardarán los archivos de salida con los
             datos extraídos.
+        months : list[int] or int, optional
+            Meses (1-12) a extraer de la consulta mensual (`URL_MENSUAL`). Si se
+            indica, o si la ruta es `mensual`, cada par año-mes es una unidad de
+            trabajo (como un año en la consulta anual) y los datos llevan las
+            columnas "Año" y "Mes". Una ruta `mensual` sin `months` extrae los 12
+            meses. Con un formato columnar cada mes es su propia partición, así
+            que se pueden agregar meses nuevos sin volver a extraer los demás.
+        concurrency : int, optional
+            Número de contextos de navegador que extraen años (o meses) en
+            paralelo. Por defecto es 1 (un año tras otro en una sola página). Las
+            filas se combinan siempre ordenadas por año y mes.
+        work_stealing : bool, optional
+            Si es True, las `concurrency` páginas no se reparten años sino los
+            subárboles de los niveles `iterate` (p. ej. departamentos, provincias),
+            tomando primero los más profundos. Conviene para rutas grandes y
+            desbalanceadas aunque se extraiga un solo año.
+        engine : {"playwright", "http"}, optional
+            Motor de navegación. "playwright" (por defecto) controla un Chromium;
+            "http" reenvía los mismos postbacks de WebForms con un cliente HTTP y
+            lee las tablas del HTML, sin abrir navegador. Con "http",
+            `concurrency` es el número máximo de postbacks en vuelo.
+        resume : bool, optional
+            Si es True, continúa una ejecución anterior interrumpida: recarga las
+            filas guardadas en la bitácora `<route_name>.journal.jsonl` de
+            `output_dir` (antes que las filas nuevas) y salta los años y
+            subárboles ya completados. Implica `journal=True`.
+        journal : bool, optional
+            Si es True, cada tabla extraída se escribe también en la bitácora
+            `<route_name>.journal.jsonl`, que se conserva si la ejecución falla
+            para poder continuarla con `resume=True` (y se borra si termina). Si
+            es False (por defecto) no se escribe bitácora: una ejecución
+            interrumpida no se puede reanudar.
+        sink : {"csv", "jsonl", "parquet"} or RowSink, optional
+            Si se indica, las filas no se acumulan en memoria: cada tabla se envía
+            al sink apenas se extrae y se escribe en disco por lotes
+            (`<route_name>_raw.<formato>`). Al final `CCleaner` limpia ese archivo
+            bloque por bloque en `<route_name>.<formato>`. Por defecto (None) se
+            guarda un Excel. Las filas quedan en el orden en que se extrajeron.
+        output_format : {"excel", "parquet", "feather"}, optional
+            Formato de los datos limpios. "excel" (por defecto) escribe
+            `<route_name>.xlsx` (o, con `sink`, `<route_name>.<formato del sink>`).
+            "parquet" y "feather" escriben un almacén columnar
+            `<output_dir>/<route_name>/year=<año>/`; cada ejecución reemplaza solo
+            las particiones de los años extraídos.
+        export_excel : bool, optional
+            Con un formato columnar, exporta además todo el almacén a
+            `<route_name>.xlsx` (si no supera el límite de filas de Excel).
+        metrics_interval : float, optional
+            Si se indica, cada `metrics_interval` segundos se registra en el log un
+            resumen de `self.metrics` mientras la ejecución avanza. Al terminar, las
+            métricas se guardan siempre en `<route_name>.metrics.json` y
+            `<route_name>.prom` (formato de texto de Prometheus).
+        processes : int, optional
+            Si es mayor que 1, la extracción se reparte entre `processes` procesos,
+            cada uno con su propio motor (y su propio Chromium con "playwright") y
+            una porción de las unidades de trabajo: los periodos o, si hay menos
+            periodos que procesos, bloques de filas del primer nivel `iterate` de
+            cada periodo. Dentro de cada proceso se aplican `concurrency`,
+            `work_stealing` y `engine` como en una ejecución normal. Las filas
+            vuelven al proceso principal en formato IPC de Arrow y la limpieza de
+            cada periodo corre en otro pool de procesos. No admite `resume` ni
+            `sink`. El tiempo de cada etapa se guarda en
+            `<route_name>.processes.json`.
+        shard : str or tuple[int, int], optional
+            Parte `"i/n"` (0 <= i < n) de la ruta a extraer, p. ej. para repartir
+            una extracción histórica entre n máquinas. El reparto es determinista:
+            depende solo de los periodos, de la ruta y de n (ver
+            `u_shard.shard_units`) y divide el trabajo por periodo y, si hay menos
+            periodos que partes, por bloques de filas del primer nivel `iterate`.
+            La parte no se limpia: guarda sus filas crudas en
+            `<route_name>.shard-i-of-n.<formato>` (el de `sink`, o Parquet si está
+            pyarrow) y un manifiesto `<route_name>.shard-i-of-n.json`. Las partes
+            se unen y limpian una sola vez con `u_shard.fusionar_partes`. Admite
+            `resume` (cada parte tiene su propia bitácora).
+        adaptive : bool or ConcurrencyGovernor, optional
+            Si es True, el número de navegaciones (postbacks) en vuelo no es fijo:
+            un `ConcurrencyGovernor` lo ajusta entre 1 y `concurrency` según la
+            latencia y los errores que observa (aumento aditivo mientras el
+            servidor responde bien, reducción a la mitad cuando se satura). Con
+            "playwright" implica `work_stealing`: se abren `concurrency` páginas
+            aunque haya un solo año y el gobernador limita cuántas navegan a la
+            vez. Se puede pasar un `ConcurrencyGovernor` para
+            fijar los topes y umbrales. Cada cambio de límite se registra en el
+            log y la evolución se guarda en `<route_name>.concurrency.json`.
 
         Returns
         -------
         output_path : str | None
-            Retorna el path del excel con los datos recolectados. También imprime
-            el path en la consola.
+            Retorna el path del archivo (Excel o el del sink) con los datos
+            recolectados, o el del manifiesto con `shard`. También imprime el path
+            en la consola.
 
         Notes
         -----
         - Asegura el cierre del navegador al final de la ejecución, incluso si
           ocurre una excepción.
+        - Con `concurrency > 1` todos los contextos se abren sobre un único
+          Chromium, por lo que el costo de lanzar el navegador se paga una vez.
+        - Con `journal=True`, cada tabla extraída se escribe de inmediato en la
+          bitácora, que se elimina cuando la ejecución termina sin errores.
 
         See Also
         --------
@@ -537,33 +1610,341 @@ class ConsultaAmigable:
             de ruta desde cero.
         cargar_ruta_yaml : Carga una configuración de ruta desde un archivo YAML.
         _extract_data_by_year : Lógica de extracción de datos para cada año.
+        _extract_data_concurrently : Extracción de años en paralelo.
+        _extract_data_work_stealing : Reparto de subárboles entre varias páginas.
+        _extract_data_http : Extracción sin navegador mediante postbacks HTTP.
         _save_data : Guarda los datos recolectados en disco.
         """
 
         if isinstance(route, (str, Path)):
             path = Path(route)
             route = cargar_ruta_yaml(path)
+        if months is not None and not route.mensual:
+            route = route.model_copy(update={"mensual": True})
         self.route_config = route
 
-        self.years = list(years) if isinstance(years, Iterable) else [years]
-        await self._initialize_driver()
+        self.years = self._periods(route, years, months)
+        if any(split_period(period)[1] is not None for period in self.years):
+            # Falla antes de abrir el navegador si la URL está mal configurada
+            from .h_http_engine import monthly_url_template
+
+            monthly_url_template(self.URL_MENSUAL)
+        if engine not in ("playwright", "http"):
+            raise ValueError(f"Motor no soportado: {engine}")
+        if output_format not in ("excel", "parquet", "feather"):
+            raise ValueError(f"Formato de salida no soportado: {output_format}")
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        self._blocks = {}
+        self._emitted = set()
+        if adaptive is True:
+            adaptive = ConcurrencyGovernor(max_limit=max(1, concurrency))
+        self._governor = adaptive or None
+        run_name = self.route_config.route_name
+        if shard is not None:
+            from .u_shard import guardar_parte, parse_shard, shard_format, shard_name, shard_units
+
+            if processes > 1:
+                raise ValueError("shard no admite processes > 1")
+            shard = parse_shard(shard)
+            # El sink solo elige el formato de las filas crudas de la parte
+            partial_format = shard_format(sink)
+            sink = None
+            periods = self.years
+            units = shard_units(periods, route.levels, shard)
+            self.years = [period for period, _ in units]
+            self._blocks = {period: block for period, block in units if block}
+            run_name = shard_name(run_name, shard)
+        if processes > 1:
+            if resume or sink is not None:
+                raise ValueError("processes > 1 no admite resume ni sink")
+            return await self._navegar_procesos(
+                output_dir, processes, concurrency, work_stealing, engine,
+                output_format, export_excel,
+            )
+        self._extracted_data = RowBuffer()
+        if journal or resume:
+            self._journal = RunJournal(
+                output_dir / f"{run_name}.journal.jsonl",
+                route_name=self.route_config.route_name,
+                resume=resume,
+            )
+        completed = False
+        if sink is not None:
+            self._sink = self._open_sink(sink, output_dir)
+        elif self._journal and self._journal.headers:
+            # Al reanudar, las filas de ejecuciones anteriores van primero; las de
+            # esta ejecución se agregan a continuación
+            self._headers = self._journal.headers
+            self._extracted_data.extend(self._journal.iter_rows(previous_only=True))
+        self.metrics = RunMetrics(self.route_config.route_name)
+        reporter = (
+            asyncio.create_task(self._report_metrics(metrics_interval))
+            if metrics_interval
+            else None
+        )
 
         try:
+            if engine == "playwright" and self._pool is None:
+                await self._initialize_driver()
+
             # print(f"\n🔍 Iniciando scraping para la ruta: {ruta_seleccionada}")
 
             # Iterar sobre los años y extraer datos
-            await self._extract_data_by_year()
+            await self._extract(engine, concurrency, work_stealing)
+            completed = True
 
         finally:
+            if reporter:
+                reporter.cancel()
             output_path = None
-            # Guardar los datos finales si se obtuvieron datos completos
-            if self._extracted_data:
-                self.logger.info("💾 Guardando datos...")
-                self._headers = ["Año", ""] + self._headers
-                output_path = self._save_data(output_dir=Path(output_dir))
-
-            await self._cerrar_navegador()
-            self.logger.info("✅ Proceso finalizado, driver cerrado.")
+            if self._journal:
+                self._headers = self._headers or self._journal.headers
+            if shard is not None:
+                # Una parte guarda sus filas sin limpiar; se limpian al fusionar
+                self._headers = self._output_headers()
+                output_path = guardar_parte(
+                    output_dir, self.route_config, shard, periods, self._headers,
+                    self._extracted_data, partial_format, completed,
+                )
+            else:
+                with self.metrics.time("clean"):
+                    if self._sink is not None:
+                        self.logger.info("💾 Limpiando datos del sink...")
+                        output_path = self._clean_sink(output_dir, output_format)
+                        self._sink = None
+
+                    # Guardar los datos finales si se obtuvieron datos completos
+                    if self._extracted_data:
+                        self.logger.info("💾 Guardando datos...")
+                        self._headers = self._output_headers()
+                        output_path = self._save_data(output_dir=output_dir, output_format=output_format)
+            if output_path and export_excel and output_format != "excel" and shard is None:
+                from .o_store import PartitionedStore
+
+                PartitionedStore(output_path, output_format).to_excel(
+                    output_dir / f"{self.route_config.route_name}.xlsx"
+                )
+            if self._journal:
+                self._journal.close(delete=completed)
+                self._journal = None
+            self._completed = completed
+
+            if self._pool is None:
+                await self._cerrar_navegador()
+                self.logger.info("✅ Proceso finalizado, driver cerrado.")
+            elif self._page is not None:
+                await self._close_page()
+                self._page = None
             self.logger.info(f"Se dieron {self._clicks_number} clicks")
+            if self._blocker and engine == "playwright":
+                self.logger.info(self._blocker.summary())
+            if self._cache:
+                self.logger.info(self._cache.summary())
+            if self._extraction_times:
+                promedio = sum(self._extraction_times) / len(self._extraction_times)
+                self.logger.info(
+                    f"Se extrajeron {len(self._extraction_times)} tablas, "
+                    f"{promedio * 1000:.0f} ms en promedio "
+                    f"(máx. {max(self._extraction_times) * 1000:.0f} ms)"
+                )
+            if self._governor:
+                self._governor.write_json(output_dir / f"{run_name}.concurrency.json")
+                self.logger.info(self._governor.summary())
+            self.metrics.write_json(output_dir / f"{run_name}.metrics.json")
+            self.metrics.write_prometheus(output_dir / f"{run_name}.prom")
+            self.logger.info(self.metrics.summary())
 
             return str(output_path)
+
+    async def navegar_rutas(
+        self,
+        routes: Iterable[str | Path | RouteConfig],
+        years: Iterable[int] | int | dict[str, Iterable[int] | int],
+        output_dir: str | Path,
+        concurrency: int = 4,
+        route_concurrency: int = 1,
+        engine: Literal["playwright", "http"] = "playwright",
+        share_prefixes: bool = False,
+        **kwargs,
+    ) -> dict:
+        """
+        Ejecuta varias rutas sobre un único navegador.
+
+        Chromium se lanza una sola vez y las rutas se ejecutan a la vez tomando
+        páginas de un `PagePool` común, de modo que nunca hay más de `concurrency`
+        páginas abiertas en total. Cada ruta escribe sus archivos en `output_dir`
+        igual que `navegar_ruta`; al final se guarda además un resumen conjunto en
+        `batch.summary.json`. Un error en una ruta no detiene las demás.
+
+        Parameters
+        ----------
+        routes : list of Path or RouteConfig
+            Rutas a ejecutar (archivos YAML u objetos `RouteConfig`).
+        years : list[int] or int or dict
+            Años de todas las rutas, o un diccionario `{route_name: años}` con los
+            años de cada una.
+        output_dir : str or Path
+            Directorio de salida común.
+        concurrency : int, optional
+            Límite global de páginas abiertas (con "http", de rutas ejecutándose
+            a la vez).
+        route_concurrency : int, optional
+            `concurrency` de cada ruta en `navegar_ruta` (páginas o postbacks en
+            vuelo por ruta).
+        engine : {"playwright", "http"}, optional
+            Motor de navegación de todas las rutas.
+        share_prefixes : bool, optional
+            Solo con `engine="http"`. Compila las rutas en un árbol de prefijos
+            (`r_plan.build_plan`): los niveles iniciales comunes (misma fila y
+            botón) se recorren una vez por año y solo las partes distintas se
+            recorren por separado. Cada ruta recibe sus filas como si se hubiera
+            ejecutado sola. Los postbacks en vuelo se limitan a `concurrency` o,
+            con `adaptive`, los ajusta un único `ConcurrencyGovernor` para todas
+            las rutas (su evolución se guarda en `batch.concurrency.json`). No
+            admite `shard`: cada ruta reparte sus filas según su propio primer
+            nivel `iterate`, que el árbol compartido no distingue.
+        **kwargs
+            Resto de parámetros de `navegar_ruta` (`work_stealing`, `resume`,
+            `sink`, `output_format`...).
+
+        Returns
+        -------
+        dict
+            Resumen de la ejecución: por ruta, el archivo de salida, si terminó
+            completa, filas, clicks y segundos; y los totales.
+        """
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        configs = [
+            cargar_ruta_yaml(Path(route)) if isinstance(route, (str, Path)) else route
+            for route in routes
+        ]
+        names = [config.route_name for config in configs]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Nombres de ruta repetidos: {names}")
+        governor = None
+        if share_prefixes:
+            if engine != "http":
+                raise ValueError("share_prefixes solo está disponible con engine='http'")
+            if kwargs.get("shard") is not None:
+                raise ValueError("share_prefixes no admite shard")
+            # El gobernador es del plan: las rutas no envían postbacks propios
+            governor = kwargs.pop("adaptive", False)
+            if governor is True:
+                governor = ConcurrencyGovernor(max_limit=max(1, concurrency))
+            governor = governor or None
+
+        def years_of(config: RouteConfig) -> Iterable[int] | int:
+            return years.get(config.route_name, []) if isinstance(years, dict) else years
+
+        started = time.perf_counter()
+        if engine == "playwright":
+            from .q_pool import PagePool
+
+            await self._launch_browser()
+            self._pool = PagePool(self._open_page, max(1, concurrency))
+        if share_prefixes:
+            from .h_http_engine import HttpEngine
+            from .r_plan import SharedPrefixRunner
+
+            self._plan = SharedPrefixRunner(
+                HttpEngine(
+                    self.URL_ANUAL,
+                    max_in_flight=max(1, concurrency),
+                    cache=self._cache,
+                    url_mensual=self.URL_MENSUAL,
+                    retries=self._retries,
+                    backoff=self._backoff,
+                    governor=governor,
+                )
+            )
+            for config in configs:
+                self._plan.register(
+                    config, self._periods(config, years_of(config), kwargs.get("months"))
+                )
+        self.logger.info(
+            f"📚 Ejecutando {len(configs)} rutas con a lo sumo {concurrency} "
+            f"{'páginas' if engine == 'playwright' else 'rutas'} a la vez"
+        )
+        startup = time.perf_counter() - started
+        # Con un pool o un plan compartido, las páginas o los postbacks en vuelo ya
+        # limitan la concurrencia de todas las rutas
+        shared = self._pool or self._plan
+        running = asyncio.Semaphore(len(configs) if shared else max(1, concurrency))
+
+        async def run_route(config: RouteConfig) -> dict:
+            route_years = years_of(config)
+            route = self._spawn_route()
+            route_started = time.perf_counter()
+            error = None
+            output = None
+            async with running:
+                try:
+                    output = await route.navegar_ruta(
+                        route=config,
+                        years=route_years,
+                        output_dir=output_dir,
+                        concurrency=route_concurrency,
+                        engine=engine,
+                        **kwargs,
+                    )
+                except Exception as e:
+                    error = f"{type(e).__name__}: {e}"
+                    self.logger.error(f"❌ Falló la ruta {config.route_name}: {error}")
+            self._clicks_number += route._clicks_number
+            return {
+                "output": None if output in (None, "None") else output,
+                "completed": route._completed and error is None,
+                "error": error,
+                "rows": sum(route.metrics.rows_by_level.values()),
+                "clicks": route._clicks_number,
+                "seconds": time.perf_counter() - route_started,
+            }
+
+        try:
+            results = await asyncio.gather(*(run_route(config) for config in configs))
+        finally:
+            if self._pool:
+                self.logger.info(self._pool.summary())
+                await self._pool.close()
+                self._pool = None
+            plan, self._plan = self._plan, None
+            if plan:
+                self.logger.info(plan.summary())
+                await plan.engine.close()
+            if governor:
+                governor.write_json(output_dir / "batch.concurrency.json")
+                self.logger.info(governor.summary())
+            await self._cerrar_navegador()
+            self._browser = None
+            self._playwright = None
+
+        summary = {
+            "engine": engine,
+            "concurrency": concurrency,
+            "startup_seconds": startup,
+            "seconds": time.perf_counter() - started,
+            "rows": sum(result["rows"] for result in results),
+            "clicks": sum(result["clicks"] for result in results),
+            "routes": dict(zip(names, results)),
+        }
+        if plan:
+            summary["plan"] = {
+                "postbacks": plan.postbacks,
+                "steps": plan.steps,
+                "naive_steps": plan.naive_steps,
+                "saved_steps": plan.naive_steps - plan.steps,
+            }
+        (output_dir / "batch.summary.json").write_text(
+            json.dumps(summary, indent=2, ensure_ascii=False), encoding="utf-8"
+        )
+        for name, result in summary["routes"].items():
+            estado = "✅" if result["completed"] else "❌"
+            self.logger.info(
+                f"{estado} {name}: {result['rows']} filas en {result['seconds']:.1f}s -> {result['output']}"
+            )
+        self.logger.info(
+            f"📚 {len(configs)} rutas, {summary['rows']} filas en {summary['seconds']:.1f}s"
+        )
+        return summary
@@ -25,13 +25,21 @@ Usage:
 # =====================
 # Importación de librerías
 # =====================
+from datetime import datetime
 from pathlib import Path
+from typing import Callable, Iterable, Literal, TYPE_CHECKING
+import numpy as np
 import pandas as pd
 import logging
-import ubigeos_peru as ubg
+
+from .n_ubigeo import get_normalizer
+from .o_store import PartitionedStore
 
 logger = logging.getLogger("consulta_amigable")
 
+if TYPE_CHECKING:
+    from .l_sink import RowSink
+
 # =====================
 # Importación de data
 # =====================
@@ -46,11 +54,51 @@ class CCleaner:
         ("Pliego", ["COD_PLI", "Pliego"], ":"),
         ("Unidad Ejecutora", ["UE", "SEC_EJEC", "Unidad Ejecutora"], "-|:"),
     ]
+    # Columna de código que acompaña a cada nivel de ubigeo tras el split
+    codigos_ubigeo = {
+        "departamento": "UBI_DPTO",
+        "provincia": "UBI_PROV",
+        "distrito": "UBI_DIST",
+    }
 
-    def __init__(self, input: pd.DataFrame, output_path: Path):
+    def __init__(
+        self,
+        input: pd.DataFrame,
+        output_path: Path,
+        output_format: Literal["excel", "parquet", "feather"] = "excel",
+        save_ubigeos: bool = False,
+    ):
+        """
+        Parameters
+        ----------
+        input : pd.DataFrame
+            Datos crudos extraídos.
+        output_path : Path
+            Archivo Excel de salida o, con un formato columnar, directorio del
+            almacén particionado por año (ver `PartitionedStore`).
+        output_format : {"excel", "parquet", "feather"}, optional
+            Formato de salida. Por defecto "excel".
+        save_ubigeos : bool, optional
+            Guarda la tabla de ubigeos normalizados en disco al terminar `clean`
+            (ver `UbigeoNormalizer.save`). Por defecto solo se usa en memoria.
+        """
         self.input = input
         self.df = self.input
         self.output_path = output_path
+        self.output_format = output_format
+        self.save_ubigeos = save_ubigeos
+
+    @staticmethod
+    def _recode(values: pd.Series, func: Callable[[pd.Series], pd.Series]) -> pd.Categorical:
+        """
+        Aplica `func` solo a los valores distintos de `values` y retorna el resultado
+        como categórico. Las columnas geográficas y de entidades repiten pocos
+        valores en millones de filas, así que el costo depende de los valores únicos.
+        """
+        codes, uniques = pd.factorize(values, use_na_sentinel=False)
+        result = func(pd.Series(uniques, dtype=object))
+        result_codes, categories = pd.factorize(result)
+        return pd.Categorical.from_codes(result_codes[codes], categories=categories)
 
     def _split_column(
         self, source_col: str, new_cols: list[str], delimiter: str, max_splits=None
@@ -61,13 +109,17 @@ class CCleaner:
         if max_splits is None:
             max_splits = len(new_cols) - 1
 
-        # Dividir la columna y asignar a las nuevas columnas
-        self.df[new_cols] = (
-            self.df.pop(source_col)
+        # Se divide una vez cada valor distinto y las nuevas columnas se arman con
+        # los códigos de fila de la columna original
+        codes, uniques = pd.factorize(self.df.pop(source_col), use_na_sentinel=False)
+        parts = (
+            pd.Series(uniques, dtype=object)
             .str.split(delimiter, n=max_splits, expand=True)
-            .apply(lambda x: x.str.strip())
-            .astype(str)
+            .reindex(columns=range(len(new_cols)), fill_value=None)
         )
+        for i, new_col in enumerate(new_cols):
+            part_codes, categories = pd.factorize(parts[i].str.strip().astype(str))
+            self.df[new_col] = pd.Categorical.from_codes(part_codes[codes], categories=categories)
 
         return self.df
 
@@ -75,49 +127,102 @@ class CCleaner:
     def convert_to_numeric(df: pd.DataFrame):
         """
         Limpia múltiples columnas numéricas eliminando comas y convierte a tipo numérico.
+        Todas las columnas se interpretan juntas en una sola pasada; solo si alguna
+        celda trae comas u otro texto se limpia el bloque y se usa `pd.to_numeric`.
+        Las columnas que solo tienen enteros (sin vacíos) quedan como int64.
         """
-        df = df.apply(
-            lambda col: pd.to_numeric(
-                col.astype(str).str.replace(",", ""), errors="coerce"
+        block = df.to_numpy(dtype=object).ravel()
+        try:
+            values = np.where(block == "", np.nan, block).astype("float64")
+        except (ValueError, TypeError):
+            parsed = pd.to_numeric(
+                pd.Series(block).astype(str).str.replace(",", "", regex=False),
+                errors="coerce",
             )
-        )
-        return df
+            values = parsed.to_numpy(dtype="float64")
+        values = values.reshape(df.shape)
+
+        result = pd.DataFrame(values, index=df.index, columns=df.columns)
+        integral = ~np.isnan(values).any(axis=0) & (values == np.trunc(values)).all(axis=0)
+        for i in np.flatnonzero(integral):
+            result.isetitem(i, result.iloc[:, i].astype("int64"))
+        return result
 
     def normalize_dep_column(self):
+        """
+        Normaliza los nombres con `ubigeos_peru`. Si la columna de código (p. ej.
+        UBI_DPTO) está presente, el nombre se toma del índice de ubigeos por código
+        y solo los códigos vacíos o desconocidos se validan por texto. Cada valor
+        distinto se valida una sola vez por proceso (y entre ejecuciones) gracias a
+        `UbigeoNormalizer`.
+        """
+        normalizer = get_normalizer()
         for col in self.df.columns:
-            if col.lower() in "departamento" or "departamento" in col.lower():
-                self.df[col] = self.df[col].apply(lambda x: str(x).strip())
-                self.df[col] = ubg.validate_departamento(self.df[col], on_error="capitalize")
-            
-            elif col.lower() in "provincia" or "provincia" in col.lower():
-                self.df[col] = self.df[col].apply(lambda x: str(x).strip())
-                self.df[col] = ubg.validate_provincia(self.df[col], on_error="capitalize")
-
-            elif col.lower() in "distrito" or "distrito" in col.lower():
-                self.df[col] = self.df[col].apply(lambda x: str(x).strip())
-                self.df[col] = ubg.validate_distrito(self.df[col], on_error="capitalize")
+            for nivel in ("departamento", "provincia", "distrito"):
+                if col.lower() in nivel or nivel in col.lower():
+                    code_col = self.codigos_ubigeo[nivel]
+                    if code_col in self.df.columns:
+                        self.df[col] = self._resolve_by_code(col, code_col, nivel)
+                    else:
+                        self.df[col] = self._recode(
+                            self.df[col],
+                            lambda u, nivel=nivel: normalizer.normalize(
+                                nivel, u.astype(str).str.strip()
+                            ),
+                        )
+                    break
+
+    def _resolve_by_code(self, col: str, code_col: str, nivel: str) -> pd.Categorical:
+        """
+        Resuelve los pares distintos (código, nombre) con `UbigeoNormalizer.resolve`
+        y reparte el resultado a las filas con sus códigos.
+        """
+        code_idx, code_values = pd.factorize(self.df[code_col], use_na_sentinel=False)
+        name_idx, name_values = pd.factorize(self.df[col], use_na_sentinel=False)
+        n_names = max(len(name_values), 1)
+        pair_idx, pairs = pd.factorize(code_idx.astype(np.int64) * n_names + name_idx)
+        resolved = get_normalizer().resolve(
+            nivel,
+            pd.Series(np.asarray(code_values, dtype=object)[pairs // n_names]),
+            pd.Series(np.asarray(name_values, dtype=object)[pairs % n_names]),
+            counts=np.bincount(pair_idx, minlength=len(pairs)),
+        )
+        result_codes, categories = pd.factorize(resolved)
+        return pd.Categorical.from_codes(result_codes[pair_idx], categories=categories)
 
     def save_data(self):
         """
-        Guarda los datos extraídos en un archivo Excel.
+        Guarda los datos limpios en un archivo Excel o, con un formato columnar, en
+        la partición de cada año del almacén `output_path`.
+
+        Si el Excel está abierto (PermissionError) se guarda con otro nombre en lugar
+        de esperar a que se cierre, para no bloquear ejecuciones desatendidas.
         """
-        guardado = False
-        while not guardado:
+        if self.output_format != "excel":
+            PartitionedStore(self.output_path, self.output_format).write_frame(self.df)
+        else:
             try:
                 self.df.to_excel(self.output_path, index=False)
-                guardado = True
             except PermissionError:
-                logger.warning(f"No se puede guardar el archivo porque está abierto: {self.output_path}")
-                input("-> Presiona enter en la terminal cuando hayas cerrado el archivo para intentar de nuevo: ")
+                output_path = Path(self.output_path)
+                alternativo = output_path.with_name(
+                    f"{output_path.stem}_{datetime.now():%Y%m%d_%H%M%S}{output_path.suffix}"
+                )
+                logger.warning(
+                    f"No se puede guardar el archivo porque está abierto: {self.output_path}. "
+                    f"Se guardará como {alternativo}"
+                )
+                self.df.to_excel(alternativo, index=False)
+                self.output_path = alternativo
 
         logger.info(f"Datos guardados correctamente como {self.output_path}")
 
-    def clean(self):
+    def transform(self) -> pd.DataFrame:
         """
-        Función principal para procesar los archivos extraídos de Consulta Amigable.
-        - Convierte las últimas 8 columnas a numéricas.
+        Aplica la limpieza a `self.df` sin guardarlo:
+        - Divide las columnas de código y nombre (Departamento -> UBI_DPTO, Departamento).
         - Normaliza los nombres de departamentos, provincias o distritos si existen (SAN MARTIN -> San Martín)
-        - Guarda los datos procesados en un nuevo archivo.
+        - Convierte las últimas 8 columnas a numéricas.
         """
 
         if "Departamento (Meta)" in list(self.df.columns):
@@ -130,6 +235,9 @@ class CCleaner:
         # Aplicar split de columnas y mantener el orden
         columnas_nuevas = []
         primera_columna = [self.df.columns[0]]
+        # En la consulta mensual el mes va junto al año
+        if "Mes" in self.df.columns:
+            primera_columna.append("Mes")
         for source_col, new_cols, delimiter in self.encabezados:
             if source_col in list(
                 self.df.columns
@@ -150,8 +258,52 @@ class CCleaner:
         # 2. Normalizar nombres de departamentos y provincias
         self.normalize_dep_column()
         # 1. Convertir las últimas 8 columnas a numéricas
-        self.df.iloc[:, -8:] = self.convert_to_numeric(self.df.iloc[:, -8:])
+        numeric = self.convert_to_numeric(self.df.iloc[:, -8:])
+        offset = self.df.shape[1] - numeric.shape[1]
+        for i in range(numeric.shape[1]):
+            self.df.isetitem(offset + i, numeric.iloc[:, i])
+        return self.df
+
+    def clean(self):
+        """
+        Función principal para procesar los archivos extraídos de Consulta Amigable.
+        Limpia los datos con `transform` y los guarda en `output_path`.
+        """
+        self.transform()
+        self._report_normalizer(self.save_ubigeos)
 
         # Guardar archivo procesado
         self.save_data()
         return self.output_path
+
+    @staticmethod
+    def _report_normalizer(save: bool = False) -> None:
+        normalizer = get_normalizer()
+        logger.info(normalizer.summary())
+        if save:
+            normalizer.save()
+
+    @classmethod
+    def clean_chunks(
+        cls,
+        chunks: Iterable[pd.DataFrame],
+        sink: "RowSink | PartitionedStore",
+        save_ubigeos: bool = False,
+    ) -> Path:
+        """
+        Limpia los datos bloque por bloque (p. ej. `RowSink.read_chunks()`) y escribe
+        cada bloque limpio en `sink` (un `RowSink` o un `PartitionedStore`), sin
+        cargar todo el archivo en memoria. Con `save_ubigeos` guarda al final la
+        tabla de ubigeos normalizados (ver `UbigeoNormalizer.save`).
+
+        Returns
+        -------
+        Path
+            Path del archivo escrito por `sink`.
+        """
+        for chunk in chunks:
+            sink.write_frame(cls(input=chunk, output_path=sink.path).transform())
+        sink.close()
+        cls._report_normalizer(save_ubigeos)
+        logger.info(f"Datos guardados correctamente como {sink.path}")
+        return sink.path
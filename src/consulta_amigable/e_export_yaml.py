@@ -3,6 +3,10 @@ import yaml
 from pathlib import Path
 from .a_config import RouteConfig
 
+# Fila que las primeras versiones de `crear_ruta` guardaban en los niveles
+# iterados (la opción elegida en el menú); ahora esos niveles tienen fila vacía
+FILA_ITERAR_ANTIGUA = "ITERAR"
+
 
 def guardar_ruta_yaml(
     route: RouteConfig,
@@ -66,5 +70,19 @@ def cargar_ruta_yaml(
     """
     with path.open('r', encoding='utf-8') as f:
         data = yaml.safe_load(f)
-    
-    return RouteConfig.model_validate(data)
\ No newline at end of file
+
+    return RouteConfig.model_validate(_migrar_ruta_antigua(data))
+
+
+def _migrar_ruta_antigua(data: dict) -> dict:
+    """
+    Adapta en el lugar el contenido de un YAML de una versión anterior de
+    `crear_ruta`: la fila `FILA_ITERAR_ANTIGUA` de un nivel iterado pasa a ser
+    vacía, que es como `navegar_ruta` reconoce los niveles que recorren todas
+    sus filas. En un nivel no iterado "ITERAR" se conserva (sería el nombre de
+    una fila real).
+    """
+    for level in data.get("levels", []):
+        if level.get("iterate") and level.get("fila") == FILA_ITERAR_ANTIGUA:
+            level["fila"] = ""
+    return data
\ No newline at end of file
@@ -49,3 +49,20 @@ def setup_logger(
         logger.addHandler(file_handler)
 
     return logger
+
+
+def configure_default_logger(name: str = "consulta_amigable") -> logging.Logger:
+    """
+    Aplica `setup_logger` con los valores por defecto solo si el logger aún no
+    tiene handlers, respetando el nivel que ya se le haya asignado.
+
+    Args:
+        name: Nombre del logger.
+
+    Returns:
+        Logger del paquete.
+    """
+    logger = logging.getLogger(name)
+    if not logger.handlers:
+        setup_logger(name, level=logger.level or logging.INFO)
+    return logger
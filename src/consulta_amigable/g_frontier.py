@@ -0,0 +1,142 @@
+import asyncio
+from dataclasses import dataclass, field
+from typing import Sequence
+
+
+# =====================
+# Caminos y tareas
+# =====================
+@dataclass(frozen=True)
+class PathStep:
+    """
+    Un paso de navegación desde la raíz del año: click en una fila y luego en un botón.
+    """
+
+    row: str
+    button: str
+
+
+@dataclass(order=True)
+class SubtreeTask:
+    """
+    Subárbol pendiente de recorrer. Se identifica por el año y el camino de clicks
+    (`path`) que lleva desde la página inicial del año hasta el nivel donde empieza.
+
+    `order_key` guarda los índices de fila elegidos en cada nivel iterado, de modo
+    que ordenar por `(year, order_key)` reproduce el orden del recorrido secuencial
+    (el padre antes que sus hijos y los hermanos en el orden de la tabla).
+    """
+
+    priority: tuple = field(init=False, repr=False)
+    year: int = field(compare=False)
+    path: tuple[PathStep, ...] = field(default=(), compare=False)
+    context: dict[str, str] = field(default_factory=dict, compare=False)
+    order_key: tuple[int, ...] = field(default=(), compare=False)
+
+    def __post_init__(self):
+        # Los subárboles más profundos salen primero: así los workers libres
+        # "roban" trabajo de la cola larga (p. ej. los distritos de Lima) en vez
+        # de abrir nuevas ramas y el frontier se mantiene pequeño.
+        self.priority = (-len(self.order_key), self.year, self.order_key)
+
+    @property
+    def sort_key(self) -> tuple:
+        return (self.year, self.order_key)
+
+    @property
+    def level_index(self) -> int:
+        return len(self.path)
+
+    def child(
+        self, index: int, row: str, button: str, level_name: str
+    ) -> "SubtreeTask":
+        """
+        Retorna el subárbol que se obtiene al entrar en la fila `row` de este nivel.
+        """
+        return SubtreeTask(
+            year=self.year,
+            path=self.path + (PathStep(row, button),),
+            context={**self.context, level_name: row},
+            order_key=self.order_key + (index,),
+        )
+
+
+# =====================
+# Cola compartida
+# =====================
+class FrontierQueue:
+    """
+    Cola de prioridad compartida por los workers. Un worker que encuentra un nivel
+    `iterate` publica aquí las filas que no va a recorrer él mismo, y cualquier
+    worker libre las toma empezando por las más profundas.
+
+    Cada subárbol se publica una sola vez: si un worker repite un subárbol que
+    falló, los hijos que ya había publicado no vuelven a la cola.
+    """
+
+    def __init__(self):
+        self._queue: asyncio.PriorityQueue[SubtreeTask] = asyncio.PriorityQueue()
+        self._seen: set[tuple] = set()
+        self.published = 0
+
+    def put(self, task: SubtreeTask) -> bool:
+        """
+        Publica `task` y retorna True, o False si ya se había publicado.
+        """
+        if task.sort_key in self._seen:
+            return False
+        self._seen.add(task.sort_key)
+        self._queue.put_nowait(task)
+        self.published += 1
+        return True
+
+    async def get(self) -> SubtreeTask:
+        return await self._queue.get()
+
+    def task_done(self) -> None:
+        self._queue.task_done()
+
+    async def join(self) -> None:
+        """
+        Espera a que todas las tareas publicadas (incluidas las que se publiquen
+        mientras se procesan otras) hayan terminado.
+        """
+        await self._queue.join()
+
+    def qsize(self) -> int:
+        return self._queue.qsize()
+
+
+# =====================
+# Partes de una ruta
+# =====================
+def first_iterate_level(levels: Sequence) -> int | None:
+    """
+    Índice del primer nivel `iterate` de la ruta (None si no itera ningún nivel).
+    """
+    return next((i for i, level in enumerate(levels) if level.iterate), None)
+
+
+def keeps_table(levels: Sequence, level_index: int, shard: tuple[int, int] | None) -> bool:
+    """
+    True si la parte `shard = (i, k)` de un periodo guarda la tabla del nivel
+    `level_index`. Las tablas de los niveles hasta el primer `iterate` (incluido)
+    son las mismas en todas las partes, que recorren esos niveles completos: solo
+    las guarda la parte 0.
+    """
+    if shard is None or shard[0] == 0:
+        return True
+    first = first_iterate_level(levels)
+    return first is None or level_index > first
+
+
+def shard_range(n: int, shard: tuple[int, int] | None) -> range:
+    """
+    Índices de las `n` filas del primer nivel `iterate` que recorre la parte
+    `shard = (i, k)`: el i-ésimo de k bloques contiguos, de modo que concatenar las
+    partes en orden reproduce el orden del recorrido completo.
+    """
+    if shard is None:
+        return range(n)
+    i, k = shard
+    return range(n * i // k, n * (i + 1) // k)
@@ -0,0 +1,456 @@
+import asyncio
+import string
+from dataclasses import asdict, dataclass, field
+from html.parser import HTMLParser
+from urllib.parse import urljoin
+
+import httpx
+
+from .a_config import Locators, RouteConfig
+from .g_frontier import first_iterate_level, keeps_table, shard_range
+from .i_snapshot import TableSnapshot, resolve_headers
+from .m_cache import ResponseCache
+from .p_metrics import RunMetrics
+from .s_period import period_prefix, split_period
+from .w_governor import ConcurrencyGovernor
+
+
+# =====================
+# Parser del Navegador
+# =====================
+@dataclass
+class NavegadorPage:
+    """
+    Estado de una página del Navegador (el contenido de `frame0`) tal como llega del
+    servidor: el formulario WebForms con sus campos ocultos y la tabla de datos.
+    `path` son los clicks `(fila, botón)` que llevaron a la página desde el inicio
+    del año.
+    """
+
+    url: str
+    action: str = ""
+    hidden_fields: dict[str, str] = field(default_factory=dict)
+    buttons: dict[str, str] = field(default_factory=dict)  # value -> name
+    row_names: list[str] = field(default_factory=list)
+    row_radios: list[tuple[str, str]] = field(default_factory=list)  # (name, value)
+    table_rows: list[list[str]] = field(default_factory=list)
+    header_rows: dict[str, list[tuple[str, int]]] = field(default_factory=dict)
+    selects: dict[str, list[str]] = field(default_factory=dict)  # name -> opciones
+    selected: dict[str, str] = field(default_factory=dict)  # name -> opción elegida
+    frame_src: str | None = None
+    path: tuple[tuple[str, str], ...] = ()
+
+    def find_row(self, row_text: str) -> int:
+        """
+        Busca la fila igual que `filter(has_text=...)` en Playwright: primero una
+        coincidencia exacta y luego una que contenga el texto (sin distinguir
+        mayúsculas).
+        """
+        target = " ".join(row_text.split())
+        for i, name in enumerate(self.row_names):
+            if name == target:
+                return i
+        for i, name in enumerate(self.row_names):
+            if target.lower() in name.lower():
+                return i
+        raise ValueError(f"No se encontró la fila '{row_text}' en {self.url}")
+
+    def find_button(self, button_text: str) -> tuple[str, str]:
+        if button_text in self.buttons:
+            return self.buttons[button_text], button_text
+        for value, name in self.buttons.items():
+            if button_text.lower() in value.lower():
+                return name, value
+        raise ValueError(f"No se encontró el botón '{button_text}' en {self.url}")
+
+    def postback_data(self, row_text: str, button_text: str) -> tuple[str, dict[str, str]]:
+        """
+        URL y campos del formulario que envía el navegador al hacer click en la
+        fila `row_text` y luego en el botón `button_text`.
+        """
+        radio_name, radio_value = self.row_radios[self.find_row(row_text)]
+        button_name, button_value = self.find_button(button_text)
+        data = dict(self.hidden_fields)
+        data[radio_name] = radio_value
+        data[button_name] = button_value
+        return urljoin(self.url, self.action), data
+
+    def period_fields(self, anio: int, mes: int) -> list[tuple[str, str]]:
+        """
+        Listas desplegables de año y mes de la consulta mensual, cada una con la
+        opción de `anio` y `mes`. La del año es la que tiene `anio` entre sus
+        opciones y la del mes, la que tiene las opciones 1 a 12.
+        """
+        year_field = month_field = None
+        for name, values in self.selects.items():
+            numbers = {int(value): value for value in values if value.strip().isdigit()}
+            if year_field is None and anio in numbers:
+                year_field = (name, numbers[anio])
+            elif month_field is None and set(range(1, 13)) <= set(numbers):
+                month_field = (name, numbers[mes])
+        if year_field is None or month_field is None:
+            raise ValueError(f"No se encontraron las listas de año y mes en {self.url}")
+        return [year_field, month_field]
+
+    def select_data(self, name: str, value: str) -> tuple[str, dict[str, str]]:
+        """
+        URL y campos del postback que envía WebForms al elegir `value` en la lista
+        desplegable `name` (AutoPostBack).
+        """
+        data = {**self.hidden_fields, **self.selected}
+        data.update({"__EVENTTARGET": name, "__EVENTARGUMENT": "", name: value})
+        return urljoin(self.url, self.action), data
+
+    def headers(self) -> list[str]:
+        return resolve_headers(
+            self.header_rows.get(Locators.header_row_0, []),
+            self.header_rows.get(Locators.header_row_1, []),
+        )
+
+    def snapshot(self) -> TableSnapshot:
+        return TableSnapshot(headers=self.headers(), rows=self.table_rows)
+
+    def to_cache(self) -> dict:
+        return asdict(self)
+
+    @classmethod
+    def from_cache(cls, data: dict) -> "NavegadorPage":
+        page = cls(**data)
+        page.row_radios = [tuple(radio) for radio in page.row_radios]
+        page.path = tuple(tuple(step) for step in page.path)
+        return page
+
+
+class _NavegadorParser(HTMLParser):
+    """
+    Recorre el HTML una sola vez llenando un `NavegadorPage`.
+    """
+
+    def __init__(self, page: NavegadorPage):
+        super().__init__(convert_charrefs=True)
+        self.page = page
+        self._in_data_table = False
+        self._table_depth = 0
+        self._row: list[str] | None = None
+        self._row_id: str | None = None
+        self._cell: list[str] | None = None
+        self._cell_align: str | None = None
+        self._cell_colspan = 0
+        self._row_colspans: list[int] = []
+        self._row_radio: tuple[str, str] | None = None
+        self._row_name: str | None = None
+        self._select: str | None = None
+        self._option: list[str] | None = None
+        self._option_selected = False
+
+    def handle_starttag(self, tag, attrs):
+        attrs = {k: (v or "") for k, v in attrs}
+        if tag == "iframe" and attrs.get("name") == Locators.main_frame:
+            self.page.frame_src = attrs.get("src")
+        elif tag == "form" and not self.page.action:
+            self.page.action = attrs.get("action", "")
+        elif tag == "input":
+            kind = attrs.get("type", "text").lower()
+            if kind == "hidden" and attrs.get("name"):
+                self.page.hidden_fields[attrs["name"]] = attrs.get("value", "")
+            elif kind == "submit" and "display:none" not in attrs.get("style", "").replace(" ", ""):
+                self.page.buttons[attrs.get("value", "")] = attrs.get("name", "")
+            elif kind == "radio" and self._row is not None:
+                self._row_radio = (attrs.get("name", ""), attrs.get("value", ""))
+        elif tag == "select" and attrs.get("name"):
+            self._select = attrs["name"]
+            self.page.selects[self._select] = []
+        elif tag == "option" and self._select is not None:
+            self._option_selected = "selected" in attrs
+            if "value" in attrs:
+                self._add_option(attrs["value"])
+            else:
+                # Sin `value`, la opción vale su texto
+                self._option = []
+        elif tag == "table":
+            if self._in_data_table:
+                self._table_depth += 1
+            elif "Data" in attrs.get("class", "").split():
+                self._in_data_table = True
+                self._table_depth = 0
+        elif tag == "tr":
+            if self._row is not None:
+                self._close_row()
+            self._row, self._row_id = [], attrs.get("id")
+            self._row_colspans, self._row_radio, self._row_name = [], None, None
+        elif tag == "td" and self._row is not None:
+            self._cell = []
+            self._cell_align = attrs.get("align", "").lower()
+            self._cell_colspan = int(attrs.get("colspan") or 0)
+
+    def handle_endtag(self, tag):
+        if tag == "option" and self._option is not None:
+            self._add_option(" ".join("".join(self._option).split()))
+        elif tag == "select":
+            self._select = None
+        elif tag == "td" and self._cell is not None and self._row is not None:
+            text = " ".join("".join(self._cell).split())
+            self._row.append(text)
+            self._row_colspans.append(self._cell_colspan)
+            if self._cell_align == "left" and self._row_name is None:
+                self._row_name = text
+            self._cell = None
+        elif tag == "tr" and self._row is not None:
+            self._close_row()
+        elif tag == "table" and self._in_data_table:
+            if self._table_depth:
+                self._table_depth -= 1
+            else:
+                self._in_data_table = False
+
+    def handle_data(self, data):
+        if self._cell is not None:
+            self._cell.append(data)
+        elif self._option is not None:
+            self._option.append(data)
+
+    def _add_option(self, value: str):
+        self.page.selects[self._select].append(value)
+        if self._option_selected or self._select not in self.page.selected:
+            self.page.selected[self._select] = value
+        self._option = None
+
+    def _close_row(self):
+        if self._row_id in (Locators.header_row_0, Locators.header_row_1):
+            self.page.header_rows[self._row_id] = list(zip(self._row, self._row_colspans))
+        elif self._in_data_table and self._row:
+            # Mismo formato que `_extract_table_data`: textos sin comas de miles
+            self.page.table_rows.append([cell.replace(",", "").strip() for cell in self._row])
+            if self._row_name is not None:
+                self.page.row_names.append(self._row_name)
+                self.page.row_radios.append(self._row_radio or ("", ""))
+        self._row = None
+
+
+def monthly_url_template(url: str | None) -> bool:
+    """
+    True si `url` (la de la consulta mensual) es una plantilla con `{}` para el
+    año y el mes; False si es la página de la consulta, donde se eligen en sus
+    listas desplegables (ver `NavegadorPage.period_fields`). Cualquier otra URL
+    es un error de configuración.
+    """
+    if not url:
+        raise ValueError("La consulta mensual requiere una URL (URL_MENSUAL)")
+    fields = [name for _, name, _, _ in string.Formatter().parse(url) if name is not None]
+    if len(fields) not in (0, 2):
+        raise ValueError(
+            f"URL mensual inválida: {url!r}. Debe llevar `{{}}` para el año y el mes, o ninguno"
+        )
+    return bool(fields)
+
+
+def parse_navegador_page(url: str, html: str) -> NavegadorPage:
+    page = NavegadorPage(url=url)
+    parser = _NavegadorParser(page)
+    parser.feed(html)
+    parser.close()
+    return page
+
+
+# =====================
+# Motor HTTP
+# =====================
+class HttpEngine:
+    """
+    Recorre rutas del Navegador sin navegador: replica los postbacks de WebForms
+    (`__VIEWSTATE`, `__EVENTVALIDATION`, fila seleccionada y botón) con un cliente
+    HTTP con pool de conexiones y lee `table.Data` directamente del HTML.
+
+    Como cada página guarda su propio estado en los campos ocultos, volver a un
+    nivel anterior no requiere `go_back`: basta con volver a enviar el formulario
+    del padre con otra fila seleccionada. Por lo mismo, con una `ResponseCache`
+    las páginas guardadas (incluidos sus campos ocultos) reemplazan a la
+    solicitud y solo se envían al servidor los postbacks que faltan.
+    """
+
+    def __init__(
+        self,
+        url_anual: str,
+        max_in_flight: int = 8,
+        timeout: float = 20.0,
+        cache: ResponseCache | None = None,
+        metrics: RunMetrics | None = None,
+        url_mensual: str | None = None,
+        retries: int = 2,
+        backoff: float = 0.5,
+        blocks: dict[int, tuple[int, int]] | None = None,
+        governor: ConcurrencyGovernor | None = None,
+    ):
+        self.url_anual = url_anual
+        # Bloque (i, k) de las filas del primer nivel `iterate` a recorrer en cada
+        # periodo; los periodos sin bloque se recorren completos
+        self.blocks = blocks or {}
+        self.url_mensual = url_mensual
+        self.retries = retries
+        self.backoff = backoff
+        self.postbacks = 0
+        self.cache = cache
+        self.metrics = metrics or RunMetrics()
+        # Con un gobernador, el límite de postbacks en vuelo se ajusta según la
+        # latencia y los errores del servidor, hasta `governor.max_limit`
+        self.governor = governor
+        if governor is not None:
+            max_in_flight = governor.max_limit
+        self._semaphore = asyncio.Semaphore(max_in_flight)
+        self._client = httpx.AsyncClient(
+            timeout=timeout,
+            follow_redirects=True,
+            limits=httpx.Limits(
+                max_connections=max_in_flight, max_keepalive_connections=max_in_flight
+            ),
+        )
+
+    async def __aenter__(self) -> "HttpEngine":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+    async def _request(self, method: str, url: str, **kwargs) -> NavegadorPage:
+        """
+        Envía la solicitud y reintenta hasta `retries` veces, con espera
+        exponencial, si falla la conexión o el servidor responde 5xx. Reenviar un
+        postback es seguro: el estado de la página viaja en el propio formulario.
+        """
+        for attempt in range(self.retries + 1):
+            try:
+                async with self.governor.slot() if self.governor else self._semaphore:
+                    response = await self._client.request(method, url, **kwargs)
+                    response.raise_for_status()
+                return parse_navegador_page(str(response.url), response.text)
+            except (httpx.TransportError, httpx.HTTPStatusError) as e:
+                transient = not isinstance(e, httpx.HTTPStatusError) or e.response.status_code >= 500
+                if not transient or attempt >= self.retries:
+                    raise
+                self.metrics.count("retry")
+                await asyncio.sleep(self.backoff * 2**attempt)
+
+    async def open_year(self, year: int) -> NavegadorPage:
+        """
+        Carga `default.aspx` del año (o del periodo mensual, p. ej. 202403, con
+        `url_mensual`) y retorna la página inicial de `frame0`. Si `url_mensual`
+        no es una plantilla, el año y el mes se eligen en las listas de la página.
+        """
+        cached = self._cached(year, ())
+        if cached:
+            return cached
+        anio, mes = split_period(year)
+        select_period = False
+        if mes is None:
+            url = self.url_anual.format(anio)
+        elif monthly_url_template(self.url_mensual):
+            url = self.url_mensual.format(anio, mes)
+        else:
+            url, select_period = self.url_mensual, True
+        with self.metrics.time("navigate"):
+            page = await self._request("GET", url)
+            if page.frame_src is not None:
+                page = await self._request("GET", urljoin(page.url, page.frame_src))
+            if select_period:
+                for name, value in page.period_fields(anio, mes):
+                    action, data = page.select_data(name, value)
+                    page = await self._request("POST", action, data=data)
+        self._store(year, page)
+        return page
+
+    async def postback(
+        self, year: int, page: NavegadorPage, row_text: str, button_text: str, level: str = ""
+    ) -> NavegadorPage:
+        """
+        Equivale a hacer click en la fila `row_text` y luego en el botón `button_text`.
+        `level` es el nombre del nivel de la ruta, solo para las métricas.
+        """
+        path = page.path + ((row_text, button_text),)
+        cached = self._cached(year, path)
+        if cached:
+            return cached
+        url, data = page.postback_data(row_text, button_text)
+        self.postbacks += 1
+        with self.metrics.time("postback", level):
+            child = await self._request("POST", url, data=data)
+        child.path = path
+        self._store(year, child)
+        return child
+
+    def _cached(self, year: int, path: tuple) -> NavegadorPage | None:
+        if self.cache is None:
+            return None
+        data = self.cache.get("http", year, path, "page")
+        return NavegadorPage.from_cache(data) if data else None
+
+    def _store(self, year: int, page: NavegadorPage) -> None:
+        if self.cache is not None:
+            self.cache.put("http", year, page.path, "page", page.to_cache())
+
+    async def extract_year(self, route_config: RouteConfig, year: int) -> tuple[list, list]:
+        """
+        Recorre la ruta completa para un año.
+
+        Returns
+        -------
+        tuple[list, list]
+            Encabezados de la tabla extraída y filas en el mismo formato que
+            `ConsultaAmigable._extracted_data` (año, contexto y celdas).
+        """
+        headers: list[str] = []
+        page = await self.open_year(year)
+        rows = await self._walk(route_config, year, page, 0, {}, headers)
+        return headers, rows
+
+    async def _walk(
+        self,
+        route_config: RouteConfig,
+        year: int,
+        page: NavegadorPage,
+        level_index: int,
+        context: dict[str, str],
+        headers: list[str],
+    ) -> list:
+        rows = []
+        levels = route_config.levels
+        while level_index < len(levels):
+            level = levels[level_index]
+            if level.extract_table:
+                if not headers:
+                    headers.extend(page.headers())
+                if keeps_table(levels, level_index, self.blocks.get(year)):
+                    prefix = period_prefix(year) + list(context.values())
+                    rows.extend(prefix + row for row in page.table_rows)
+                    self.metrics.add_rows(level.name, len(page.table_rows))
+            if not level.button:
+                break
+            if level.fila:
+                page = await self.postback(year, page, level.fila, level.button, level.name)
+                level_index += 1
+                continue
+            if level.iterate:
+                names = page.row_names
+                if year in self.blocks and level_index == first_iterate_level(levels):
+                    names = [names[i] for i in shard_range(len(names), self.blocks[year])]
+                # Los hijos se piden en paralelo (limitados por el semáforo) y se
+                # concatenan en el orden de la tabla
+                children = await asyncio.gather(
+                    *(
+                        self._walk_child(route_config, year, page, level_index, context, headers, name)
+                        for name in names
+                    )
+                )
+                for child_rows in children:
+                    rows.extend(child_rows)
+            break
+        return rows
+
+    async def _walk_child(self, route_config, year, page, level_index, context, headers, name):
+        level = route_config.levels[level_index]
+        child = await self.postback(year, page, name, level.button, level.name)
+        return await self._walk(
+            route_config, year, child, level_index + 1, {**context, level.name: name}, headers
+        )
@@ -0,0 +1,77 @@
+import time
+from dataclasses import dataclass, field
+
+from playwright.async_api import Frame
+
+from .a_config import Locators
+
+# Se ejecuta dentro de `frame0` y devuelve en un solo viaje las dos filas de
+# encabezados (texto y colspan de cada celda) y el texto de todas las celdas de
+# `table.Data`.
+SNAPSHOT_JS = """
+() => {
+    const headerCells = (id) => {
+        const row = document.getElementById(id);
+        if (!row) return [];
+        return Array.from(row.querySelectorAll('td')).map(td => [
+            td.innerText.trim(),
+            parseInt(td.getAttribute('colspan') || '0', 10) || 0,
+        ]);
+    };
+    const rows = Array.from(document.querySelectorAll('%s tr'))
+        .map(tr => Array.from(tr.querySelectorAll('td')).map(td => td.innerText))
+        .filter(cells => cells.length > 0);
+    return {
+        superior: headerCells('%s'),
+        inferior: headerCells('%s'),
+        rows: rows,
+    };
+}
+""" % (Locators.table_data, Locators.header_row_0, Locators.header_row_1)
+
+
+def resolve_headers(
+    superior: list[tuple[str, int]], inferior: list[tuple[str, int]]
+) -> list[str]:
+    """
+    Encabezados finales a partir de las dos filas de encabezado: se omite la primera
+    celda (botón) y cada celda agrupada (`colspan`) se reemplaza por las celdas
+    correspondientes de la fila inferior.
+    """
+    textos_inferiores = [text for text, _ in inferior]
+    headers, idx_inferior = [], 0
+    for text, colspan in superior[1:]:
+        if colspan:
+            headers.extend(textos_inferiores[idx_inferior : idx_inferior + colspan])
+            idx_inferior += colspan
+        else:
+            headers.append(text)
+    return headers
+
+
+@dataclass
+class TableSnapshot:
+    """
+    Contenido de `table.Data` y de sus encabezados capturado de una sola vez.
+
+    `rows` conserva el formato de `_extract_table_data` (texto de cada celda, sin
+    comas de miles) y `elapsed` es la latencia de la extracción en segundos.
+    """
+
+    headers: list[str] = field(default_factory=list)
+    rows: list[list[str]] = field(default_factory=list)
+    elapsed: float = 0.0
+
+
+async def take_snapshot(frame: Frame) -> TableSnapshot:
+    """
+    Extrae encabezados y filas de `table.Data` con una única llamada a `evaluate`.
+    """
+    start = time.perf_counter()
+    raw = await frame.evaluate(SNAPSHOT_JS)
+    rows = [[cell.replace(",", "").strip() for cell in row] for row in raw["rows"]]
+    return TableSnapshot(
+        headers=resolve_headers(raw["superior"], raw["inferior"]),
+        rows=rows,
+        elapsed=time.perf_counter() - start,
+    )
@@ -0,0 +1,119 @@
+import asyncio
+from collections import Counter
+from dataclasses import dataclass, field
+from fnmatch import fnmatch
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from playwright.async_api import BrowserContext, Route
+
+
+# =====================
+# Perfil de bloqueo
+# =====================
+@dataclass
+class BlockingProfile:
+    """
+    Qué solicitudes se bloquean en las sesiones de scraping. Para leer `table.Data`
+    solo hacen falta los documentos (`default.aspx`, `frame0`) y sus postbacks.
+
+    Los scripts no se bloquean por defecto porque la selección de filas depende de
+    los manejadores de la página; los rastreadores de analítica sí.
+    """
+
+    resource_types: frozenset[str] = frozenset(
+        {"image", "stylesheet", "font", "media", "imageset", "texttrack"}
+    )
+    url_patterns: tuple[str, ...] = (
+        "*google-analytics.com*",
+        "*googletagmanager.com*",
+        "*doubleclick.net*",
+        "*facebook.net*",
+        "*hotjar.com*",
+    )
+    # Una solicitud HEAD por URL bloqueada distinta para estimar los bytes
+    # ahorrados. Desactivado por defecto: agrega tráfico al sitio
+    measure_savings: bool = False
+
+    def should_block(self, resource_type: str, url: str) -> bool:
+        if resource_type == "document":
+            return False
+        if resource_type in self.resource_types:
+            return True
+        return any(fnmatch(url, pattern) for pattern in self.url_patterns)
+
+
+# =====================
+# Interceptor
+# =====================
+@dataclass
+class RequestBlocker:
+    """
+    Intercepta las solicitudes de uno o más contextos de navegador según un
+    `BlockingProfile` y lleva la cuenta de lo bloqueado y lo permitido.
+    """
+
+    profile: BlockingProfile = field(default_factory=BlockingProfile)
+    allowed: int = 0
+    blocked_by_url: Counter = field(default_factory=Counter)
+    _sizes: dict[str, int] = field(default_factory=dict, init=False, repr=False)
+    _pending: set = field(default_factory=set, init=False, repr=False)
+
+    @property
+    def blocked(self) -> int:
+        return sum(self.blocked_by_url.values())
+
+    @property
+    def bytes_saved(self) -> int:
+        """
+        Bytes que no se descargaron, según el `Content-Length` de cada recurso
+        bloqueado (0 para los que no se pudieron medir).
+        """
+        return sum(n * self._sizes.get(url, 0) for url, n in self.blocked_by_url.items())
+
+    async def attach(self, context: "BrowserContext") -> None:
+        async def handle(route: "Route") -> None:
+            await self._handle(context, route)
+
+        await context.route("**/*", handle)
+
+    async def _handle(self, context: "BrowserContext", route: "Route") -> None:
+        request = route.request
+        if not self.profile.should_block(request.resource_type, request.url):
+            self.allowed += 1
+            await route.continue_()
+            return
+
+        url = request.url
+        if self.profile.measure_savings and url not in self.blocked_by_url:
+            task = asyncio.create_task(self._measure(context, url))
+            self._pending.add(task)
+            task.add_done_callback(self._pending.discard)
+        self.blocked_by_url[url] += 1
+        await route.abort("blockedbyclient")
+
+    async def close(self) -> None:
+        """
+        Cancela las mediciones pendientes; se llama antes de cerrar los contextos.
+        """
+        for task in list(self._pending):
+            task.cancel()
+        await asyncio.gather(*self._pending, return_exceptions=True)
+        self._pending.clear()
+
+    async def _measure(self, context: "BrowserContext", url: str) -> None:
+        try:
+            response = await context.request.head(url, timeout=5_000)
+            self._sizes[url] = int(response.headers.get("content-length", 0))
+        except Exception:
+            # Solo afecta a la estimación de bytes ahorrados
+            self._sizes[url] = 0
+
+    def summary(self) -> str:
+        summary = f"Solicitudes bloqueadas: {self.blocked}, permitidas: {self.allowed}"
+        if self.profile.measure_savings:
+            summary += f", ~{self.bytes_saved / 1024:.0f} KB ahorrados"
+        elif self.blocked:
+            # Sin solicitudes HEAD no hay tamaños: no se informa un 0 engañoso
+            summary += ", bytes ahorrados: no medidos (BlockingProfile(measure_savings=True))"
+        return summary
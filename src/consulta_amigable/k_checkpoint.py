@@ -0,0 +1,167 @@
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Iterator
+
+logger = logging.getLogger("consulta_amigable")
+
+
+class RunJournal:
+    """
+    Bitácora en disco (JSONL) de una ejecución de `navegar_ruta`. Cada tabla
+    extraída se escribe apenas termina, junto con el año, el camino de contexto
+    (filas elegidas en los niveles iterados), su posición en el recorrido y el
+    nivel de la ruta que la extrajo: un mismo contexto puede tener tablas de
+    varios niveles. También
+    se registran los subárboles ya completados para poder saltarlos al reanudar.
+
+    En memoria solo se guarda la posición de cada tabla dentro del archivo; las
+    filas se vuelven a leer del disco con `iter_rows`.
+
+    Cada registro se vuelca al sistema operativo apenas se escribe (sobrevive a
+    la caída del proceso), pero `fsync` se hace a lo sumo cada `fsync_interval`
+    segundos y al cerrar: una caída del equipo puede perder los últimos
+    registros, que al reanudar simplemente se vuelven a extraer.
+
+    Formato de cada línea:
+        {"route": ..., "headers": [...]}
+        {"route": ..., "year": ..., "path": [...], "key": [...], "level": ...,
+         "prefix": [...], "rows": [...]}
+        {"route": ..., "year": ..., "path": [...], "done": true}
+    """
+
+    def __init__(
+        self, path: Path, route_name: str, resume: bool = False, fsync_interval: float = 5.0
+    ):
+        self.path = Path(path)
+        self.route_name = route_name
+        self.fsync_interval = fsync_interval
+        self._last_fsync = time.monotonic()
+        # (año, key) -> {nivel: posición en el archivo}
+        self._offsets: dict[tuple, dict[int, int]] = {}
+        # (año, key, nivel) de las tablas de ejecuciones anteriores
+        self._previous: set[tuple] = set()
+        self._done: set[tuple] = set()
+        self.headers: list[str] = []
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if resume and self.path.exists():
+            self._load()
+            self._previous = {
+                (*entry, level) for entry, levels in self._offsets.items() for level in levels
+            }
+            logger.info(
+                f"♻️  Reanudando desde {self.path}: {len(self._previous)} tablas y "
+                f"{len(self._done)} subárboles completados"
+            )
+            self._file = self.path.open("ab")
+        else:
+            self._file = self.path.open("wb")
+
+    @staticmethod
+    def _done_key(year: int, path: list[str]) -> tuple:
+        return (int(year), tuple(path))
+
+    def _load(self) -> None:
+        with self.path.open("rb") as f:
+            offset = 0
+            for line in f:
+                start, offset = offset, offset + len(line)
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # Última línea cortada por una caída a mitad de escritura
+                    continue
+                if record.get("route") != self.route_name:
+                    continue
+                if "headers" in record:
+                    self.headers = record["headers"]
+                elif record.get("done"):
+                    self._done.add(self._done_key(record["year"], record["path"]))
+                else:
+                    key = (int(record["year"]), tuple(record["key"]))
+                    self._offsets.setdefault(key, {})[record.get("level", 0)] = start
+
+    def _write(self, record: dict) -> int:
+        offset = self._file.tell()
+        self._file.write((json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8"))
+        self._file.flush()
+        if time.monotonic() - self._last_fsync >= self.fsync_interval:
+            self._fsync()
+        return offset
+
+    def _fsync(self) -> None:
+        os.fsync(self._file.fileno())
+        self._last_fsync = time.monotonic()
+
+    def record_headers(self, headers: list[str]) -> None:
+        self.headers = list(headers)
+        self._write({"route": self.route_name, "headers": self.headers})
+
+    def record_rows(
+        self,
+        year: int,
+        path: list[str],
+        key: tuple[int, ...],
+        rows: list,
+        level: int = 0,
+        prefix: list | None = None,
+    ) -> None:
+        """
+        Guarda las filas de la tabla que extrajo el nivel `level` de la ruta. `key`
+        ordena la tabla dentro del año y, con el mismo `key`, el nivel. Volver a
+        guardar la misma tabla (p. ej. al reintentar un paso) reemplaza la anterior.
+        `prefix` (periodo y contexto, común a todas las filas) se guarda una sola
+        vez y `iter_rows` lo antepone a cada fila.
+        """
+        self._offsets.setdefault((int(year), tuple(key)), {})[level] = self._write(
+            {
+                "route": self.route_name, "year": year, "path": path, "key": list(key),
+                "level": level, "prefix": prefix or [], "rows": rows,
+            }
+        )
+
+    def has_previous_rows(self, year: int, key: tuple[int, ...], level: int = 0) -> bool:
+        """
+        True si la tabla ya se había guardado en una ejecución anterior.
+        """
+        return (int(year), tuple(key), level) in self._previous
+
+    def mark_done(self, year: int, path: list[str]) -> None:
+        """
+        Marca como completado el subárbol de `path` (o el año entero si está vacío).
+        """
+        self._done.add(self._done_key(year, path))
+        self._write({"route": self.route_name, "year": year, "path": path, "done": True})
+
+    def is_done(self, year: int, path: list[str]) -> bool:
+        return self._done_key(year, path) in self._done
+
+    def iter_rows(self, previous_only: bool = False) -> Iterator[list]:
+        """
+        Filas registradas (de esta ejecución y de las anteriores) en el orden del
+        recorrido: por año y luego por posición en la ruta. Con `previous_only`
+        solo se leen las de ejecuciones anteriores.
+        """
+        self._file.flush()
+        with self.path.open("rb") as f:
+            for entry in sorted(self._offsets):
+                levels = self._offsets[entry]
+                for level in sorted(levels):
+                    if previous_only and (*entry, level) not in self._previous:
+                        continue
+                    f.seek(levels[level])
+                    record = json.loads(f.readline())
+                    prefix = record.get("prefix", [])
+                    for row in record["rows"]:
+                        yield prefix + row
+
+    def close(self, delete: bool = False) -> None:
+        if not delete:
+            self._file.flush()
+            self._fsync()
+        self._file.close()
+        if delete:
+            self.path.unlink(missing_ok=True)
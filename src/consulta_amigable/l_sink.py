@@ -0,0 +1,212 @@
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Iterator
+
+import pandas as pd
+
+
+# =====================
+# Interfaz
+# =====================
+class RowSink(ABC):
+    """
+    Destino de filas extraídas. Las filas se acumulan en un buffer de a lo sumo
+    `batch_size` filas y se escriben en disco al llenarse, de modo que la memoria
+    usada no depende del tamaño de la extracción.
+
+    Las subclases implementan `_write_batch` (agregar un lote al archivo) e
+    `iter_chunks` (leer por partes un archivo ya escrito, p. ej. la salida
+    parcial de otra ejecución).
+    """
+
+    suffix = ""
+
+    def __init__(self, path: str | Path, batch_size: int = 5_000, append: bool = False):
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self.columns: list[str] | None = None
+        self.rows_written = 0
+        self._buffer: list[list] = []
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if not append:
+            self.path.unlink(missing_ok=True)
+
+    def write(self, rows: list[list]) -> None:
+        """
+        Agrega filas (listas de valores en el orden de `columns`).
+        """
+        self._buffer.extend(rows)
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def write_frame(self, df: pd.DataFrame) -> None:
+        """
+        Escribe un DataFrame completo (p. ej. un bloque ya limpiado) como un lote.
+        """
+        self.flush()
+        if self.columns is None:
+            self.columns = [str(col) for col in df.columns]
+        if not df.empty:
+            self._write_batch(df)
+            self.rows_written += len(df)
+
+    def flush(self) -> None:
+        if not self._buffer:
+            return
+        if self.columns is None:
+            raise ValueError("Se deben definir las columnas antes de escribir filas")
+        df = pd.DataFrame(self._buffer, columns=self.columns)
+        self._buffer = []
+        self._write_batch(df)
+        self.rows_written += len(df)
+
+    def close(self) -> None:
+        self.flush()
+
+    def exists(self) -> bool:
+        return self.path.exists() and self.path.stat().st_size > 0
+
+    @abstractmethod
+    def _write_batch(self, df: pd.DataFrame) -> None:
+        """
+        Agrega el lote `df` al archivo.
+        """
+
+    def read_chunks(self, chunksize: int = 100_000) -> Iterator[pd.DataFrame]:
+        return self.iter_chunks(self.path, chunksize)
+
+    @classmethod
+    @abstractmethod
+    def iter_chunks(cls, path: str | Path, chunksize: int = 100_000) -> Iterator[pd.DataFrame]:
+        """
+        Lee por partes de a lo sumo `chunksize` filas el archivo `path`.
+        """
+
+    @staticmethod
+    def _restore_types(df: pd.DataFrame) -> pd.DataFrame:
+        # Los formatos de texto devuelven todo como str; el año y el mes vuelven a
+        # ser enteros
+        for col in ("Año", "Mes"):
+            if col in df.columns:
+                df[col] = pd.to_numeric(df[col], errors="coerce").astype("Int64")
+        return df
+
+
+def esquema_estable(schema):
+    """
+    Esquema de Arrow que sirve para todos los bloques de una misma extracción. Un
+    bloque con montos faltantes llega como float y cada bloque categórico trae sus
+    propias categorías, así que los enteros (salvo "Año" y "Mes") pasan a float64 y los
+    diccionarios a su tipo de valor. Parquet vuelve a codificar el texto por
+    diccionario al escribir.
+    """
+    import pyarrow as pa
+
+    return pa.schema(
+        [
+            f.with_type(pa.float64())
+            if pa.types.is_integer(f.type) and f.name not in ("Año", "Mes")
+            else f.with_type(f.type.value_type)
+            if pa.types.is_dictionary(f.type)
+            else f
+            for f in schema
+        ]
+    )
+
+
+# =====================
+# Implementaciones
+# =====================
+class CsvSink(RowSink):
+    suffix = ".csv"
+
+    def _write_batch(self, df: pd.DataFrame) -> None:
+        df.to_csv(self.path, mode="a", header=not self.exists(), index=False)
+
+    @classmethod
+    def iter_chunks(cls, path: str | Path, chunksize: int = 100_000) -> Iterator[pd.DataFrame]:
+        reader = pd.read_csv(path, chunksize=chunksize, dtype=str, keep_default_na=False)
+        for chunk in reader:
+            # pandas renombra la columna vacía del botón al leerla
+            chunk.columns = [
+                "" if str(col).startswith("Unnamed:") else col for col in chunk.columns
+            ]
+            yield cls._restore_types(chunk)
+
+
+class JsonlSink(RowSink):
+    suffix = ".jsonl"
+
+    def _write_batch(self, df: pd.DataFrame) -> None:
+        with self.path.open("a", encoding="utf-8") as f:
+            df.to_json(f, orient="records", lines=True, force_ascii=False)
+            f.write("\n")
+
+    @classmethod
+    def iter_chunks(cls, path: str | Path, chunksize: int = 100_000) -> Iterator[pd.DataFrame]:
+        reader = pd.read_json(path, lines=True, chunksize=chunksize, dtype=False, encoding="utf-8")
+        for chunk in reader:
+            yield cls._restore_types(chunk)
+
+
+class ParquetSink(RowSink):
+    """
+    Cada lote se escribe como un row group del mismo archivo Parquet. Requiere
+    `pyarrow` (`pip install consulta_amigable[parquet]`).
+    """
+
+    suffix = ".parquet"
+
+    def __init__(self, path: str | Path, batch_size: int = 5_000, append: bool = False):
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError as e:
+            raise ImportError(
+                "ParquetSink requiere pyarrow: pip install consulta_amigable[parquet]"
+            ) from e
+        if append:
+            raise ValueError("Un archivo Parquet no admite agregar lotes después de cerrado")
+        super().__init__(path, batch_size=batch_size, append=False)
+        self._writer = None
+
+    def _write_batch(self, df: pd.DataFrame) -> None:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        if self._writer is None:
+            schema = esquema_estable(table.schema)
+            self._writer = pq.ParquetWriter(self.path, schema)
+            table = table.cast(schema)
+        else:
+            table = table.cast(self._writer.schema)
+        self._writer.write_table(table)
+
+    def close(self) -> None:
+        super().close()
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    @classmethod
+    def iter_chunks(cls, path: str | Path, chunksize: int = 100_000) -> Iterator[pd.DataFrame]:
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize):
+            yield cls._restore_types(batch.to_pandas())
+
+
+SINKS: dict[str, type[RowSink]] = {
+    "csv": CsvSink,
+    "jsonl": JsonlSink,
+    "parquet": ParquetSink,
+}
+
+
+def crear_sink(fmt: str, path: str | Path, **kwargs) -> RowSink:
+    """
+    Crea el sink del formato indicado ("csv", "jsonl" o "parquet").
+    """
+    if fmt not in SINKS:
+        raise ValueError(f"Formato no soportado: {fmt}. Opciones: {list(SINKS)}")
+    return SINKS[fmt](path, **kwargs)
@@ -0,0 +1,85 @@
+import gzip
+import hashlib
+import json
+import logging
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable
+
+from .s_period import split_period
+
+logger = logging.getLogger("consulta_amigable")
+
+
+class ResponseCache:
+    """
+    Caché en disco de las tablas del Navegador. Cada entrada se identifica por el
+    motor que la guardó, el año, el camino de clicks `(fila, botón)` que llevó a la
+    página y el tipo de contenido, y se guarda como JSON comprimido con gzip en
+    `<directory>/<namespace>/<año>/<hash>.json.gz`.
+
+    Los años cerrados no cambian, así que las entradas guardadas después del fin
+    de su año no vencen. Las guardadas mientras el año estaba en curso vencen a
+    los `current_year_ttl` segundos, aunque el año ya haya terminado.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        current_year_ttl: float = 6 * 3600,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.directory = Path(directory)
+        self.current_year_ttl = current_year_ttl
+        self.hits = 0
+        self.misses = 0
+        self._clock = clock
+
+    def ttl_for(self, year: int, stored_at: float) -> float | None:
+        """
+        Segundos de validez de una entrada de `year` guardada en `stored_at`
+        (None = no vence). `year` puede ser también un periodo mensual (202403).
+        """
+        if stored_at >= datetime(split_period(year)[0] + 1, 1, 1).timestamp():
+            return None
+        return self.current_year_ttl
+
+    def _path(self, namespace: str, year: int, path: tuple, kind: str) -> Path:
+        key = json.dumps([namespace, int(year), [list(step) for step in path], kind], ensure_ascii=False)
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return self.directory / namespace / str(year) / f"{digest}.json.gz"
+
+    def get(self, namespace: str, year: int, path: tuple, kind: str) -> dict | None:
+        """
+        Retorna el contenido guardado o None si no existe o ya venció.
+        """
+        file = self._path(namespace, year, path, kind)
+        try:
+            with gzip.open(file, "rt", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, EOFError, json.JSONDecodeError):
+            self.misses += 1
+            return None
+
+        ttl = self.ttl_for(year, entry["stored_at"])
+        if ttl is not None and self._clock() - entry["stored_at"] > ttl:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry["data"]
+
+    def put(self, namespace: str, year: int, path: tuple, kind: str, data: dict) -> None:
+        file = self._path(namespace, year, path, kind)
+        file.parent.mkdir(parents=True, exist_ok=True)
+        # Se escribe a un temporal y se renombra para no dejar entradas cortadas
+        tmp = file.with_name(f"{file.name}.{os.getpid()}.tmp")
+        with gzip.open(tmp, "wt", encoding="utf-8") as f:
+            json.dump({"stored_at": self._clock(), "data": data}, f, ensure_ascii=False)
+        os.replace(tmp, file)
+
+    def summary(self) -> str:
+        total = self.hits + self.misses
+        ratio = self.hits / total * 100 if total else 0.0
+        return f"Caché: {self.hits} aciertos, {self.misses} fallos ({ratio:.0f}% desde disco)"
@@ -0,0 +1,171 @@
+import json
+import logging
+import os
+from collections import OrderedDict
+from functools import lru_cache
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from typing import Literal
+
+import numpy as np
+import pandas as pd
+import ubigeos_peru as ubg
+
+logger = logging.getLogger("consulta_amigable")
+
+Nivel = Literal["departamento", "provincia", "distrito"]
+
+VALIDADORES = {
+    "departamento": ubg.validate_departamento,
+    "provincia": ubg.validate_provincia,
+    "distrito": ubg.validate_distrito,
+}
+
+
+@lru_cache(maxsize=None)
+def referencia(nivel: Nivel) -> dict[str, str]:
+    """
+    Índice código INEI -> nombre oficial ("22" -> "San Martín", "0101" ->
+    "Chachapoyas"), cargado una vez por proceso desde `ubigeos_peru`.
+    """
+    return dict(ubg.cargar_diccionario(f"{nivel}s")["inei"])
+
+
+def _default_path() -> Path:
+    base = os.environ.get("CONSULTA_AMIGABLE_CACHE")
+    base = Path(base) if base else Path.home() / ".cache" / "consulta_amigable"
+    return base / "ubigeos.json"
+
+
+def _ubg_version() -> str:
+    try:
+        return version("ubigeos_peru")
+    except PackageNotFoundError:
+        return "desconocida"
+
+
+class UbigeoNormalizer:
+    """
+    Memoriza los nombres normalizados por `ubigeos_peru` (validate_departamento,
+    validate_provincia, validate_distrito con `on_error="capitalize"`).
+
+    Los valores se guardan en un LRU de a lo sumo `maxsize` entradas que se
+    comparte entre instancias de `CCleaner` (ver `get_normalizer`). Solo con
+    `save` (o `CCleaner(save_ubigeos=True)`) se escriben en una tabla JSON
+    pequeña, en `$CONSULTA_AMIGABLE_CACHE` o `~/.cache/consulta_amigable`. La
+    tabla se descarta si cambió la versión de `ubigeos_peru`, para que el
+    resultado sea siempre el mismo que sin caché.
+
+    Con `resolve` los nombres se obtienen por código (UBI_DPTO, UBI_PROV...) y la
+    validación por texto solo se usa para códigos vacíos o desconocidos.
+    """
+
+    def __init__(self, path: str | Path | None = None, maxsize: int = 8192):
+        self.path = Path(path) if path else _default_path()
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.code_hits = 0
+        self.fallbacks = 0
+        self._values: OrderedDict[tuple[str, str], str] = OrderedDict()
+        self._dirty = False
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return
+        if data.get("ubigeos_peru") != _ubg_version():
+            return
+        for nivel, valor, nombre in data.get("values", [])[-self.maxsize :]:
+            self._values[(nivel, valor)] = nombre
+
+    def save(self) -> None:
+        """
+        Escribe la tabla en disco si hubo valores nuevos.
+        """
+        if not self._dirty:
+            return
+        data = {
+            "ubigeos_peru": _ubg_version(),
+            "values": [[nivel, valor, nombre] for (nivel, valor), nombre in self._values.items()],
+        }
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+            tmp.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+            os.replace(tmp, self.path)
+            self._dirty = False
+        except OSError as e:
+            # La tabla solo acelera ejecuciones futuras
+            logger.warning(f"No se pudo guardar la caché de ubigeos en {self.path}: {e}")
+
+    def normalize(self, nivel: Nivel, values: pd.Series) -> pd.Series:
+        """
+        Normaliza valores distintos (ya sin espacios). Solo los que no están en la
+        caché se validan, en una única llamada a `ubigeos_peru`.
+        """
+        result = []
+        pendientes = []
+        for valor in values:
+            nombre = self._values.get((nivel, valor))
+            if nombre is None:
+                pendientes.append(valor)
+            else:
+                self._values.move_to_end((nivel, valor))
+            result.append(nombre)
+        self.hits += len(result) - len(pendientes)
+        self.misses += len(pendientes)
+
+        if pendientes:
+            validados = VALIDADORES[nivel](pd.Series(pendientes, dtype=object), on_error="capitalize")
+            nuevos = dict(zip(pendientes, validados))
+            for valor, nombre in nuevos.items():
+                self._values[(nivel, valor)] = nombre
+            while len(self._values) > self.maxsize:
+                self._values.popitem(last=False)
+            self._dirty = True
+            result = [nuevos[v] if n is None else n for v, n in zip(values, result)]
+        return pd.Series(result, index=values.index, dtype=object)
+
+    def resolve(
+        self, nivel: Nivel, codes: pd.Series, names: pd.Series, counts: np.ndarray | None = None
+    ) -> pd.Series:
+        """
+        Nombres oficiales para pares distintos (código, nombre). El código se busca
+        en `referencia(nivel)`; solo los pares sin código conocido pasan por
+        `normalize`. `counts` es el número de filas de cada par, para el reporte.
+        """
+        if counts is None:
+            counts = np.ones(len(codes), dtype=np.int64)
+        result = pd.Series(codes, dtype=object).astype(str).str.strip().map(referencia(nivel))
+        missing = result.isna().to_numpy()
+        self.code_hits += int(counts[~missing].sum())
+        self.fallbacks += int(counts[missing].sum())
+        if missing.any():
+            fallback = pd.Series(names, dtype=object)[missing].astype(str).str.strip()
+            result[missing] = self.normalize(nivel, fallback).to_numpy()
+        return result
+
+    def summary(self) -> str:
+        total = self.hits + self.misses
+        ratio = self.hits / total * 100 if total else 0.0
+        return (
+            f"Ubigeos: {self.code_hits} filas resueltas por código, {self.fallbacks} "
+            f"por nombre; {self.hits} aciertos, {self.misses} validados "
+            f"({ratio:.0f}% desde caché)"
+        )
+
+
+_normalizer: UbigeoNormalizer | None = None
+
+
+def get_normalizer() -> UbigeoNormalizer:
+    """
+    Normalizador compartido por todo el proceso.
+    """
+    global _normalizer
+    if _normalizer is None:
+        _normalizer = UbigeoNormalizer()
+    return _normalizer
@@ -0,0 +1,154 @@
+import logging
+import os
+import shutil
+from pathlib import Path
+from typing import Iterable, Literal
+
+import pandas as pd
+
+from .l_sink import esquema_estable
+
+logger = logging.getLogger("consulta_amigable")
+
+EXCEL_MAX_ROWS = 1_048_575
+
+FormatoColumnar = Literal["parquet", "feather"]
+
+
+def _part_order(file: Path) -> tuple[str, int]:
+    """
+    Orden de escritura de las partes: por partición y luego por el número de la
+    parte (`part-2` antes que `part-10`).
+    """
+    _, _, index = file.stem.partition("-")
+    return str(file.parent), int(index) if index.isdigit() else -1
+
+
+class PartitionedStore:
+    """
+    Datos limpios de una ruta en formato columnar, particionados por año:
+
+        <directory>/year=2023/part-0.parquet
+        <directory>/year=2024/part-0.parquet
+
+    Los datos de la consulta mensual (con columna "Mes") se particionan además
+    por mes (`year=2024/month=03/part-0.parquet`).
+
+    Cada archivo tiene todas las columnas (incluido "Año") y se puede leer por
+    separado. Escribir un año (o un mes) reemplaza solo su partición; los demás no
+    se tocan. Requiere `pyarrow` (`pip install consulta_amigable[parquet]`).
+    """
+
+    def __init__(self, directory: str | Path, fmt: FormatoColumnar = "parquet"):
+        if fmt not in ("parquet", "feather"):
+            raise ValueError(f"Formato no soportado: {fmt}. Opciones: ['parquet', 'feather']")
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError as e:
+            raise ImportError(
+                "PartitionedStore requiere pyarrow: pip install consulta_amigable[parquet]"
+            ) from e
+        self.path = Path(directory)
+        self.fmt = fmt
+        self.rows_written = 0
+        # Partes escritas por (año, mes) en esta sesión; la primera limpia la partición
+        self._parts: dict[tuple[int, int | None], int] = {}
+
+    @property
+    def suffix(self) -> str:
+        return f".{self.fmt}"
+
+    def partition(self, year: int, month: int | None = None) -> Path:
+        path = self.path / f"year={int(year)}"
+        return path if month is None else path / f"month={int(month):02d}"
+
+    def years(self) -> list[int]:
+        if not self.path.exists():
+            return []
+        return sorted(
+            int(p.name.split("=", 1)[1])
+            for p in self.path.glob("year=*")
+            if p.is_dir() and any(p.rglob(f"*{self.suffix}"))
+        )
+
+    def months(self, year: int) -> list[int]:
+        """
+        Meses ya guardados de `year` (vacío si el año no está particionado por mes).
+        """
+        return sorted(
+            int(p.name.split("=", 1)[1])
+            for p in self.partition(year).glob("month=*")
+            if p.is_dir() and any(p.glob(f"*{self.suffix}"))
+        )
+
+    def write_frame(self, df: pd.DataFrame) -> None:
+        """
+        Escribe un DataFrame limpio (o un bloque de él) en la partición de cada año
+        (o de cada año y mes si tiene la columna "Mes").
+        """
+        if "Mes" in df.columns:
+            for (year, month), part in df.groupby(["Año", "Mes"], sort=True, observed=True):
+                self._write_part(int(year), part, int(month))
+        else:
+            for year, part in df.groupby("Año", sort=True, observed=True):
+                self._write_part(int(year), part)
+
+    def _write_part(self, year: int, df: pd.DataFrame, month: int | None = None) -> None:
+        import pyarrow as pa
+        import pyarrow.feather as feather
+        import pyarrow.parquet as pq
+
+        partition = self.partition(year, month)
+        key = (year, month)
+        if key not in self._parts:
+            shutil.rmtree(partition, ignore_errors=True)
+            self._parts[key] = 0
+        partition.mkdir(parents=True, exist_ok=True)
+
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        table = table.cast(esquema_estable(table.schema))
+        file = partition / f"part-{self._parts[key]}{self.suffix}"
+        tmp = file.with_name(f"{file.name}.{os.getpid()}.tmp")
+        if self.fmt == "parquet":
+            pq.write_table(table, tmp)
+        else:
+            feather.write_feather(table, tmp)
+        os.replace(tmp, file)
+        self._parts[key] += 1
+        self.rows_written += len(df)
+
+    def close(self) -> None:
+        pass
+
+    def read(self, years: Iterable[int] | None = None) -> pd.DataFrame:
+        """
+        Lee las particiones (todas o solo las de `years`) ordenadas por año.
+        """
+        import pyarrow.dataset as ds
+
+        years = self.years() if years is None else sorted(years)
+        files = [
+            str(file)
+            for year in years
+            for file in sorted(self.partition(year).rglob(f"*{self.suffix}"), key=_part_order)
+        ]
+        if not files:
+            return pd.DataFrame()
+        fmt = "parquet" if self.fmt == "parquet" else "feather"
+        return ds.dataset(files, format=fmt).to_table().to_pandas()
+
+    def to_excel(self, output_path: str | Path) -> Path | None:
+        """
+        Exporta todo el almacén a un Excel. Si supera el límite de filas de Excel
+        no se exporta.
+        """
+        df = self.read()
+        if len(df) > EXCEL_MAX_ROWS:
+            logger.warning(
+                f"No se exporta a Excel: {len(df)} filas superan el límite de {EXCEL_MAX_ROWS}"
+            )
+            return None
+        output_path = Path(output_path)
+        df.to_excel(output_path, index=False)
+        logger.info(f"Excel exportado en {output_path}")
+        return output_path
@@ -0,0 +1,224 @@
+import json
+import time
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+
+# Límites superiores (en segundos) de los buckets de latencia
+BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+@dataclass
+class Histogram:
+    """
+    Histograma acumulado de latencias, con los mismos buckets que usa Prometheus
+    (`le` = menor o igual que el límite).
+    """
+
+    buckets: tuple[float, ...] = BUCKETS
+    counts: list[int] = field(default_factory=list)
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+
+    def __post_init__(self):
+        if not self.counts:
+            self.counts = [0] * len(self.buckets)
+
+    def observe(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        for i, limit in enumerate(self.buckets):
+            if seconds <= limit:
+                self.counts[i] += 1
+
+    def merge(self, other: "Histogram") -> None:
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> float:
+        """
+        Cuantil aproximado: el límite del primer bucket que acumula `q` de las
+        observaciones (o el máximo observado si cae en +Inf).
+        """
+        target = q * self.count
+        for limit, n in zip(self.buckets, self.counts):
+            if n >= target:
+                return min(limit, self.max)
+        return self.max
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "mean": self.mean,
+            "max": self.max,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "buckets": dict(zip(map(str, self.buckets), self.counts)),
+        }
+
+
+def _label(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class RunMetrics:
+    """
+    Métricas de una ejecución de `navegar_ruta`: latencia por acción (`click_row`,
+    `click_button`, `extract`, `navigate`, `go_back`, `iterate`, `postback`,
+    `clean`) y por nivel de la ruta, filas extraídas por nivel y eventos contados
+    (`retry`, `recovery`, `desync`...).
+
+    Los workers comparten la misma instancia, así que `summary()` refleja la
+    ejecución completa en cualquier momento. Al final se exporta con
+    `write_json` y `write_prometheus`.
+    """
+
+    def __init__(self, route_name: str = ""):
+        self.route_name = route_name
+        self.started = time.time()
+        self.latency: dict[tuple[str, str], Histogram] = {}
+        self.rows_by_level: Counter = Counter()
+        self.events: Counter = Counter()
+
+    def observe(self, action: str, level: str, seconds: float) -> None:
+        key = (action, level)
+        if key not in self.latency:
+            self.latency[key] = Histogram()
+        self.latency[key].observe(seconds)
+
+    @contextmanager
+    def time(self, action: str, level: str = ""):
+        """
+        Mide la duración del bloque (también si termina con una excepción).
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(action, level, time.perf_counter() - start)
+
+    def add_rows(self, level: str, n: int) -> None:
+        self.rows_by_level[level] += n
+
+    def count(self, event: str, n: int = 1) -> None:
+        self.events[event] += n
+
+    def merge(self, other: "RunMetrics") -> None:
+        """
+        Suma las métricas de otra ejecución (p. ej. las de un proceso worker).
+        """
+        for key, hist in other.latency.items():
+            self.latency.setdefault(key, Histogram()).merge(hist)
+        self.rows_by_level.update(other.rows_by_level)
+        self.events.update(other.events)
+
+    def _aggregate(self, index: int) -> dict[str, Histogram]:
+        result: dict[str, Histogram] = {}
+        for key, hist in self.latency.items():
+            result.setdefault(key[index], Histogram()).merge(hist)
+        return result
+
+    def by_action(self) -> dict[str, Histogram]:
+        return self._aggregate(0)
+
+    def by_level(self) -> dict[str, Histogram]:
+        return self._aggregate(1)
+
+    @property
+    def elapsed(self) -> float:
+        return time.time() - self.started
+
+    def summary(self) -> str:
+        """
+        Resumen de una línea por acción y de los niveles donde más tiempo se pasa.
+        """
+        lines = [
+            f"⏱️  {self.route_name} {self.elapsed:.0f}s, "
+            f"{sum(self.rows_by_level.values())} filas extraídas"
+        ]
+        for action, hist in sorted(self.by_action().items()):
+            lines.append(
+                f"   {action:<13} n={hist.count:<6} total={hist.total:8.1f}s "
+                f"media={hist.mean * 1000:6.0f}ms p95≤{hist.quantile(0.95) * 1000:6.0f}ms"
+            )
+        niveles = sorted(self.by_level().items(), key=lambda kv: kv[1].total, reverse=True)
+        for level, hist in niveles[:5]:
+            if level:
+                lines.append(f"   [{level}] {hist.total:8.1f}s en {hist.count} acciones")
+        if self.events:
+            lines.append("   " + ", ".join(f"{k}={n}" for k, n in sorted(self.events.items())))
+        return "\n".join(lines)
+
+    def to_dict(self) -> dict:
+        return {
+            "route": self.route_name,
+            "started": self.started,
+            "elapsed": self.elapsed,
+            "rows_by_level": dict(self.rows_by_level),
+            "events": dict(self.events),
+            "by_action": {k: v.to_dict() for k, v in self.by_action().items()},
+            "by_level": {k: v.to_dict() for k, v in self.by_level().items()},
+            "latency": [
+                {"action": action, "level": level, **hist.to_dict()}
+                for (action, level), hist in self.latency.items()
+            ],
+        }
+
+    def write_json(self, path: str | Path) -> Path:
+        path = Path(path)
+        path.write_text(json.dumps(self.to_dict(), indent=2, ensure_ascii=False), encoding="utf-8")
+        return path
+
+    def to_prometheus(self) -> str:
+        """
+        Métricas en el formato de texto de Prometheus (para el textfile collector
+        de node_exporter, por ejemplo).
+        """
+        route = _label(self.route_name)
+        lines = [
+            "# HELP consulta_amigable_action_seconds Latencia de las acciones del scraper.",
+            "# TYPE consulta_amigable_action_seconds histogram",
+        ]
+        for (action, level), hist in sorted(self.latency.items()):
+            labels = f'route="{route}",action="{_label(action)}",level="{_label(level)}"'
+            for limit, n in zip(hist.buckets, hist.counts):
+                lines.append(f'consulta_amigable_action_seconds_bucket{{{labels},le="{limit}"}} {n}')
+            lines.append(f'consulta_amigable_action_seconds_bucket{{{labels},le="+Inf"}} {hist.count}')
+            lines.append(f"consulta_amigable_action_seconds_sum{{{labels}}} {hist.total}")
+            lines.append(f"consulta_amigable_action_seconds_count{{{labels}}} {hist.count}")
+
+        lines += [
+            "# HELP consulta_amigable_rows_total Filas extraídas por nivel.",
+            "# TYPE consulta_amigable_rows_total counter",
+        ]
+        for level, n in sorted(self.rows_by_level.items()):
+            lines.append(f'consulta_amigable_rows_total{{route="{route}",level="{_label(level)}"}} {n}')
+
+        lines += [
+            "# HELP consulta_amigable_events_total Reintentos, recuperaciones y otros eventos.",
+            "# TYPE consulta_amigable_events_total counter",
+        ]
+        for event, n in sorted(self.events.items()):
+            lines.append(f'consulta_amigable_events_total{{route="{route}",event="{_label(event)}"}} {n}')
+
+        lines += [
+            "# HELP consulta_amigable_run_seconds Duración de la ejecución.",
+            "# TYPE consulta_amigable_run_seconds gauge",
+            f'consulta_amigable_run_seconds{{route="{route}"}} {self.elapsed}',
+        ]
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str | Path) -> Path:
+        path = Path(path)
+        path.write_text(self.to_prometheus(), encoding="utf-8")
+        return path
@@ -0,0 +1,58 @@
+import asyncio
+from typing import Awaitable, Callable
+
+from playwright.async_api import Page
+
+
+# =====================
+# Pool de páginas
+# =====================
+class PagePool:
+    """
+    Páginas (cada una en su propio contexto) abiertas sobre un único Chromium y
+    compartidas por varias rutas. A lo sumo `size` páginas están en uso a la vez:
+    `acquire` espera a que otra se libere. Las páginas liberadas se reutilizan
+    (con las cookies borradas) en lugar de abrir contextos nuevos.
+    """
+
+    def __init__(self, new_page: Callable[[], Awaitable[Page]], size: int):
+        if size < 1:
+            raise ValueError("El pool necesita al menos una página")
+        self.size = size
+        self.created = 0
+        self.reused = 0
+        self._new_page = new_page
+        self._idle: list[Page] = []
+        self._slots = asyncio.Semaphore(size)
+
+    async def acquire(self) -> Page:
+        await self._slots.acquire()
+        try:
+            while self._idle:
+                page = self._idle.pop()
+                if not page.is_closed():
+                    self.reused += 1
+                    return page
+            page = await self._new_page()
+            self.created += 1
+            return page
+        except BaseException:
+            self._slots.release()
+            raise
+
+    async def release(self, page: Page) -> None:
+        try:
+            if not page.is_closed():
+                # La siguiente ruta empieza con una sesión de WebForms nueva
+                await page.context.clear_cookies()
+                self._idle.append(page)
+        finally:
+            self._slots.release()
+
+    async def close(self) -> None:
+        for page in self._idle:
+            await page.context.close()
+        self._idle.clear()
+
+    def summary(self) -> str:
+        return f"Páginas: {self.created} contextos abiertos, {self.reused} reutilizados (máx. {self.size})"
@@ -0,0 +1,171 @@
+import asyncio
+import logging
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Iterable
+
+from .a_config import LevelConfig, RouteConfig
+from .h_http_engine import HttpEngine, NavegadorPage
+from .p_metrics import RunMetrics
+from .s_period import period_prefix
+
+logger = logging.getLogger("consulta_amigable")
+
+
+# =====================
+# Árbol de prefijos
+# =====================
+@dataclass
+class PlanNode:
+    """
+    Una página del recorrido. `levels` tiene, para cada ruta que pasa por aquí,
+    su `LevelConfig` en esta profundidad; `children` las páginas siguientes,
+    indexadas por el paso `(fila, botón)` que lleva a ellas (fila "" = iterar
+    todas las filas).
+    """
+
+    levels: dict[str, LevelConfig] = field(default_factory=dict)
+    children: dict[tuple[str, str], "PlanNode"] = field(default_factory=dict)
+
+
+def step_key(level: LevelConfig) -> tuple[str, str] | None:
+    """
+    Paso que sale de un nivel, o None si la ruta termina en él.
+    """
+    if not level.button:
+        return None
+    if level.fila:
+        return (level.fila, level.button)
+    if level.iterate:
+        return ("", level.button)
+    return None
+
+
+def build_plan(routes: Iterable[RouteConfig]) -> PlanNode:
+    """
+    Compila las rutas en un árbol de prefijos: los niveles iniciales con la
+    misma fila y botón quedan en el mismo nodo y se recorren una vez.
+    """
+    root = PlanNode()
+    for route in routes:
+        node = root
+        for level in route.levels:
+            node.levels[route.route_name] = level
+            key = step_key(level)
+            if key is None:
+                break
+            node = node.children.setdefault(key, PlanNode())
+    return root
+
+
+# =====================
+# Ejecución compartida
+# =====================
+class SharedPrefixRunner:
+    """
+    Recorre con un `HttpEngine` varias rutas a la vez siguiendo su árbol de
+    prefijos. Cada año se recorre una sola vez (en la primera llamada a
+    `extract_year` de cualquiera de las rutas) y las filas se reparten a cada
+    ruta con su propio contexto, en el mismo orden que `HttpEngine.extract_year`.
+
+    Tiene la misma interfaz que `HttpEngine` para `_extract_data_http`.
+    """
+
+    def __init__(self, engine: HttpEngine):
+        self.engine = engine
+        self.steps = 0
+        self.naive_steps = 0
+        self._years: dict[str, set[int]] = {}
+        self._routes: dict[str, RouteConfig] = {}
+        self._runs: dict[int, asyncio.Future] = {}
+
+    @property
+    def postbacks(self) -> int:
+        return self.engine.postbacks
+
+    def register(self, route_config: RouteConfig, years: Iterable[int]) -> None:
+        self._routes[route_config.route_name] = route_config
+        self._years[route_config.route_name] = set(years)
+
+    async def extract_year(
+        self, route_config: RouteConfig, year: int, metrics: RunMetrics | None = None
+    ) -> tuple[list, list]:
+        if year not in self._runs:
+            self._runs[year] = asyncio.ensure_future(self._run_year(year))
+        # shield: si una ruta se cancela, el recorrido sigue para las demás
+        headers, rows, rows_by_level = (await asyncio.shield(self._runs[year]))[
+            route_config.route_name
+        ]
+        if metrics is not None:
+            for level, n in rows_by_level.items():
+                metrics.add_rows(level, n)
+        return headers, rows
+
+    async def _run_year(self, year: int) -> dict[str, tuple[list, list, Counter]]:
+        routes = [
+            route for name, route in self._routes.items() if year in self._years[name]
+        ]
+        results = {route.route_name: ([], [], Counter()) for route in routes}
+        page = await self.engine.open_year(year)
+        rows = await self._walk(build_plan(routes), year, page, {name: {} for name in results}, results)
+        for name, route_rows in rows.items():
+            results[name][1].extend(route_rows)
+        return results
+
+    async def _walk(
+        self,
+        node: PlanNode,
+        year: int,
+        page: NavegadorPage,
+        contexts: dict[str, dict[str, str]],
+        results: dict[str, tuple[list, list, Counter]],
+    ) -> dict[str, list]:
+        rows: dict[str, list] = {name: [] for name in contexts}
+        for name in contexts:
+            level = node.levels[name]
+            if level.extract_table:
+                headers, _, rows_by_level = results[name]
+                if not headers:
+                    headers.extend(page.headers())
+                context = list(contexts[name].values())
+                rows[name].extend(period_prefix(year) + context + row for row in page.table_rows)
+                rows_by_level[level.name] += len(page.table_rows)
+
+        branches = []
+        for (fila, button), child in node.children.items():
+            names = [name for name in contexts if name in child.levels]
+            if not names:
+                continue
+            level_name = node.levels[names[0]].name
+            if fila:
+                steps = [(fila, {name: contexts[name] for name in names})]
+            else:
+                steps = [
+                    (row, {name: {**contexts[name], node.levels[name].name: row} for name in names})
+                    for row in page.row_names
+                ]
+            for row, child_contexts in steps:
+                self.steps += 1
+                self.naive_steps += len(names)
+                branches.append(
+                    self._walk_child(child, year, page, row, button, level_name, child_contexts, results)
+                )
+
+        # Cada ruta está en una sola rama por nodo, así que concatenar en el orden
+        # de las ramas reproduce el orden del recorrido de cada ruta por separado
+        for child_rows in await asyncio.gather(*branches):
+            for name, route_rows in child_rows.items():
+                rows[name].extend(route_rows)
+        return rows
+
+    async def _walk_child(self, child, year, page, row, button, level_name, contexts, results):
+        child_page = await self.engine.postback(year, page, row, button, level_name)
+        return await self._walk(child, year, child_page, contexts, results)
+
+    def summary(self) -> str:
+        saved = self.naive_steps - self.steps
+        ratio = saved / self.naive_steps * 100 if self.naive_steps else 0.0
+        return (
+            f"Plan de prefijos: {self.steps} pasos (fila + botón) en lugar de "
+            f"{self.naive_steps} ruta por ruta, {saved} ahorrados ({ratio:.0f}%)"
+        )
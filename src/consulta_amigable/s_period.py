@@ -0,0 +1,52 @@
+from typing import Iterable
+
+MESES = tuple(range(1, 13))
+
+
+# =====================
+# Periodos
+# =====================
+# Internamente cada unidad de trabajo (año en la consulta anual, año y mes en la
+# mensual) es un entero: 2024 o 202403. Así la bitácora, la caché, las colas de
+# trabajo y el motor HTTP tratan igual a los años y a los meses.
+
+
+def period_key(year: int, month: int | None = None) -> int:
+    if month is None:
+        return int(year)
+    if int(month) not in MESES:
+        raise ValueError(f"Mes fuera de rango: {month}")
+    return int(year) * 100 + int(month)
+
+
+def split_period(key: int) -> tuple[int, int | None]:
+    """
+    (año, mes) de una clave de periodo; el mes es None en la consulta anual.
+    """
+    key = int(key)
+    if key > 9999:
+        return key // 100, key % 100
+    return key, None
+
+
+def period_prefix(key: int) -> list[int]:
+    """
+    Primeras columnas de cada fila extraída: [año] o [año, mes].
+    """
+    year, month = split_period(key)
+    return [year] if month is None else [year, month]
+
+
+def period_label(key: int) -> str:
+    year, month = split_period(key)
+    return str(year) if month is None else f"{year}-{month:02d}"
+
+
+def expand_periods(years: Iterable[int], months: Iterable[int] | None = None) -> list[int]:
+    """
+    Claves de periodo de `years` (y de cada mes de `months` en la consulta
+    mensual), en el orden de `years` y, dentro de cada año, en el de `months`.
+    """
+    if months is None:
+        return [period_key(year) for year in years]
+    return [period_key(year, month) for year in years for month in months]
@@ -0,0 +1,283 @@
+import asyncio
+import json
+import logging
+import math
+import multiprocessing
+import pickle
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Literal, Sequence
+
+import pandas as pd
+
+from .a_config import LevelConfig, RouteConfig
+from .c_cleaner import CCleaner
+from .g_frontier import first_iterate_level
+from .p_metrics import RunMetrics
+from .v_buffer import RowBuffer
+from .w_governor import ConcurrencyGovernor
+
+logger = logging.getLogger("consulta_amigable")
+
+# Unidad de trabajo: (periodo, parte (i, k) del primer nivel `iterate` o None)
+Unit = tuple[int, tuple[int, int] | None]
+
+
+# =====================
+# Reparto del trabajo
+# =====================
+def plan_units(periods: Sequence[int], levels: Sequence[LevelConfig], processes: int) -> list[Unit]:
+    """
+    Divide los periodos en unidades de trabajo. Si hay menos periodos que
+    procesos (p. ej. un solo año), cada periodo se parte además en bloques de
+    filas de su primer nivel `iterate` para que todos los procesos tengan trabajo.
+    """
+    parts = 1
+    if first_iterate_level(levels) is not None and len(periods) < processes:
+        parts = math.ceil(processes / max(1, len(periods)))
+    if parts == 1:
+        return [(period, None) for period in periods]
+    return [(period, (i, parts)) for period in periods for i in range(parts)]
+
+
+def split_units(units: Sequence[Unit], processes: int) -> list[list[Unit]]:
+    """
+    Reparte las unidades entre los procesos de forma intercalada (las partes de
+    un mismo periodo quedan en procesos distintos).
+    """
+    return [list(units[i::processes]) for i in range(processes) if units[i::processes]]
+
+
+# =====================
+# Formato de intercambio
+# =====================
+# Las filas viajan del worker al proceso principal como un stream IPC de Arrow
+# (columnas tipadas y el texto codificado por diccionario, como en `RowBuffer`).
+# Sin pyarrow se usa pickle.
+
+
+def encode_frame(df: pd.DataFrame) -> bytes:
+    try:
+        import pyarrow as pa
+    except ImportError:
+        return b"P" + pickle.dumps(df, protocol=pickle.HIGHEST_PROTOCOL)
+
+    # Las columnas se nombran por posición: los encabezados pueden repetirse
+    headers = [str(col) for col in df.columns]
+    table = pa.Table.from_pandas(df.set_axis(range(df.shape[1]), axis=1), preserve_index=False)
+    table = table.rename_columns([str(i) for i in range(df.shape[1])])
+    table = table.replace_schema_metadata({"headers": json.dumps(headers, ensure_ascii=False)})
+    stream = pa.BufferOutputStream()
+    with pa.ipc.new_stream(stream, table.schema) as writer:
+        writer.write_table(table)
+    return b"A" + stream.getvalue().to_pybytes()
+
+
+def decode_frame(data: bytes) -> pd.DataFrame:
+    fmt, payload = data[:1], data[1:]
+    if fmt == b"P":
+        return pickle.loads(payload)
+
+    import pyarrow as pa
+
+    table = pa.ipc.open_stream(payload).read_all()
+    df = table.to_pandas()
+    df.columns = json.loads(table.schema.metadata[b"headers"])
+    return df
+
+
+# =====================
+# Procesos worker
+# =====================
+@dataclass
+class SliceResult:
+    """
+    Resultado de un proceso worker: las filas codificadas de cada unidad
+    terminada (o interrumpida), sus métricas y el error que lo detuvo, si hubo.
+    """
+
+    parts: list[tuple[Unit, bytes]] = field(default_factory=list)
+    metrics: RunMetrics = field(default_factory=RunMetrics)
+    clicks: int = 0
+    error: str | None = None
+
+
+def run_slice(
+    settings: dict,
+    route: RouteConfig,
+    units: list[Unit],
+    engine: Literal["playwright", "http"],
+    concurrency: int,
+    work_stealing: bool,
+) -> SliceResult:
+    """
+    Punto de entrada de cada proceso worker: crea su propio `ConsultaAmigable`
+    (y su propio Chromium con "playwright") y extrae sus unidades una tras otra.
+    """
+    return asyncio.run(_run_slice(settings, route, units, engine, concurrency, work_stealing))
+
+
+async def _run_slice(settings, route, units, engine, concurrency, work_stealing) -> SliceResult:
+    from .b_scraper import ConsultaAmigable
+
+    logger.setLevel(settings.get("log_level", logging.INFO))
+    scraper = ConsultaAmigable(**settings["init"])
+    scraper.URL_ANUAL, scraper.URL_MENSUAL = settings["urls"]
+    scraper.route_config = route
+    if settings.get("governor"):
+        scraper._governor = ConcurrencyGovernor(**settings["governor"])
+    scraper.metrics = RunMetrics(route.route_name)
+    result = SliceResult(metrics=scraper.metrics)
+    try:
+        if engine == "playwright":
+            await scraper._initialize_driver()
+        for period, shard in units:
+            scraper.years = [period]
+            scraper._blocks = {period: shard} if shard else {}
+            try:
+                await scraper._extract(engine, concurrency, work_stealing)
+            finally:
+                # Las filas de una unidad interrumpida también se envían, igual
+                # que en la ejecución secuencial
+                rows, scraper._extracted_data = scraper._extracted_data, RowBuffer()
+                result.parts.append(
+                    ((period, shard), encode_frame(rows.to_frame(scraper._output_headers())))
+                )
+    except Exception as e:
+        result.error = f"{type(e).__name__}: {e}"
+    finally:
+        await scraper._cerrar_navegador()
+        result.clicks = scraper._clicks_number
+    return result
+
+
+def clean_parts(parts: list[bytes]) -> tuple[pd.DataFrame, float]:
+    """
+    Decodifica y limpia (`CCleaner.transform`) las partes de un periodo en un
+    proceso del pool de limpieza.
+    """
+    start = time.perf_counter()
+    frames = [df for df in map(decode_frame, parts) if len(df)]
+    if not frames:
+        return pd.DataFrame(), 0.0
+    df = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+    df = CCleaner(input=df, output_path=None).transform()
+    return df, time.perf_counter() - start
+
+
+# =====================
+# Ejecución en procesos
+# =====================
+class ProcessRunner:
+    """
+    Extrae una ruta con `processes` procesos worker, cada uno con su propio motor
+    (y su propio Chromium) y una porción de las unidades (periodo, bloque de filas
+    del primer nivel `iterate`). Apenas llegan todas las partes de un periodo, se
+    limpian en un segundo pool de procesos mientras la extracción continúa.
+    """
+
+    def __init__(
+        self,
+        settings: dict,
+        route: RouteConfig,
+        processes: int,
+        engine: Literal["playwright", "http"] = "playwright",
+        concurrency: int = 1,
+        work_stealing: bool = False,
+    ):
+        if processes < 1:
+            raise ValueError("Se necesita al menos un proceso")
+        self.settings = settings
+        self.route = route
+        self.processes = processes
+        self.engine = engine
+        self.concurrency = concurrency
+        self.work_stealing = work_stealing
+        self.metrics = RunMetrics(route.route_name)
+        self.clicks = 0
+        self.errors: list[str] = []
+        self.extract_seconds = 0.0
+
+    async def run(self, periods: Sequence[int]) -> dict[int, pd.DataFrame]:
+        """
+        Returns
+        -------
+        dict[int, pd.DataFrame]
+            Datos limpios de cada periodo extraído (completo o no).
+        """
+        units = plan_units(periods, self.route.levels, self.processes)
+        slices = split_units(units, self.processes)
+        expected = defaultdict(int)
+        for period, _ in units:
+            expected[period] += 1
+        parts: dict[int, list[tuple[Unit, bytes]]] = defaultdict(list)
+        cleaning: dict[int, asyncio.Future] = {}
+
+        loop = asyncio.get_running_loop()
+        # spawn: cada worker arranca su propio Playwright sin heredar el loop ni
+        # los hilos del proceso principal
+        context = multiprocessing.get_context("spawn")
+        started = time.perf_counter()
+        logger.info(
+            f"🧮 Extrayendo {len(units)} unidades de {self.route.route_name} "
+            f"con {len(slices)} procesos"
+        )
+        with (
+            ProcessPoolExecutor(max(1, len(slices)), mp_context=context) as workers,
+            ProcessPoolExecutor(max(1, len(slices)), mp_context=context) as cleaners,
+        ):
+
+            def clean(period: int) -> None:
+                data = [part for _, part in sorted(parts.pop(period), key=_unit_order)]
+                cleaning[period] = loop.run_in_executor(cleaners, clean_parts, data)
+
+            futures = [
+                loop.run_in_executor(
+                    workers, run_slice, self.settings, self.route, units_slice,
+                    self.engine, self.concurrency, self.work_stealing,
+                )
+                for units_slice in slices
+            ]
+            for future in asyncio.as_completed(futures):
+                try:
+                    result = await future
+                except Exception as e:
+                    self.errors.append(f"{type(e).__name__}: {e}")
+                    continue
+                self.metrics.merge(result.metrics)
+                self.clicks += result.clicks
+                if result.error:
+                    self.errors.append(result.error)
+                for unit, data in result.parts:
+                    parts[unit[0]].append((unit, data))
+                    if len(parts[unit[0]]) == expected[unit[0]]:
+                        clean(unit[0])
+            self.extract_seconds = time.perf_counter() - started
+
+            # Periodos con partes faltantes (de un worker que falló)
+            for period in list(parts):
+                clean(period)
+            frames = {}
+            for period, future in cleaning.items():
+                df, seconds = await future
+                self.metrics.observe("clean", "", seconds)
+                if len(df):
+                    frames[period] = df
+        return dict(sorted(frames.items()))
+
+    def summary(self) -> dict:
+        return {
+            "processes": self.processes,
+            "engine": self.engine,
+            "extract_seconds": self.extract_seconds,
+            "rows": sum(self.metrics.rows_by_level.values()),
+            "clicks": self.clicks,
+            "errors": self.errors,
+        }
+
+
+def _unit_order(item: tuple[Unit, bytes]) -> int:
+    shard = item[0][1]
+    return shard[0] if shard else 0
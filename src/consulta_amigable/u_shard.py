@@ -0,0 +1,242 @@
+"""
+Ejecución de una ruta repartida en partes (`navegar_ruta(shard="i/n")`), p. ej.
+en varias máquinas, y fusión de las partes en una sola salida limpia:
+
+    $ python -m consulta_amigable.u_shard salidas/ municipalidades
+    $ python -m consulta_amigable.u_shard salidas/ municipalidades --format parquet
+"""
+
+import argparse
+import json
+import logging
+import re
+from datetime import datetime
+from pathlib import Path
+from typing import Sequence
+
+import pandas as pd
+
+from .a_config import LevelConfig, RouteConfig
+from .c_cleaner import CCleaner
+from .f_logger import setup_logger
+from .l_sink import SINKS, crear_sink
+from .s_period import period_key
+from .t_process import Unit, plan_units
+from .v_buffer import RowBuffer
+
+logger = logging.getLogger("consulta_amigable")
+
+
+# =====================
+# Partes
+# =====================
+def parse_shard(shard: str | tuple[int, int]) -> tuple[int, int]:
+    """
+    Convierte "i/n" (o la tupla `(i, n)`) en `(i, n)`, con `0 <= i < n`.
+    """
+    if isinstance(shard, str):
+        try:
+            i, n = (int(part) for part in shard.split("/"))
+        except ValueError as e:
+            raise ValueError(f"Parte inválida: {shard!r}. Formato esperado: 'i/n'") from e
+    else:
+        i, n = shard
+    if not 0 <= i < n:
+        raise ValueError(f"Parte fuera de rango: {i}/{n} (debe ser 0 <= i < n)")
+    return i, n
+
+
+def shard_units(periods: Sequence[int], levels: Sequence[LevelConfig], shard: tuple[int, int]) -> list[Unit]:
+    """
+    Unidades (periodo, bloque de filas del primer nivel `iterate`) de la parte
+    `shard = (i, n)`. El reparto depende solo de los periodos, de la ruta y de `n`,
+    así que cada máquina calcula el mismo sin coordinarse.
+    """
+    i, n = shard
+    return plan_units(sorted(periods), levels, n)[i::n]
+
+
+def shard_format(fmt: str | None = None) -> str:
+    """
+    Formato de las filas crudas de una parte: `fmt` o, por defecto, Parquet si
+    pyarrow está instalado (JSONL si no).
+    """
+    if fmt is not None:
+        if fmt not in SINKS:
+            raise ValueError(f"Formato no soportado: {fmt}. Opciones: {list(SINKS)}")
+        return fmt
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return "jsonl"
+    return "parquet"
+
+
+def shard_name(route_name: str, shard: tuple[int, int]) -> str:
+    i, n = shard
+    return f"{route_name}.shard-{i}-of-{n}"
+
+
+def guardar_parte(
+    output_dir: Path,
+    route: RouteConfig,
+    shard: tuple[int, int],
+    periods: Sequence[int],
+    headers: list[str],
+    rows: RowBuffer,
+    fmt: str,
+    completed: bool,
+) -> Path:
+    """
+    Escribe las filas crudas de una parte (`<ruta>.shard-i-of-n.<formato>`) y su
+    manifiesto (`<ruta>.shard-i-of-n.json`), con la ruta, los periodos, las
+    unidades de la parte y las columnas, de modo que `fusionar_partes` no
+    necesita nada más.
+
+    Returns
+    -------
+    Path
+        Path del manifiesto.
+    """
+    name = shard_name(route.route_name, shard)
+    data_file = None
+    if len(rows):
+        sink = crear_sink(fmt, output_dir / f"{name}{SINKS[fmt].suffix}")
+        sink.write_frame(rows.to_frame(headers))
+        sink.close()
+        data_file = sink.path.name
+    manifest = {
+        "route": route.model_dump(),
+        "shard": list(shard),
+        "periods": sorted(periods),
+        "units": [
+            [period, list(block) if block else None]
+            for period, block in shard_units(periods, route.levels, shard)
+        ],
+        "format": fmt,
+        "file": data_file,
+        "columns": headers,
+        "rows": len(rows),
+        "completed": completed,
+        "created": datetime.now().isoformat(timespec="seconds"),
+    }
+    path = output_dir / f"{name}.json"
+    path.write_text(json.dumps(manifest, indent=2, ensure_ascii=False), encoding="utf-8")
+    logger.info(f"🧩 Parte {shard[0]}/{shard[1]}: {len(rows)} filas, manifiesto en {path}")
+    return path
+
+
+# =====================
+# Fusión
+# =====================
+def _validar_partes(manifests: list[dict], route_name: str) -> int:
+    totals = {manifest["shard"][1] for manifest in manifests}
+    if len(totals) != 1:
+        raise ValueError(f"Partes de repartos distintos para {route_name}: n = {sorted(totals)}")
+    n = totals.pop()
+    present = [manifest["shard"][0] for manifest in manifests]
+    missing = sorted(set(range(n)) - set(present))
+    if missing:
+        raise ValueError(f"Faltan las partes {missing} de {n} de {route_name}")
+    incomplete = sorted(manifest["shard"][0] for manifest in manifests if not manifest["completed"])
+    if incomplete:
+        raise ValueError(f"Las partes {incomplete} de {route_name} no terminaron")
+    first = manifests[0]
+    for manifest in manifests[1:]:
+        if manifest["periods"] != first["periods"] or manifest["route"]["levels"] != first["route"]["levels"]:
+            raise ValueError(
+                f"La parte {manifest['shard'][0]} de {route_name} se ejecutó con otros periodos o niveles"
+            )
+    return n
+
+
+def _period_of(df: pd.DataFrame) -> pd.Series:
+    if "Mes" in df.columns:
+        return pd.Series(
+            [period_key(year, month) for year, month in zip(df["Año"], df["Mes"])], index=df.index
+        )
+    return df["Año"].astype(int)
+
+
+def fusionar_partes(
+    directory: str | Path,
+    route_name: str,
+    output_dir: str | Path | None = None,
+    output_format: str = "excel",
+) -> Path:
+    """
+    Une las partes de `route_name` guardadas en `directory` y limpia el resultado
+    una sola vez con `CCleaner`.
+
+    Verifica que estén todas las partes del reparto (`0..n-1`), que hayan
+    terminado y que se hayan ejecutado con los mismos periodos y niveles. Las
+    filas se ordenan como en una ejecución completa (por periodo y por bloque).
+    No se eliminan filas repetidas: las tablas extraídas hasta el primer nivel
+    `iterate`, que todas las partes de un periodo recorren, solo las guarda la
+    parte del primer bloque (ver `g_frontier.keeps_table`).
+
+    Parameters
+    ----------
+    directory : str or Path
+        Directorio con los manifiestos `<route_name>.shard-i-of-n.json` y sus datos.
+    route_name : str
+        Nombre de la ruta.
+    output_dir : str or Path, optional
+        Directorio de la salida limpia. Por defecto, `directory`.
+    output_format : {"excel", "parquet", "feather"}, optional
+        Formato de la salida limpia, como en `navegar_ruta`.
+
+    Returns
+    -------
+    Path
+        Archivo (o almacén) con los datos limpios.
+    """
+    directory = Path(directory)
+    output_dir = Path(output_dir) if output_dir else directory
+    # Solo los manifiestos, no las métricas (`<ruta>.shard-i-of-n.metrics.json`)
+    pattern = re.compile(rf"{re.escape(route_name)}\.shard-\d+-of-\d+\.json")
+    files = sorted(file for file in directory.iterdir() if pattern.fullmatch(file.name))
+    if not files:
+        raise FileNotFoundError(f"No hay partes de {route_name} en {directory}")
+    manifests = [json.loads(file.read_text(encoding="utf-8")) for file in files]
+    n = _validar_partes(manifests, route_name)
+
+    pieces = []
+    for manifest in manifests:
+        if not manifest["file"]:
+            continue
+        blocks = {period: block[0] if block else 0 for period, block in manifest["units"]}
+        reader = SINKS[manifest["format"]].iter_chunks(directory / manifest["file"])
+        df = pd.concat(list(reader), ignore_index=True)
+        df.columns = manifest["columns"]
+        for period, part in df.groupby(_period_of(df), sort=False):
+            pieces.append((int(period), blocks.get(int(period), 0), part))
+    if not pieces:
+        raise ValueError(f"Las partes de {route_name} no tienen filas")
+
+    pieces.sort(key=lambda piece: piece[:2])
+    df = pd.concat([part for *_, part in pieces], ignore_index=True)
+    logger.info(f"🧩 {n} partes de {route_name}: {len(df)} filas")
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    if output_format == "excel":
+        output_path = output_dir / f"{route_name}.xlsx"
+    else:
+        output_path = output_dir / route_name
+    return CCleaner(input=df, output_path=output_path, output_format=output_format).clean()
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Fusiona las partes de una ruta ejecutada con shard='i/n'.")
+    parser.add_argument("directory", type=Path, help="directorio con los manifiestos de las partes")
+    parser.add_argument("route_name", help="nombre de la ruta")
+    parser.add_argument("--output-dir", type=Path, default=None)
+    parser.add_argument("--format", default="excel", choices=["excel", "parquet", "feather"])
+    args = parser.parse_args(argv)
+    setup_logger()
+    output = fusionar_partes(args.directory, args.route_name, args.output_dir, args.format)
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
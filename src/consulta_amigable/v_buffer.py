@@ -0,0 +1,207 @@
+import re
+from array import array
+from typing import TYPE_CHECKING, Iterable
+
+# numpy y pandas se importan al convertir los montos o armar el DataFrame: crear
+# un buffer vacío (en cada `ConsultaAmigable`) no los carga
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+# Columnas de montos al final de cada fila: las mismas que `CCleaner.transform`
+# convierte a numéricas
+MONTOS = 8
+
+# Un monto tiene al menos un dígito: "1,234.50", "-7", ".5"
+_MONTO = re.compile(r"\s*-?(\d[\d,]*(\.\d*)?|\.\d+)\s*")
+
+
+def parse_amounts(values: list) -> "np.ndarray":
+    """
+    Convierte montos del Navegador ("1,234.50", "" = vacío) a float64: todo el
+    lote de una vez y, solo si algún valor trae comas, con `pd.to_numeric`.
+    Un valor que no es un monto ni está vacío no se convierte en NaN en silencio:
+    lanza ValueError.
+    """
+    import numpy as np
+    import pandas as pd
+
+    block = np.asarray(values, dtype=object)
+    try:
+        return np.where(block == "", np.nan, block).astype("float64")
+    except (ValueError, TypeError):
+        pass
+    series = pd.Series(block)
+    strings = series.map(lambda value: isinstance(value, str)).to_numpy(dtype=bool)
+    text = series[strings].str.strip()
+    invalid = ~(text.str.fullmatch(_MONTO.pattern) | (text == ""))
+    if invalid.any():
+        raise ValueError(f"Monto no numérico: {text[invalid].iloc[0]!r}")
+    series[strings] = pd.to_numeric(text.str.replace(",", "", regex=False).mask(text == ""))
+    return series.to_numpy(dtype="float64")
+
+
+class RowBuffer:
+    """
+    Filas extraídas en memoria en formato columnar, en lugar de una lista de
+    Python por fila.
+
+    Las columnas de texto (periodo, contexto de los niveles iterados, botón y
+    nombre de la fila) se guardan como códigos enteros (`array("i")`) contra un
+    diccionario por columna: el mismo año o departamento repetido en cientos de
+    miles de filas ocupa 4 bytes por fila. Las últimas `numeric` columnas son
+    los montos de la tabla, las mismas que `CCleaner.transform` convierte a
+    numéricas, y se convierten a float64 por lotes de `batch_size` filas.
+
+    `to_frame` arma el DataFrame directamente desde los arreglos, con las
+    columnas de texto como categóricas y el año y el mes como enteros.
+    """
+
+    def __init__(self, numeric: int = MONTOS, batch_size: int = 4096):
+        self.numeric = numeric
+        self.batch_size = batch_size
+        self.width: int | None = None
+        self._length = 0
+        self._n_text = 0
+        self._codes: list[array] = []
+        self._values: list[dict] = []
+        self._amounts: list[array] = []
+        self._pending: list[list] = []
+
+    def __len__(self) -> int:
+        return self._length
+
+    def _setup(self, first_row: list) -> None:
+        # El año nunca es un monto
+        width = len(first_row)
+        self._allocate(width, width - min(self.numeric, width - 1))
+
+    def _allocate(self, width: int, n_text: int) -> None:
+        self.width, self._n_text = width, n_text
+        self._codes = [array("i") for _ in range(n_text)]
+        self._values = [{} for _ in range(n_text)]
+        self._amounts = [array("d") for _ in range(width - n_text)]
+        self._pending = [[] for _ in range(width - n_text)]
+
+    def _check_width(self, row: list) -> None:
+        if self.width is None:
+            self._setup(row)
+        elif len(row) != self.width:
+            self._width_error(len(row), row)
+
+    def _width_error(self, width: int, row: list) -> None:
+        raise ValueError(
+            f"Fila de {width} columnas en un buffer de {self.width}: todas las tablas "
+            f"extraídas de una ruta deben tener las mismas columnas (fila {row[:4]}...)"
+        )
+
+    def _code(self, column: int, value) -> int:
+        values = self._values[column]
+        code = values.get(value)
+        if code is None:
+            code = values[value] = len(values)
+        return code
+
+    def _add_cells(self, row: list, offset: int) -> None:
+        # `row` son las columnas `offset:` de la fila completa
+        n_text = self._n_text
+        for j in range(offset, n_text):
+            self._codes[j].append(self._code(j, row[j - offset]))
+        for k, value in enumerate(row[max(n_text - offset, 0):]):
+            self._pending[k].append(value)
+
+    def _flush(self) -> None:
+        for k, pending in enumerate(self._pending):
+            if pending:
+                try:
+                    amounts = parse_amounts(pending)
+                except ValueError as e:
+                    raise ValueError(f"Columna {self._n_text + k} del buffer: {e}") from None
+                self._amounts[k].frombytes(amounts.tobytes())
+                self._pending[k] = []
+
+    def append_table(self, prefix: list, rows: list[list]) -> None:
+        """
+        Agrega las filas de una tabla con el mismo prefijo (periodo y contexto).
+        El prefijo se codifica una sola vez para toda la tabla.
+        """
+        if not rows:
+            return
+        self._check_width(prefix + rows[0])
+        if len(prefix) > self._n_text:
+            # Tablas angostas: el prefijo cae entre los montos
+            self.extend(prefix + row for row in rows)
+            return
+        n = len(rows)
+        for j, value in enumerate(prefix):
+            self._codes[j].extend(array("i", [self._code(j, value)]) * n)
+        for row in rows:
+            if len(prefix) + len(row) != self.width:
+                self._width_error(len(prefix) + len(row), prefix + row)
+            self._add_cells(row, len(prefix))
+        self._length += n
+        if self._pending and len(self._pending[0]) >= self.batch_size:
+            self._flush()
+
+    def extend(self, rows: "RowBuffer | Iterable[list]") -> None:
+        """
+        Agrega filas completas o el contenido de otro `RowBuffer` (sin pasar por
+        listas: sus códigos se traducen a los diccionarios de este).
+        """
+        if isinstance(rows, RowBuffer):
+            self._merge(rows)
+            return
+        for row in rows:
+            self._check_width(row)
+            self._add_cells(row, 0)
+            self._length += 1
+            if self._pending and len(self._pending[0]) >= self.batch_size:
+                self._flush()
+
+    def _merge(self, other: "RowBuffer") -> None:
+        import numpy as np
+
+        if not len(other):
+            return
+        if self.width is None:
+            self._allocate(other.width, other._n_text)
+        elif (other.width, other._n_text) != (self.width, self._n_text):
+            raise ValueError("Los buffers tienen columnas distintas")
+        self._flush()
+        other._flush()
+        for j in range(self._n_text):
+            mapping = np.array([self._code(j, value) for value in other._values[j]], dtype=np.intc)
+            codes = np.frombuffer(other._codes[j], dtype=np.intc)
+            self._codes[j].frombytes(mapping[codes].tobytes())
+        for k, amounts in enumerate(other._amounts):
+            self._amounts[k].extend(amounts)
+        self._length += len(other)
+
+    def to_frame(self, columns: list[str]) -> "pd.DataFrame":
+        """
+        DataFrame con las filas del buffer y los nombres de `columns`.
+        """
+        import numpy as np
+        import pandas as pd
+
+        if self.width is None:
+            return pd.DataFrame(columns=columns)
+        if len(columns) != self.width:
+            raise ValueError(f"Se esperaban {self.width} columnas, no {len(columns)}")
+        self._flush()
+        data = {}
+        for j in range(self._n_text):
+            # Copia: el buffer puede seguir creciendo mientras exista el DataFrame
+            codes = np.frombuffer(self._codes[j], dtype=np.intc).copy()
+            categories = list(self._values[j])
+            if columns[j] in ("Año", "Mes"):
+                data[j] = np.asarray(categories, dtype=np.int64)[codes]
+            else:
+                data[j] = pd.Categorical.from_codes(
+                    codes, categories=pd.Index(categories, dtype=object)
+                )
+        for k, amounts in enumerate(self._amounts):
+            data[self._n_text + k] = np.frombuffer(amounts, dtype=np.float64).copy()
+        df = pd.DataFrame(data)
+        df.columns = columns
+        return df
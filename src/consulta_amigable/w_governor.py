@@ -0,0 +1,204 @@
+import asyncio
+import json
+import logging
+import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+logger = logging.getLogger("consulta_amigable")
+
+# Umbral de latencia mínimo (s): con respuestas de pocos ms, el ruido del reloj
+# y del loop no debe leerse como saturación
+MIN_THRESHOLD = 0.05
+
+
+# =====================
+# Gobernador de concurrencia
+# =====================
+class ConcurrencyGovernor:
+    """
+    Límite adaptativo de navegaciones (postbacks) en vuelo, con la regla AIMD de
+    TCP: suma `increase` al límite mientras el servidor responde bien y lo
+    multiplica por `decrease` cuando se satura.
+
+    Cada navegación se ejecuta dentro de `slot()`, que espera a que haya cupo y
+    mide su latencia y si terminó con error. Las decisiones se toman por
+    ventanas de tantas navegaciones como el límite vigente (aprox. una "ronda"
+    de todas las navegaciones en vuelo):
+
+    - si la tasa de errores de la ventana supera `max_error_rate`, o su latencia
+      media supera el umbral, el límite baja;
+    - si no, sube.
+
+    El umbral de latencia es `target_latency` o, por defecto, `latency_factor`
+    veces la latencia base (la menor media de ventana observada), nunca menos de
+    `MIN_THRESHOLD`. Las navegaciones que empezaron antes de una baja no cuentan
+    para la siguiente ventana: ya estaban en vuelo con el límite anterior.
+
+    Parameters
+    ----------
+    max_limit : int, optional
+        Tope de navegaciones en vuelo.
+    min_limit : int, optional
+        Piso de navegaciones en vuelo.
+    initial : int, optional
+        Límite inicial. Por defecto `min_limit`.
+    increase : int, optional
+        Aumento aditivo por ventana sin saturación.
+    decrease : float, optional
+        Factor multiplicativo (entre 0 y 1) por ventana saturada.
+    target_latency : float, optional
+        Latencia media (s) por encima de la cual se considera saturado el servidor.
+    latency_factor : float, optional
+        Sin `target_latency`, el umbral es este múltiplo de la latencia base.
+    max_error_rate : float, optional
+        Tasa de errores (timeouts, errores de conexión o 5xx) tolerada por ventana.
+    """
+
+    def __init__(
+        self,
+        max_limit: int = 16,
+        min_limit: int = 1,
+        initial: int | None = None,
+        increase: int = 1,
+        decrease: float = 0.5,
+        target_latency: float | None = None,
+        latency_factor: float = 2.0,
+        max_error_rate: float = 0.0,
+    ):
+        if not 1 <= min_limit <= max_limit:
+            raise ValueError(f"Límites inválidos: min_limit={min_limit}, max_limit={max_limit}")
+        if not 0 < decrease < 1:
+            raise ValueError(f"decrease debe estar entre 0 y 1, no {decrease}")
+        self.max_limit = max_limit
+        self.min_limit = min_limit
+        self.increase = increase
+        self.decrease = decrease
+        self.target_latency = target_latency
+        self.latency_factor = latency_factor
+        self.max_error_rate = max_error_rate
+        self.limit = min(max(initial or min_limit, min_limit), max_limit)
+        self.baseline: float | None = None
+        # (segundos desde el inicio, límite, motivo) de cada cambio
+        self.history: list[tuple[float, int, str]] = [(0.0, self.limit, "inicio")]
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._started = time.perf_counter()
+        self._epoch = 0
+        self._latencies: list[float] = []
+        self._errors = 0
+        self._condition: asyncio.Condition | None = None
+
+    def config(self) -> dict:
+        """
+        Parámetros para crear un gobernador igual (p. ej. en un proceso worker).
+        """
+        return {
+            "max_limit": self.max_limit,
+            "min_limit": self.min_limit,
+            "initial": self.history[0][1],
+            "increase": self.increase,
+            "decrease": self.decrease,
+            "target_latency": self.target_latency,
+            "latency_factor": self.latency_factor,
+            "max_error_rate": self.max_error_rate,
+        }
+
+    @property
+    def threshold(self) -> float | None:
+        if self.target_latency is not None:
+            return self.target_latency
+        if self.baseline is None:
+            return None
+        return max(self.baseline * self.latency_factor, MIN_THRESHOLD)
+
+    @asynccontextmanager
+    async def slot(self):
+        """
+        Espera a que haya cupo, ejecuta la navegación del bloque y registra su
+        latencia y si falló. Las cancelaciones no cuentan como errores.
+        """
+        # La condición se crea dentro del loop que la usa
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight < self.limit)
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        epoch = self._epoch
+        start = time.perf_counter()
+        ok = False
+        try:
+            yield
+            ok = True
+        except asyncio.CancelledError:
+            epoch = -1
+            raise
+        finally:
+            async with self._condition:
+                self.in_flight -= 1
+                if epoch == self._epoch:
+                    self._observe(time.perf_counter() - start, ok)
+                self._condition.notify_all()
+
+    def _observe(self, seconds: float, ok: bool) -> None:
+        if ok:
+            self._latencies.append(seconds)
+        else:
+            self._errors += 1
+        n = len(self._latencies) + self._errors
+        if n < self.limit:
+            return
+
+        error_rate = self._errors / n
+        mean = sum(self._latencies) / len(self._latencies) if self._latencies else None
+        if mean is not None and (self.baseline is None or mean < self.baseline):
+            self.baseline = mean
+        threshold = self.threshold
+        if error_rate > self.max_error_rate:
+            self._set_limit(
+                max(self.min_limit, int(self.limit * self.decrease)),
+                f"errores {error_rate:.0%}",
+            )
+            self._epoch += 1
+        elif mean is not None and threshold is not None and mean > threshold:
+            self._set_limit(
+                max(self.min_limit, int(self.limit * self.decrease)),
+                f"latencia {mean * 1000:.0f}ms > {threshold * 1000:.0f}ms",
+            )
+            self._epoch += 1
+        else:
+            self._set_limit(min(self.max_limit, self.limit + self.increase), "sin saturación")
+        self._latencies = []
+        self._errors = 0
+
+    def _set_limit(self, limit: int, reason: str) -> None:
+        if limit == self.limit:
+            return
+        logger.info(f"🚦 Concurrencia {self.limit} → {limit} ({reason})")
+        self.limit = limit
+        self.history.append((time.perf_counter() - self._started, limit, reason))
+
+    def summary(self) -> str:
+        limits = [limit for _, limit, _ in self.history]
+        return (
+            f"🚦 Concurrencia final {self.limit} (mín. {min(limits)}, máx. {max(limits)}, "
+            f"{len(self.history) - 1} cambios, pico en vuelo {self.peak_in_flight})"
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            **self.config(),
+            "limit": self.limit,
+            "baseline": self.baseline,
+            "peak_in_flight": self.peak_in_flight,
+            "history": [
+                {"seconds": seconds, "limit": limit, "reason": reason}
+                for seconds, limit, reason in self.history
+            ],
+        }
+
+    def write_json(self, path: str | Path) -> Path:
+        path = Path(path)
+        path.write_text(json.dumps(self.to_dict(), indent=2, ensure_ascii=False), encoding="utf-8")
+        return path
@@ -0,0 +1,87 @@
+"""
+Memoria de las filas extraídas: lista de listas (como antes de `RowBuffer`)
+frente a `RowBuffer`, con filas sintéticas en el formato de una extracción de
+municipalidades (año, contexto, botón, nombre y 8 montos como texto).
+
+Mide el pico de memoria (`tracemalloc`) de acumular las filas y armar el
+DataFrame que recibe `CCleaner`:
+
+    $ python tests/benchmarks/bench_buffer.py --rows 1000000
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from consulta_amigable.v_buffer import RowBuffer
+
+COLUMNAS = [
+    "Año", "Departamento", "Provincia", "", "Municipalidad",
+    "PIA", "PIM", "Certificación", "Compromiso Anual",
+    "Atención de Compromiso Mensual", "Devengado", "Girado", "Avance %",
+]
+FILAS_POR_TABLA = 20
+
+
+def tablas_sinteticas(n_rows: int, seed: int = 0):
+    """
+    Genera (prefijo, filas de la tabla) como los entrega `_emit_rows`.
+    """
+    rng = np.random.default_rng(seed)
+    for start in range(0, n_rows, FILAS_POR_TABLA):
+        d, p = rng.integers(1, 26), rng.integers(1, 10)
+        prefix = [2024, f"{d:02d}: DEPARTAMENTO {d}", f"{d:02d}{p:02d}: PROVINCIA {p}"]
+        rows = []
+        for m in range(1, min(FILAS_POR_TABLA, n_rows - start) + 1):
+            montos = [str(v) for v in rng.integers(0, 500_000_000, 7)]
+            rows.append(
+                ["", f"{d:02d}{p:02d}{m:02d}-3{d:02d}{p}{m:02d}: MUNICIPALIDAD DISTRITAL {m}",
+                 *montos, f"{rng.random() * 100:.1f}"]
+            )
+        yield prefix, rows
+
+
+def con_listas(n_rows: int) -> pd.DataFrame:
+    data = []
+    for prefix, rows in tablas_sinteticas(n_rows):
+        data.extend(prefix + row for row in rows)
+    return pd.DataFrame(data, columns=COLUMNAS)
+
+
+def con_buffer(n_rows: int) -> pd.DataFrame:
+    data = RowBuffer()
+    for prefix, rows in tablas_sinteticas(n_rows):
+        data.append_table(prefix, rows)
+    return data.to_frame(COLUMNAS)
+
+
+def medir(build, n_rows: int) -> tuple[float, float]:
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    df = build(n_rows)
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert len(df) == n_rows
+    return peak / 2**20, seconds
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=200_000)
+    args = parser.parse_args()
+
+    antes, t_antes = medir(con_listas, args.rows)
+    despues, t_despues = medir(con_buffer, args.rows)
+    print(f"Filas: {args.rows:,}")
+    print(f"Listas:    pico {antes:>9,.1f} MiB  {t_antes:6.2f}s")
+    print(f"RowBuffer: pico {despues:>9,.1f} MiB  {t_despues:6.2f}s ({antes / despues:.1f}x menos memoria)")
+
+
+if __name__ == "__main__":
+    main()
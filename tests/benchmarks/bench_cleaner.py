@@ -0,0 +1,112 @@
+"""
+Benchmark de `CCleaner.transform` sobre una tabla sintética con el mismo formato
+que una extracción de municipalidades (año, contexto, botón y 8 montos).
+
+Compara la implementación vectorizada con la anterior, que limpiaba celda por
+celda:
+
+    $ python tests/benchmarks/bench_cleaner.py --rows 1000000
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+import ubigeos_peru as ubg
+
+from consulta_amigable.c_cleaner import CCleaner
+
+COLUMNAS = [
+    "Año", "Departamento", "Provincia", "", "Municipalidad",
+    "PIA", "PIM", "Certificación", "Compromiso Anual",
+    "Atención de Compromiso Mensual", "Devengado", "Girado", "Avance %",
+]
+DEPARTAMENTOS = ["AMAZONAS", "ANCASH", "APURIMAC", "AREQUIPA", "AYACUCHO", "CAJAMARCA",
+                 "CUSCO", "HUANCAVELICA", "HUANUCO", "ICA", "JUNIN", "LA LIBERTAD",
+                 "LAMBAYEQUE", "LIMA", "LORETO", "MADRE DE DIOS", "MOQUEGUA", "PASCO",
+                 "PIURA", "PUNO", "SAN MARTIN", "TACNA", "TUMBES", "UCAYALI", "CALLAO"]
+
+
+class LegacyCleaner(CCleaner):
+    """
+    Limpieza celda por celda, como antes de vectorizar `CCleaner`.
+    """
+
+    def _split_column(self, source_col, new_cols, delimiter, max_splits=None):
+        if max_splits is None:
+            max_splits = len(new_cols) - 1
+        self.df[new_cols] = (
+            self.df.pop(source_col)
+            .str.split(delimiter, n=max_splits, expand=True)
+            .apply(lambda x: x.str.strip())
+            .astype(str)
+        )
+        return self.df
+
+    @staticmethod
+    def convert_to_numeric(df):
+        return df.apply(
+            lambda col: pd.to_numeric(col.astype(str).str.replace(",", ""), errors="coerce")
+        )
+
+    def normalize_dep_column(self):
+        for col in self.df.columns:
+            if col.lower() in "departamento" or "departamento" in col.lower():
+                self.df[col] = self.df[col].apply(lambda x: str(x).strip())
+                self.df[col] = ubg.validate_departamento(self.df[col], on_error="capitalize")
+            elif col.lower() in "provincia" or "provincia" in col.lower():
+                self.df[col] = self.df[col].apply(lambda x: str(x).strip())
+                self.df[col] = ubg.validate_provincia(self.df[col], on_error="capitalize")
+
+
+def tabla_sintetica(n_rows: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    dpto = rng.integers(0, len(DEPARTAMENTOS), n_rows)
+    prov = rng.integers(1, 10, n_rows)
+    muni = rng.integers(1, 20, n_rows)
+    montos = rng.integers(0, 500_000_000, (n_rows, 7))
+
+    df = pd.DataFrame({
+        "Año": 2024,
+        "Departamento": [f"{d + 1:02d}: {DEPARTAMENTOS[d]}" for d in dpto],
+        "Provincia": [f"{d + 1:02d}{p:02d}: PROVINCIA {p}" for d, p in zip(dpto, prov)],
+        "": "",
+        "Municipalidad": [
+            f"{d + 1:02d}{p:02d}{m:02d}-3{d:02d}{p:01d}{m:02d}: MUNICIPALIDAD DISTRITAL {m}"
+            for d, p, m in zip(dpto, prov, muni)
+        ],
+    })
+    # Los montos llegan sin comas de miles, igual que desde `take_snapshot`
+    for i, col in enumerate(COLUMNAS[5:12]):
+        df[col] = montos[:, i].astype(str).astype(object)
+    df["Avance %"] = [f"{v:.1f}" for v in rng.random(n_rows) * 100]
+    return df[COLUMNAS]
+
+
+def medir(cleaner_cls: type[CCleaner], df: pd.DataFrame, repeat: int) -> float:
+    mejor = float("inf")
+    for _ in range(repeat):
+        entrada = df.copy()
+        start = time.perf_counter()
+        cleaner_cls(input=entrada, output_path=None).transform()
+        mejor = min(mejor, time.perf_counter() - start)
+    return len(df) / mejor
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    df = tabla_sintetica(args.rows)
+    antes = medir(LegacyCleaner, df, args.repeat)
+    despues = medir(CCleaner, df, args.repeat)
+    print(f"Filas: {args.rows:,}")
+    print(f"Antes:   {antes:>12,.0f} filas/s")
+    print(f"Después: {despues:>12,.0f} filas/s ({despues / antes:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
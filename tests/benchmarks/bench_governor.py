@@ -0,0 +1,134 @@
+"""
+Concurrencia fija frente a `adaptive=True` (`ConcurrencyGovernor`) contra el
+mock local del Navegador (`tests/mock_server.py`) configurado como un servidor
+que se degrada con la carga: cada postback en vuelo suma latencia (`--load`) y
+los que exceden `--capacity` responden 503.
+
+    $ python tests/benchmarks/bench_governor.py --concurrency 4 16 --capacity 6
+    $ python tests/benchmarks/bench_governor.py --engine playwright --json governor.json
+
+Reporta el tiempo, los postbacks rechazados por el servidor, los reintentos y,
+con el gobernador, cómo evolucionó el límite.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+TESTS_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(TESTS_DIR))
+
+from mock_server import Latency, MockNavegador, TreeShape  # noqa: E402
+
+from consulta_amigable import ConsultaAmigable, cargar_ruta_yaml  # noqa: E402
+
+YAML_DIR = TESTS_DIR / "yamls"
+
+
+@dataclass
+class Resultado:
+    modo: str
+    concurrencia: int
+    segundos: float
+    rechazados: int
+    reintentos: int
+    completa: bool
+    limites: list[int]
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def correr(server: MockNavegador, route_path: Path, years: list[int], motor: str,
+           concurrency: int, adaptive: bool) -> Resultado:
+    route = cargar_ruta_yaml(route_path)
+    scraper = ConsultaAmigable(headless=True, retries=8, backoff=0.05)
+    scraper.URL_ANUAL = server.url_anual
+    server.reset_stats()
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        start = time.perf_counter()
+        asyncio.run(
+            scraper.navegar_ruta(
+                route=route,
+                years=years,
+                output_dir=output_dir,
+                concurrency=concurrency,
+                work_stealing=motor == "playwright",
+                engine=motor,
+                output_format="parquet",
+                adaptive=adaptive,
+            )
+        )
+        segundos = time.perf_counter() - start
+        history = Path(output_dir) / f"{route.route_name}.concurrency.json"
+        limites = (
+            [h["limit"] for h in json.loads(history.read_text(encoding="utf-8"))["history"]]
+            if history.exists()
+            else []
+        )
+
+    return Resultado(
+        "adaptativa" if adaptive else "fija",
+        concurrency,
+        segundos,
+        server.throttled,
+        scraper.metrics.events["retry"],
+        scraper._completed,
+        limites,
+    )
+
+
+def imprimir(resultados: list[Resultado]) -> None:
+    print(f"{'modo':<12}{'conc':>5}{'seg':>8}{'503':>6}{'reint':>7}{'ok':>4}  límites")
+    for r in resultados:
+        limites = " ".join(map(str, r.limites[:20])) + (" ..." if len(r.limites) > 20 else "")
+        print(
+            f"{r.modo:<12}{r.concurrencia:>5}{r.segundos:>8.2f}{r.rechazados:>6}"
+            f"{r.reintentos:>7}{'sí' if r.completa else 'no':>4}  {limites}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--route", type=Path, default=YAML_DIR / "municipalidades.yaml")
+    parser.add_argument("--years", nargs="*", type=int, default=[2024])
+    parser.add_argument("--engine", default="http", choices=["http", "playwright"])
+    parser.add_argument("--concurrency", nargs="*", type=int, default=[4, 16])
+    parser.add_argument("--departamentos", type=int, default=25)
+    parser.add_argument("--provincias", type=int, default=6)
+    parser.add_argument("--municipalidades", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.02, help="segundos por postback")
+    parser.add_argument("--load", type=float, default=0.01, help="segundos extra por postback en vuelo")
+    parser.add_argument("--capacity", type=int, default=6, help="postbacks simultáneos sin 503")
+    parser.add_argument("--json", type=Path, help="archivo donde guardar los resultados")
+    args = parser.parse_args()
+    logging.getLogger("consulta_amigable").setLevel(logging.WARNING)
+
+    shape = TreeShape(args.departamentos, args.provincias, args.municipalidades)
+    resultados = []
+    latency = Latency(postback=args.latency, load=args.load, seed=0)
+    with MockNavegador(shape, latency=latency) as server:
+        server.capacity = args.capacity
+        for concurrency in args.concurrency:
+            for adaptive in (False, True):
+                resultados.append(
+                    correr(server, args.route, args.years, args.engine, concurrency, adaptive)
+                )
+
+    imprimir(resultados)
+    if args.json:
+        args.json.write_text(
+            json.dumps([r.to_dict() for r in resultados], indent=2, ensure_ascii=False),
+            encoding="utf-8",
+        )
+
+
+if __name__ == "__main__":
+    main()
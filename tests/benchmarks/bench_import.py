@@ -0,0 +1,78 @@
+"""
+Tiempo de importación del paquete medido con `python -X importtime`, con un
+presupuesto para el import mínimo (`from consulta_amigable import RouteConfig`).
+
+    $ python tests/benchmarks/bench_import.py
+    $ python tests/benchmarks/bench_import.py --budget 150 --repeat 7
+
+Cada sentencia se ejecuta en un intérprete nuevo; se suman los tiempos propios
+de los módulos que importa y que un intérprete vacío (`pass`) no importa, y se
+reporta el mínimo de `--repeat` ejecuciones. Termina con código 1 si el import
+mínimo supera el presupuesto o si carga alguno de los módulos pesados.
+"""
+
+import argparse
+import subprocess
+import sys
+
+SENTENCIAS = {
+    "RouteConfig": "from consulta_amigable import RouteConfig",
+    "cargar_ruta_yaml": "from consulta_amigable import cargar_ruta_yaml",
+    "ConsultaAmigable": "from consulta_amigable import ConsultaAmigable",
+}
+# Módulos que el import mínimo no debe cargar
+PESADOS = ("playwright", "pandas", "numpy", "questionary", "rich", "httpx", "ubigeos_peru")
+
+
+def importtime(sentencia: str) -> dict[str, int]:
+    """
+    Tiempo propio (µs) de cada módulo importado al ejecutar `sentencia`.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", sentencia],
+        capture_output=True, text=True, check=True,
+    )
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        own, _, name = line.removeprefix("import time:").split("|")
+        modules[name.strip()] = int(own)
+    return modules
+
+
+def medir(sentencia: str, repeat: int) -> tuple[float, set[str]]:
+    base = set(importtime("pass"))
+    mejor, modulos = float("inf"), set()
+    for _ in range(repeat):
+        times = importtime(sentencia)
+        total = sum(us for name, us in times.items() if name not in base) / 1000
+        if total < mejor:
+            mejor, modulos = total, set(times) - base
+    return mejor, modulos
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--budget", type=float, default=200.0, help="ms para el import mínimo")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    resultados = {nombre: medir(sentencia, args.repeat) for nombre, sentencia in SENTENCIAS.items()}
+    print(f"{'import':<20}{'ms':>9}{'módulos':>9}")
+    for nombre, (ms, modulos) in resultados.items():
+        print(f"{nombre:<20}{ms:>9.1f}{len(modulos):>9}")
+
+    ms, modulos = resultados["RouteConfig"]
+    pesados = sorted({name.split(".")[0] for name in modulos} & set(PESADOS))
+    if pesados:
+        print(f"❌ El import mínimo carga {', '.join(pesados)}")
+    if ms > args.budget:
+        print(f"❌ El import mínimo tarda {ms:.1f} ms (presupuesto: {args.budget:.0f} ms)")
+    if pesados or ms > args.budget:
+        sys.exit(1)
+    print(f"✅ Import mínimo dentro del presupuesto ({ms:.1f} / {args.budget:.0f} ms)")
+
+
+if __name__ == "__main__":
+    main()
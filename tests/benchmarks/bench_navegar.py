@@ -0,0 +1,209 @@
+"""
+Benchmarks de `navegar_ruta` contra el mock local del Navegador
+(`tests/mock_server.py`), sin tocar el sitio del MEF.
+
+Corre las rutas YAML de `tests/yamls` (creadas con `crear_ruta`) con cada motor
+y reporta páginas/s, filas/s, clicks (postbacks) por hoja y memoria pico de
+Python (`tracemalloc`, sin contar el proceso de Chromium):
+
+    $ python tests/benchmarks/bench_navegar.py --years 2023 2024 --latency 0.02
+    $ python tests/benchmarks/bench_navegar.py --json resultados.json
+
+Con playwright se comparan además los dos modos de `navigation`: "back"
+(retroceder con go_back tras cada fila) y "jump" (reenviar el postback de la
+tabla del nivel para entrar a la fila siguiente).
+
+Con --engines playwright se necesita Chromium (`playwright install chromium`);
+si no se puede lanzar, esos escenarios se omiten.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+TESTS_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(TESTS_DIR))
+
+from mock_server import Latency, MockNavegador, TreeShape  # noqa: E402
+
+from consulta_amigable import ConsultaAmigable, PartitionedStore, cargar_ruta_yaml  # noqa: E402
+
+YAML_DIR = TESTS_DIR / "yamls"
+
+
+@dataclass
+class Resultado:
+    ruta: str
+    motor: str
+    concurrency: int
+    work_stealing: bool
+    navegacion: str
+    segundos: float
+    paginas: int
+    filas: int
+    hojas: int
+    postbacks: int
+    memoria_pico_mb: float
+
+    @property
+    def paginas_s(self) -> float:
+        return self.paginas / self.segundos if self.segundos else 0.0
+
+    @property
+    def filas_s(self) -> float:
+        return self.filas / self.segundos if self.segundos else 0.0
+
+    @property
+    def clicks_por_hoja(self) -> float:
+        return self.postbacks / self.hojas if self.hojas else 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            **asdict(self),
+            "paginas_s": self.paginas_s,
+            "filas_s": self.filas_s,
+            "clicks_por_hoja": self.clicks_por_hoja,
+        }
+
+
+def profundidad_extraccion(route) -> int:
+    """
+    Número de clicks desde la raíz hasta la tabla que se extrae (las hojas).
+    """
+    return next(i for i, level in enumerate(route.levels) if level.extract_table)
+
+
+async def chromium_disponible() -> bool:
+    from playwright.async_api import async_playwright
+
+    try:
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=True)
+            await browser.close()
+        return True
+    except Exception:
+        return False
+
+
+def correr(server: MockNavegador, route_path: Path, years: list[int], motor: str,
+           concurrency: int, work_stealing: bool, navegacion: str = "back") -> Resultado:
+    route = cargar_ruta_yaml(route_path)
+    server.reset_stats()
+    scraper = ConsultaAmigable(headless=True, navigation=navegacion)
+    scraper.URL_ANUAL = server.url_anual
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        tracemalloc.start()
+        start = time.perf_counter()
+        output = asyncio.run(
+            scraper.navegar_ruta(
+                route=route,
+                years=years,
+                output_dir=output_dir,
+                concurrency=concurrency,
+                work_stealing=work_stealing,
+                engine=motor,
+                output_format="parquet",
+            )
+        )
+        segundos = time.perf_counter() - start
+        _, pico = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        filas = len(PartitionedStore(output).read()) if output != "None" else 0
+
+    depth = profundidad_extraccion(route)
+    hojas = len({(year, json.dumps(path)) for year, path in server.history if len(path) == depth})
+    return Resultado(
+        ruta=route.route_name,
+        motor=motor,
+        concurrency=concurrency,
+        work_stealing=work_stealing,
+        navegacion=navegacion,
+        segundos=segundos,
+        paginas=server.pages_served,
+        filas=filas,
+        hojas=hojas,
+        postbacks=server.postbacks,
+        memoria_pico_mb=pico / 1024**2,
+    )
+
+
+def imprimir(resultados: list[Resultado]) -> None:
+    print(
+        f"{'ruta':<16}{'motor':<12}{'conc':>5}{'ws':>4}{'nav':>6}{'seg':>8}{'pág/s':>9}"
+        f"{'filas/s':>10}{'clicks/hoja':>13}{'MB pico':>9}"
+    )
+    for r in resultados:
+        print(
+            f"{r.ruta:<16}{r.motor:<12}{r.concurrency:>5}{'sí' if r.work_stealing else '':>4}"
+            f"{r.navegacion if r.motor == 'playwright' else '':>6}"
+            f"{r.segundos:>8.2f}{r.paginas_s:>9.1f}{r.filas_s:>10.1f}"
+            f"{r.clicks_por_hoja:>13.2f}{r.memoria_pico_mb:>9.1f}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--routes", nargs="*", type=Path, default=sorted(YAML_DIR.glob("*.yaml")))
+    parser.add_argument("--years", nargs="*", type=int, default=[2024])
+    parser.add_argument("--engines", nargs="*", default=["http", "playwright"])
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--departamentos", type=int, default=25)
+    parser.add_argument("--provincias", type=int, default=3)
+    parser.add_argument("--municipalidades", type=int, default=4)
+    parser.add_argument("--latency", type=float, default=0.0, help="segundos por respuesta")
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--json", type=Path, help="archivo donde guardar los resultados")
+    args = parser.parse_args()
+    logging.getLogger("consulta_amigable").setLevel(logging.WARNING)
+
+    engines = list(args.engines)
+    if "playwright" in engines and not asyncio.run(chromium_disponible()):
+        print("Chromium no disponible: se omiten los escenarios con playwright")
+        engines.remove("playwright")
+
+    escenarios = []
+    for motor in engines:
+        if motor == "http":
+            escenarios += [("http", 1, False, "back"), ("http", args.concurrency, False, "back")]
+        else:
+            escenarios += [
+                ("playwright", 1, False, "back"),
+                ("playwright", 1, False, "jump"),
+                ("playwright", args.concurrency, False, "back"),
+                ("playwright", args.concurrency, False, "jump"),
+                ("playwright", args.concurrency, True, "back"),
+            ]
+
+    shape = TreeShape(args.departamentos, args.provincias, args.municipalidades)
+    latency = Latency(base=args.latency, jitter=args.jitter, seed=0)
+    resultados = []
+    with MockNavegador(shape, latency=latency) as server:
+        # Calentamiento: importaciones perezosas y primera conexión no se miden
+        correr(server, args.routes[0], args.years[:1], escenarios[0][0], 1, False)
+        for route_path in args.routes:
+            for motor, concurrency, work_stealing, navegacion in escenarios:
+                resultados.append(
+                    correr(
+                        server, route_path, args.years, motor, concurrency, work_stealing,
+                        navegacion,
+                    )
+                )
+
+    imprimir(resultados)
+    if args.json:
+        args.json.write_text(
+            json.dumps([r.to_dict() for r in resultados], indent=2, ensure_ascii=False),
+            encoding="utf-8",
+        )
+
+
+if __name__ == "__main__":
+    main()
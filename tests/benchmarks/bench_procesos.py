@@ -0,0 +1,126 @@
+"""
+Escalamiento de `navegar_ruta(processes=n)` contra el mock local del Navegador
+(`tests/mock_server.py`): tiempo total (extracción + limpieza + guardado) según
+el número de procesos worker.
+
+    $ python tests/benchmarks/bench_procesos.py --processes 1 2 4 8 --years 2023 2024
+    $ python tests/benchmarks/bench_procesos.py --engine playwright --json procesos.json
+
+Con `--processes 1` se mide la ejecución normal en un solo proceso (la línea
+base del speedup). El speedup depende de los núcleos disponibles
+(`os.cpu_count()`, que se reporta) y de la latencia del servidor: con latencia
+alta el cuello de botella es la red y conviene más subir `--concurrency`.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+TESTS_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(TESTS_DIR))
+
+from mock_server import Latency, MockNavegador, TreeShape  # noqa: E402
+
+from consulta_amigable import ConsultaAmigable, PartitionedStore, cargar_ruta_yaml  # noqa: E402
+
+YAML_DIR = TESTS_DIR / "yamls"
+
+
+@dataclass
+class Resultado:
+    ruta: str
+    motor: str
+    procesos: int
+    segundos: float
+    extraccion: float
+    filas: int
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def correr(server: MockNavegador, route_path: Path, years: list[int], motor: str,
+           procesos: int, concurrency: int) -> Resultado:
+    route = cargar_ruta_yaml(route_path)
+    scraper = ConsultaAmigable(headless=True)
+    scraper.URL_ANUAL = server.url_anual
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        start = time.perf_counter()
+        output = asyncio.run(
+            scraper.navegar_ruta(
+                route=route,
+                years=years,
+                output_dir=output_dir,
+                concurrency=concurrency,
+                engine=motor,
+                output_format="parquet",
+                processes=procesos,
+            )
+        )
+        segundos = time.perf_counter() - start
+        filas = len(PartitionedStore(output).read()) if output != "None" else 0
+        summary = Path(output_dir) / f"{route.route_name}.processes.json"
+        extraccion = (
+            json.loads(summary.read_text(encoding="utf-8"))["extract_seconds"]
+            if summary.exists()
+            else segundos
+        )
+
+    return Resultado(route.route_name, motor, procesos, segundos, extraccion, filas)
+
+
+def imprimir(resultados: list[Resultado]) -> None:
+    print(f"Núcleos disponibles: {os.cpu_count()}")
+    print(f"{'ruta':<16}{'motor':<12}{'proc':>5}{'seg':>8}{'extr':>8}{'filas':>8}{'speedup':>9}")
+    base = {}
+    for r in resultados:
+        base.setdefault((r.ruta, r.motor), r.segundos)
+        speedup = base[(r.ruta, r.motor)] / r.segundos if r.segundos else 0.0
+        print(
+            f"{r.ruta:<16}{r.motor:<12}{r.procesos:>5}{r.segundos:>8.2f}"
+            f"{r.extraccion:>8.2f}{r.filas:>8}{speedup:>9.2f}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--routes", nargs="*", type=Path, default=sorted(YAML_DIR.glob("*.yaml")))
+    parser.add_argument("--years", nargs="*", type=int, default=[2023, 2024])
+    parser.add_argument("--engine", default="http", choices=["http", "playwright"])
+    parser.add_argument("--processes", nargs="*", type=int, default=[1, 2, 4])
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--departamentos", type=int, default=25)
+    parser.add_argument("--provincias", type=int, default=8)
+    parser.add_argument("--municipalidades", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.0, help="segundos por respuesta")
+    parser.add_argument("--json", type=Path, help="archivo donde guardar los resultados")
+    args = parser.parse_args()
+    logging.getLogger("consulta_amigable").setLevel(logging.WARNING)
+
+    shape = TreeShape(args.departamentos, args.provincias, args.municipalidades)
+    resultados = []
+    with MockNavegador(shape, latency=Latency(base=args.latency, seed=0)) as server:
+        for route_path in args.routes:
+            for procesos in sorted(args.processes):
+                resultados.append(
+                    correr(server, route_path, args.years, args.engine, procesos, args.concurrency)
+                )
+
+    imprimir(resultados)
+    if args.json:
+        args.json.write_text(
+            json.dumps([r.to_dict() for r in resultados], indent=2, ensure_ascii=False),
+            encoding="utf-8",
+        )
+
+
+if __name__ == "__main__":
+    main()
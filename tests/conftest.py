@@ -0,0 +1,9 @@
+import pytest
+from consulta_amigable import n_ubigeo
+
+
+@pytest.fixture(autouse=True)
+def cache_temporal(tmp_path, monkeypatch):
+    # Ninguna prueba escribe la tabla de ubigeos en el directorio del usuario
+    monkeypatch.setenv("CONSULTA_AMIGABLE_CACHE", str(tmp_path / "cache"))
+    monkeypatch.setattr(n_ubigeo, "_normalizer", None)
@@ -0,0 +1,152 @@
+"""
+Página de Playwright simulada sobre HTTP, para probar los modos de navegación
+del motor "playwright" (años en paralelo, work stealing, "back" y "jump") contra
+`MockNavegador` sin Chromium.
+
+Implementa solo lo que `ConsultaAmigable` usa de Playwright: `goto`, `frame0`
+con sus locators de filas y botones, `evaluate` (captura de la tabla y envío de
+formularios) y `history.back()`. Cada página tiene su propio cliente HTTP e
+historial, como un contexto de navegador aislado.
+
+Uso:
+    scraper = ConsultaSimulada(headless=True)
+    scraper.URL_ANUAL = server.url_anual
+    await scraper.navegar_ruta(..., engine="playwright")
+"""
+
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from urllib.parse import urljoin
+
+import httpx
+from consulta_amigable import ConsultaAmigable
+from consulta_amigable.a_config import Locators
+from consulta_amigable.b_scraper import SUBMIT_FORM_JS
+from consulta_amigable.h_http_engine import NavegadorPage, parse_navegador_page
+from consulta_amigable.i_snapshot import SNAPSHOT_JS
+
+
+class FakeLocator:
+    def __init__(self, frame: "FakeFrame", selector: str, text: str | None = None):
+        self.frame = frame
+        self.selector = selector
+        self.text = text
+
+    @property
+    def first(self) -> "FakeLocator":
+        return self
+
+    def locator(self, selector: str) -> "FakeLocator":
+        return FakeLocator(self.frame, selector, self.text)
+
+    def filter(self, has_text: str) -> "FakeLocator":
+        return FakeLocator(self.frame, self.selector, has_text)
+
+    async def click(self) -> None:
+        await self.frame.click(self.selector, self.text)
+
+    async def all_inner_texts(self) -> list[str]:
+        return list(self.frame.state.row_names)
+
+
+class FakeFrame:
+    def __init__(self, page: "FakePage"):
+        self.page = page
+
+    @property
+    def state(self) -> NavegadorPage:
+        return self.page.history[-1]
+
+    @property
+    def url(self) -> str:
+        return self.state.url
+
+    async def content(self) -> str:
+        return self.page.html[-1]
+
+    async def wait_for_selector(self, selector: str, state: str | None = None) -> None:
+        if not self.state.table_rows:
+            raise AssertionError(f"{selector} no está en {self.url}")
+
+    @asynccontextmanager
+    async def expect_navigation(self, wait_until: str | None = None):
+        before = self.page.navigations
+        yield
+        if self.page.navigations == before:
+            raise AssertionError("La acción no navegó frame0")
+
+    def locator(self, selector: str) -> FakeLocator:
+        return FakeLocator(self, selector)
+
+    async def evaluate(self, script: str, arg=None):
+        if script == SNAPSHOT_JS:
+            return {
+                "superior": self.state.header_rows.get(Locators.header_row_0, []),
+                "inferior": self.state.header_rows.get(Locators.header_row_1, []),
+                "rows": self.state.table_rows,
+            }
+        if script == SUBMIT_FORM_JS:
+            action, fields = arg
+            await self.page.request("POST", action, data=fields)
+            return None
+        raise NotImplementedError(script)
+
+    async def click(self, selector: str, text: str) -> None:
+        if selector == Locators.text_rows:
+            # La fila solo se selecciona; el postback lo envía el botón
+            self.state.find_row(text)
+            self.page.selected_row = text
+        elif selector == Locators.buttons:
+            action, fields = self.state.postback_data(self.page.selected_row, text)
+            await self.page.request("POST", action, data=fields)
+        else:
+            raise NotImplementedError(selector)
+
+
+class FakePage:
+    def __init__(self):
+        self.client = httpx.AsyncClient(timeout=20)
+        self.history: list[NavegadorPage] = []
+        self.html: list[str] = []
+        self.selected_row: str | None = None
+        self.navigations = 0
+        self.context = SimpleNamespace(close=self.client.aclose)
+
+    async def request(self, method: str, url: str, **kwargs) -> NavegadorPage:
+        response = await self.client.request(method, url, **kwargs)
+        response.raise_for_status()
+        page = parse_navegador_page(str(response.url), response.text)
+        if page.frame_src is not None:
+            # default.aspx: frame0 carga la página del Navegador
+            return await self.request("GET", urljoin(page.url, page.frame_src))
+        self.history.append(page)
+        self.html.append(response.text)
+        self.navigations += 1
+        return page
+
+    async def goto(self, url: str) -> None:
+        await self.request("GET", url)
+
+    def frame(self, name: str) -> FakeFrame:
+        assert name == Locators.main_frame
+        return FakeFrame(self)
+
+    async def evaluate(self, script: str) -> None:
+        if script != "history.back()":
+            raise NotImplementedError(script)
+        # Como el navegador, muestra la página anterior sin volver a pedirla
+        self.history.pop()
+        self.html.pop()
+        self.navigations += 1
+
+
+class ConsultaSimulada(ConsultaAmigable):
+    """
+    `ConsultaAmigable` cuyo "navegador" son páginas `FakePage`.
+    """
+
+    async def _launch_browser(self) -> None:
+        pass
+
+    async def _open_page(self) -> FakePage:
+        return FakePage()
@@ -0,0 +1,464 @@
+"""
+Servidor local que imita las páginas del Navegador de Consulta Amigable
+(`Navegador/default.aspx` con `frame0`, `table.Data`, botones submit y postbacks
+con `__VIEWSTATE`/`__EVENTVALIDATION`) para probar el scraper sin usar el sitio
+del MEF.
+
+Uso:
+    with MockNavegador() as server:
+        scraper.URL_ANUAL = server.url_anual
+        ...
+
+También se puede levantar solo, p. ej. para `crear_ruta` con un navegador:
+    $ python tests/mock_server.py --port 8000 --latency 0.05
+"""
+
+import argparse
+import base64
+import hashlib
+import html
+import json
+import random
+import re
+import threading
+import time
+import zlib
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+DEPARTAMENTOS = [
+    "AMAZONAS", "ANCASH", "APURIMAC", "AREQUIPA", "AYACUCHO", "CAJAMARCA",
+    "CALLAO", "CUSCO", "HUANCAVELICA", "HUANUCO", "ICA", "JUNIN", "LA LIBERTAD",
+    "LAMBAYEQUE", "LIMA", "LORETO", "MADRE DE DIOS", "MOQUEGUA", "PASCO", "PIURA",
+    "PUNO", "SAN MARTIN", "TACNA", "TUMBES", "UCAYALI",
+]
+
+DIMENSIONES_FIJAS = {
+    "Nivel de Gobierno": [
+        "E: GOBIERNO NACIONAL",
+        "M: GOBIERNOS LOCALES",
+        "R: GOBIERNOS REGIONALES",
+    ],
+    "Gob.Loc./Mancom.": ["M: MUNICIPALIDADES", "N: MANCOMUNIDADES MUNICIPALES"],
+    "Sector": [
+        "01: PRESIDENCIA CONSEJO MINISTROS",
+        "07: INTERIOR",
+        "10: EDUCACION",
+        "11: SALUD",
+        "36: TRANSPORTES Y COMUNICACIONES",
+    ],
+}
+
+BOTONES = [
+    "Nivel de Gobierno",
+    "Gob.Loc./Mancom.",
+    "Sector",
+    "Departamento",
+    "Provincia",
+    "Municipalidad",
+]
+
+COLUMNAS = ["PIA", "PIM", "Certificación", "Compromiso Anual"]
+EJECUCION = ["Atención de Compromiso Mensual", "Devengado", "Girado"]
+# Listas desplegables de la consulta mensual
+SELECT_ANIO = "ctl00$CPH1$DrpYear"
+SELECT_MES = "ctl00$CPH1$DrpMes"
+
+
+@dataclass
+class TreeShape:
+    """
+    Forma del árbol geográfico servido por el mock. Los hijos por nodo pueden ser
+    un número fijo o una lista que se recorre cíclicamente (árbol desbalanceado):
+    `provincias_por_departamento=[1, 8]` da 1 provincia al primer departamento,
+    8 al segundo, 1 al tercero...
+    """
+
+    departamentos: int = 3
+    provincias_por_departamento: int | list[int] = 2
+    municipalidades_por_provincia: int | list[int] = 3
+
+    @staticmethod
+    def _children(spec: int | list[int], index: int) -> int:
+        return spec if isinstance(spec, int) else spec[index % len(spec)]
+
+    def provincias(self, departamento: int) -> int:
+        return self._children(self.provincias_por_departamento, departamento)
+
+    def municipalidades(self, provincia: int) -> int:
+        return self._children(self.municipalidades_por_provincia, provincia)
+
+
+@dataclass
+class Latency:
+    """
+    Demora de cada respuesta del mock en segundos: `base` más un valor aleatorio
+    uniforme entre 0 y `jitter`. Los postbacks suman además `postback` y `load`
+    por cada otro postback en vuelo (un servidor que se degrada con la carga).
+    """
+
+    base: float = 0.0
+    jitter: float = 0.0
+    postback: float = 0.0
+    seed: int | None = None
+    load: float = 0.0
+    _random: random.Random = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self._random = random.Random(self.seed)
+
+    def delay(self, postback: bool = False, in_flight: int = 1) -> float:
+        extra = self._random.uniform(0, self.jitter) if self.jitter else 0.0
+        if postback:
+            extra += self.postback + self.load * max(0, in_flight - 1)
+        return self.base + extra
+
+
+class MockNavegador:
+    """
+    Servidor HTTP en un hilo aparte. Cuenta los postbacks y las páginas de
+    `frame0` servidas y guarda en `history` cada página servida como
+    `(año, camino)`, donde camino es la lista de `[fila, botón]` desde la raíz.
+    """
+
+    def __init__(
+        self,
+        shape: TreeShape | None = None,
+        port: int = 0,
+        latency: Latency | float | None = None,
+    ):
+        self.shape = shape or TreeShape()
+        if not isinstance(latency, Latency):
+            latency = Latency(base=latency or 0.0)
+        self.latency = latency
+        self.postbacks = 0
+        self.pages_served = 0
+        self.history: list[tuple[int, list]] = []
+        # Años cuya página inicial responde con error 500
+        self.fail_years: set[int] = set()
+        # Número de postbacks siguientes que responden con error 503
+        self.fail_postbacks = 0
+        # Postbacks simultáneos que atiende el servidor; los que exceden el límite
+        # responden 503 (como un servidor que limita la tasa)
+        self.capacity: int | None = None
+        self.throttled = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), self._handler_class())
+        self._thread: threading.Thread | None = None
+
+    # ---------------------
+    # Ciclo de vida
+    # ---------------------
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def url_anual(self) -> str:
+        return self.base_url + "/transparencia/Navegador/default.aspx?y={}&ap=ActProy"
+
+    @property
+    def url_mensual(self) -> str:
+        return self.base_url + "/transparencia/mensual/default.aspx?y={}&m={}&ap=ActProy"
+
+    @property
+    def url_mensual_pagina(self) -> str:
+        # Como `URL_MENSUAL` por defecto: el año y el mes se eligen en la página
+        return self.base_url + "/transparencia/mensual/"
+
+    def start(self) -> "MockNavegador":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread = None
+        self._server.server_close()
+
+    def __enter__(self) -> "MockNavegador":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.postbacks = 0
+            self.pages_served = 0
+            self.history = []
+            self.throttled = 0
+            self.peak_in_flight = 0
+
+    def _record(self, year: int, path: list, postback: bool) -> None:
+        with self._lock:
+            self.pages_served += 1
+            self.postbacks += postback
+            self.history.append((year, path))
+
+    # ---------------------
+    # Datos
+    # ---------------------
+    def departamentos(self) -> list[str]:
+        return [
+            f"{i + 1:02d}: {nombre}"
+            for i, nombre in enumerate(DEPARTAMENTOS[: self.shape.departamentos])
+        ]
+
+    def provincias(self, departamento: str) -> list[str]:
+        code = departamento.split(":")[0]
+        return [
+            f"{code}{j + 1:02d}: PROVINCIA {j + 1:02d} DE {departamento.split(': ')[1]}"
+            for j in range(self.shape.provincias(int(code) - 1))
+        ]
+
+    def municipalidades(self, provincia: str) -> list[str]:
+        code = provincia.split(":")[0]
+        base = 300000 + int(code) * 100
+        n = self.shape.municipalidades((int(code[:2]) - 1) * 100 + int(code[2:]) - 1)
+        return [
+            f"{code}{k + 1:02d}-{base + k}: MUNICIPALIDAD DISTRITAL {k + 1:02d}"
+            for k in range(n)
+        ]
+
+    def rows_for(self, path: list[list[str]]) -> list[str]:
+        """
+        Filas de `table.Data` tras seguir `path` ([fila, botón], ...) desde la raíz.
+        """
+        if not path:
+            return ["TOTAL"]
+        button = path[-1][1]
+        selected = [row for row, _ in path]
+        departamento = next((r for r in selected if re.match(r"^\d{2}: ", r)), None)
+        provincia = next((r for r in selected if re.match(r"^\d{4}: ", r)), None)
+
+        if button in DIMENSIONES_FIJAS:
+            return DIMENSIONES_FIJAS[button]
+        if button == "Departamento":
+            return self.departamentos()
+        if button == "Provincia":
+            deps = [departamento] if departamento else self.departamentos()
+            return [p for d in deps for p in self.provincias(d)]
+        if button == "Municipalidad":
+            if provincia:
+                provs = [provincia]
+            else:
+                deps = [departamento] if departamento else self.departamentos()
+                provs = [p for d in deps for p in self.provincias(d)]
+            return [m for p in provs for m in self.municipalidades(p)]
+        return []
+
+    @staticmethod
+    def amounts(year: int, path: list[list[str]], row: str, month: int | None = None) -> list[str]:
+        key = [year, path, row] if month is None else [year, month, path, row]
+        seed = zlib.crc32(json.dumps(key).encode("utf-8"))
+        pia = seed % 90_000_000 + 1_000_000
+        pim = pia + seed % 7_000_000
+        values = [pia, pim, int(pim * 0.97), int(pim * 0.95), int(pim * 0.9), int(pim * 0.8), int(pim * 0.79)]
+        avance = round(values[5] / pim * 100, 1)
+        return [f"{v:,}" for v in values] + [f"{avance}"]
+
+    # ---------------------
+    # HTML
+    # ---------------------
+    @staticmethod
+    def encode_state(year: int, path: list, month: int | None = None) -> tuple[str, str]:
+        state = {"y": year, "path": path}
+        if month is not None:
+            state["m"] = month
+        viewstate = base64.b64encode(json.dumps(state).encode()).decode()
+        validation = hashlib.sha1(viewstate.encode()).hexdigest()[:16]
+        return viewstate, validation
+
+    @staticmethod
+    def _query(year: int, month: int | None) -> str:
+        return f"y={year}&amp;ap=ActProy" if month is None else f"y={year}&amp;m={month}&amp;ap=ActProy"
+
+    def render_default(self, year: int, month: int | None = None) -> str:
+        return (
+            "<html><head><title>Consulta Amigable</title>"
+            "<link rel='stylesheet' href='/transparencia/css/estilo.css'></head><body>"
+            f"<iframe name='frame0' id='frame0' src='Navegar.aspx?{self._query(year, month)}'"
+            " width='100%' height='600'></iframe></body></html>"
+        )
+
+    def render_navegar(self, year: int, path: list, month: int | None = None) -> str:
+        viewstate, validation = self.encode_state(year, path, month)
+        rows = self.rows_for(path)
+        dimension = path[-1][1] if path else "Total"
+
+        buttons = "".join(
+            f"<input type='submit' name='ctl00$CPH1$Btn{re.sub(r'[^A-Za-z]', '', b)}'"
+            f" value='{html.escape(b)}' class='Button' />"
+            for b in BOTONES
+        )
+        header_0 = "<td rowspan='2'>&nbsp;</td>" + f"<td rowspan='2'>{html.escape(dimension)}</td>"
+        header_0 += "".join(f"<td rowspan='2'>{c}</td>" for c in COLUMNAS)
+        header_0 += "<td colspan='3'>Ejecución</td><td rowspan='2'>Avance %</td>"
+        header_1 = "".join(f"<td>{c}</td>" for c in EJECUCION)
+        # La consulta mensual tiene listas de año y mes con AutoPostBack
+        selects = "" if month is None else self.render_select(
+            SELECT_ANIO, range(2012, 2026), year
+        ) + self.render_select(SELECT_MES, range(1, 13), month)
+
+        body = []
+        for i, row in enumerate(rows):
+            cells = "".join(
+                f"<td align='right'>{v}</td>" for v in self.amounts(year, path, row, month)
+            )
+            body.append(
+                f"<tr id='tr{i}' onclick=\"this.querySelector('input').checked = true\">"
+                f"<td><input type='radio' name='grp1' value='{i}' /></td>"
+                f"<td align='left'>{html.escape(row)}</td>{cells}</tr>"
+            )
+
+        return (
+            "<html><head><link rel='stylesheet' href='/transparencia/css/estilo.css'>"
+            "<script src='/transparencia/js/navegador.js'></script></head><body>"
+            f"<form method='post' action='./Navegar.aspx?{self._query(year, month)}' id='aspnetForm'>"
+            f"<input type='hidden' name='__VIEWSTATE' id='__VIEWSTATE' value='{viewstate}' />"
+            f"<input type='hidden' name='__EVENTVALIDATION' id='__EVENTVALIDATION' value='{validation}' />"
+            "<input type='hidden' name='__EVENTTARGET' id='__EVENTTARGET' value='' />"
+            f"{selects}<div class='Buttons'>{buttons}</div>"
+            "<table class='MapTable' id='ctl00_CPH1_Mt0'>"
+            f"<tr id='ctl00_CPH1_Mt0_Row0'>{header_0}</tr>"
+            f"<tr id='ctl00_CPH1_Mt0_Row1'>{header_1}</tr></table>"
+            f"<table class='Data'>{''.join(body)}</table>"
+            "<img src='/transparencia/img/logo.png' /></form></body></html>"
+        )
+
+    @staticmethod
+    def render_select(name: str, values, selected: int) -> str:
+        options = "".join(
+            f"<option value='{v}'{' selected' if v == selected else ''}>{v}</option>" for v in values
+        )
+        onchange = "document.getElementById('__EVENTTARGET').value = this.name; this.form.submit()"
+        return f"<select name='{name}' onchange=\"{onchange}\">{options}</select>"
+
+    # ---------------------
+    # Servidor
+    # ---------------------
+    def _handler_class(self):
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _send(self, body: str, status: int = 200, content_type: str = "text/html"):
+                data = body.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+                self.send_header("Content-Length", str(len(data)))
+                self.send_header("Cache-Control", "private")
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                query = parse_qs(url.query)
+                year = int(query.get("y", ["2024"])[0])
+                month = int(query["m"][0]) if "m" in query else None
+                if month is None and "/mensual/" in url.path:
+                    # Página de la consulta mensual sin periodo: abre en enero
+                    month = 1
+                if year in mock.fail_years:
+                    self._send("Server Error", status=500)
+                elif url.path.endswith(("/default.aspx", "/mensual/")):
+                    time.sleep(mock.latency.delay())
+                    self._send(mock.render_default(year, month))
+                elif url.path.endswith("/Navegar.aspx"):
+                    time.sleep(mock.latency.delay())
+                    mock._record(year, [], postback=False)
+                    self._send(mock.render_navegar(year, [], month))
+                elif url.path.endswith(".css"):
+                    self._send("body { font-family: sans-serif; }", content_type="text/css")
+                elif url.path.endswith(".js"):
+                    self._send("", content_type="application/javascript")
+                else:
+                    self._send("", status=404)
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                form = {
+                    k: v[0]
+                    for k, v in parse_qs(self.rfile.read(length).decode("utf-8")).items()
+                }
+                with mock._lock:
+                    failing = mock.fail_postbacks > 0
+                    mock.fail_postbacks -= failing
+                    throttled = not failing and mock.capacity is not None and mock.in_flight >= mock.capacity
+                    mock.throttled += throttled
+                    if not failing and not throttled:
+                        mock.in_flight += 1
+                        mock.peak_in_flight = max(mock.peak_in_flight, mock.in_flight)
+                        in_flight = mock.in_flight
+                if failing or throttled:
+                    self._send("Service Unavailable", status=503)
+                    return
+                try:
+                    self._postback(form, in_flight)
+                finally:
+                    with mock._lock:
+                        mock.in_flight -= 1
+
+            def _postback(self, form: dict, in_flight: int):
+                viewstate = form.get("__VIEWSTATE", "")
+                expected = hashlib.sha1(viewstate.encode()).hexdigest()[:16]
+                if form.get("__EVENTVALIDATION") != expected:
+                    self._send("Invalid postback or callback argument", status=500)
+                    return
+
+                state = json.loads(base64.b64decode(viewstate))
+                year, path, month = state["y"], state["path"], state.get("m")
+                target = form.get("__EVENTTARGET")
+                if target in (SELECT_ANIO, SELECT_MES):
+                    # Cambio de año o de mes: vuelve a la página inicial del periodo
+                    year = int(form[SELECT_ANIO]) if target == SELECT_ANIO else year
+                    month = int(form[SELECT_MES]) if target == SELECT_MES else month
+                    time.sleep(mock.latency.delay(postback=True, in_flight=in_flight))
+                    mock._record(year, [], postback=True)
+                    self._send(mock.render_navegar(year, [], month))
+                    return
+                button = next(
+                    (v for k, v in form.items() if k.startswith("ctl00$CPH1$Btn")), None
+                )
+                selected = form.get("grp1")
+                rows = mock.rows_for(path)
+                if button and selected is not None and int(selected) < len(rows):
+                    path = path + [[rows[int(selected)], button]]
+                time.sleep(mock.latency.delay(postback=True, in_flight=in_flight))
+                mock._record(year, path, postback=True)
+                self._send(mock.render_navegar(year, path, month))
+
+        return Handler
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Mock local del Navegador de Consulta Amigable")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--departamentos", type=int, default=25)
+    parser.add_argument("--provincias", type=int, default=3)
+    parser.add_argument("--municipalidades", type=int, default=4)
+    parser.add_argument("--latency", type=float, default=0.0, help="segundos por respuesta")
+    parser.add_argument("--jitter", type=float, default=0.0)
+    args = parser.parse_args()
+
+    shape = TreeShape(args.departamentos, args.provincias, args.municipalidades)
+    server = MockNavegador(shape, port=args.port, latency=Latency(args.latency, args.jitter))
+    print(f"Sirviendo {server.url_anual.format(2024)} (Ctrl+C para salir)")
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+import asyncio
+import json
+import pandas as pd
+import pytest
+from consulta_amigable import ConcurrencyGovernor, ConsultaAmigable, LevelConfig
+from consulta_amigable.q_pool import PagePool
+from mock_server import MockNavegador, TreeShape
+from test_http_engine import RUTA_MUNICIPALIDADES, YAML_DIR
+
+
+def test_batch_varias_rutas_http(tmp_path):
+    shape = TreeShape(departamentos=3, provincias_por_departamento=2, municipalidades_por_provincia=2)
+    scraper = ConsultaAmigable(headless=True)
+    with MockNavegador(shape) as server:
+        scraper.URL_ANUAL = server.url_anual
+        summary = asyncio.run(
+            scraper.navegar_rutas(
+                routes=[YAML_DIR / "salud.yaml", RUTA_MUNICIPALIDADES],
+                years={"salud": [2020, 2021], "municipalidades": 2024},
+                output_dir=tmp_path,
+                concurrency=2,
+                engine="http",
+            )
+        )
+
+    assert set(summary["routes"]) == {"salud", "municipalidades"}
+    assert all(route["completed"] for route in summary["routes"].values())
+    assert len(pd.read_excel(summary["routes"]["salud"]["output"])) == 2 * 3
+    assert len(pd.read_excel(summary["routes"]["municipalidades"]["output"])) == 3 * 2 * 2
+    assert summary["rows"] == 2 * 3 + 3 * 2 * 2
+    assert json.loads((tmp_path / "batch.summary.json").read_text(encoding="utf-8"))["rows"] == summary["rows"]
+
+
+class FakeContext:
+    def __init__(self):
+        self.cleared = 0
+        self.closed = False
+
+    async def clear_cookies(self):
+        self.cleared += 1
+
+    async def close(self):
+        self.closed = True
+
+
+class FakePage:
+    def __init__(self):
+        self.context = FakeContext()
+
+    def is_closed(self):
+        return self.context.closed
+
+
+def test_pool_limita_y_reutiliza_paginas():
+    async def run():
+        async def new_page():
+            return FakePage()
+
+        pool = PagePool(new_page, size=2)
+        in_use = 0
+        peak = 0
+
+        async def route():
+            nonlocal in_use, peak
+            page = await pool.acquire()
+            in_use += 1
+            peak = max(peak, in_use)
+            await asyncio.sleep(0.01)
+            in_use -= 1
+            await pool.release(page)
+
+        await asyncio.gather(*(route() for _ in range(6)))
+        await pool.close()
+        return pool, peak
+
+    pool, peak = asyncio.run(run())
+    assert peak == 2
+    assert (pool.created, pool.reused) == (2, 4)
+
+
+RUTA_DEPARTAMENTOS = RUTA_MUNICIPALIDADES.model_copy(
+    update={
+        "route_name": "departamentos",
+        "levels": RUTA_MUNICIPALIDADES.levels[:3]
+        + [LevelConfig(name="Nivel 4", button="", fila="", extract_table=True)],
+    }
+)
+RUTA_PROVINCIAS = RUTA_MUNICIPALIDADES.model_copy(
+    update={
+        "route_name": "provincias",
+        "levels": RUTA_MUNICIPALIDADES.levels[:3]
+        + [
+            LevelConfig(name="Departamento", button="Provincia", fila="", iterate=True),
+            LevelConfig(name="Nivel 5", button="", fila="", extract_table=True),
+        ],
+    }
+)
+
+
+def test_batch_prefijos_compartidos(tmp_path):
+    shape = TreeShape(departamentos=3, provincias_por_departamento=2, municipalidades_por_provincia=2)
+    rutas = [RUTA_MUNICIPALIDADES, RUTA_DEPARTAMENTOS, RUTA_PROVINCIAS]
+    scraper = ConsultaAmigable(headless=True)
+    with MockNavegador(shape) as server:
+        scraper.URL_ANUAL = server.url_anual
+        esperado = asyncio.run(
+            scraper.navegar_rutas(rutas, years=2024, output_dir=tmp_path / "solas", engine="http")
+        )
+        naive = server.postbacks
+        server.postbacks = 0
+        summary = asyncio.run(
+            scraper.navegar_rutas(
+                rutas, years=2024, output_dir=tmp_path / "plan", engine="http", share_prefixes=True
+            )
+        )
+        assert server.postbacks == summary["plan"]["postbacks"]
+
+    # 3 pasos fijos compartidos y los departamentos de provincias/municipalidades
+    assert summary["plan"]["steps"] == 3 + 3 + 3 * 2
+    assert summary["plan"]["naive_steps"] == naive
+    assert server.postbacks < naive
+    for name in ("municipalidades", "departamentos", "provincias"):
+        pd.testing.assert_frame_equal(
+            pd.read_excel(summary["routes"][name]["output"]),
+            pd.read_excel(esperado["routes"][name]["output"]),
+        )
+
+
+def test_batch_prefijos_compartidos_con_shard(tmp_path):
+    scraper = ConsultaAmigable(headless=True)
+    with pytest.raises(ValueError, match="shard"):
+        asyncio.run(
+            scraper.navegar_rutas(
+                [RUTA_MUNICIPALIDADES, RUTA_PROVINCIAS],
+                years=2024,
+                output_dir=tmp_path,
+                engine="http",
+                share_prefixes=True,
+                shard="1/2",
+            )
+        )
+
+
+def test_batch_prefijos_compartidos_adaptativo(tmp_path):
+    rutas = [RUTA_MUNICIPALIDADES, RUTA_PROVINCIAS]
+    governor = ConcurrencyGovernor(max_limit=3)
+    scraper = ConsultaAmigable(headless=True)
+    with MockNavegador() as server:
+        scraper.URL_ANUAL = server.url_anual
+        summary = asyncio.run(
+            scraper.navegar_rutas(
+                rutas,
+                years=2024,
+                output_dir=tmp_path,
+                engine="http",
+                share_prefixes=True,
+                adaptive=governor,
+            )
+        )
+
+    # Todos los postbacks del plan pasan por el gobernador
+    assert all(result["completed"] for result in summary["routes"].values())
+    assert governor.peak_in_flight >= 1
+    assert (tmp_path / "batch.concurrency.json").exists()
@@ -0,0 +1,44 @@
+import math
+import pytest
+from consulta_amigable.v_buffer import RowBuffer
+
+COLUMNAS = ["Año", "Departamento", "", "Municipalidad", "PIA", "Girado"]
+
+
+def test_buffer_codifica_texto_y_montos():
+    buffer = RowBuffer(numeric=2, batch_size=2)
+    buffer.append_table([2024, "01: AMAZONAS"], [["", "0101: A", "1,500", "10"], ["", "0102: B", "", "20.5"]])
+    buffer.extend([[2023, "02: ANCASH", "", "0201: C", "7", " "]])
+    df = buffer.to_frame(COLUMNAS)
+
+    assert len(buffer) == 3
+    assert df["Año"].tolist() == [2024, 2024, 2023]
+    assert df["Departamento"].dtype == "category"
+    assert df["Departamento"].cat.categories.tolist() == ["01: AMAZONAS", "02: ANCASH"]
+    assert df["PIA"].tolist()[0] == 1500.0 and math.isnan(df["PIA"].tolist()[1])
+    assert df["Girado"].tolist()[:2] == [10.0, 20.5] and math.isnan(df["Girado"].tolist()[2])
+
+
+def test_buffer_extend_con_otro_buffer():
+    a, b = RowBuffer(numeric=2), RowBuffer(numeric=2)
+    a.extend([[2024, "01: AMAZONAS", "", "0101: A", "1", "2"]])
+    b.extend([[2024, "02: ANCASH", "", "0201: C", "3", "4"], [2024, "01: AMAZONAS", "", "0101: A", "5", "6"]])
+    a.extend(b)
+    df = a.to_frame(COLUMNAS)
+
+    assert df["Departamento"].astype(str).tolist() == ["01: AMAZONAS", "02: ANCASH", "01: AMAZONAS"]
+    assert df["PIA"].tolist() == [1.0, 3.0, 5.0]
+
+
+def test_buffer_montos_desde_los_encabezados():
+    # Las columnas de montos no se deducen de la primera fila: un monto vacío o
+    # un nombre numérico no cambian cuántas hay
+    buffer = RowBuffer(numeric=2)
+    buffer.extend([[2024, "01: AMAZONAS", "", "2024", "", "-"]])
+    with pytest.raises(ValueError, match="Monto no numérico: '-'"):
+        buffer.to_frame(COLUMNAS)
+
+    buffer = RowBuffer(numeric=2)
+    buffer.extend([[2024, "01: AMAZONAS", "", "0101: A", "1", "2"]])
+    with pytest.raises(ValueError, match="mismas columnas"):
+        buffer.extend([[2024, "01: AMAZONAS", "", "1", "2"]])
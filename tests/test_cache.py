@@ -0,0 +1,92 @@
+from datetime import date, datetime
+import asyncio
+import pandas as pd
+from consulta_amigable import ConsultaAmigable, ResponseCache
+from mock_server import COLUMNAS, EJECUCION, MockNavegador, TreeShape
+from test_http_engine import RUTA_MUNICIPALIDADES
+
+MONTOS = COLUMNAS + EJECUCION + ["Avance %"]
+
+
+def test_cache_http_servida_desde_disco(tmp_path):
+    shape = TreeShape(departamentos=2, provincias_por_departamento=2, municipalidades_por_provincia=2)
+    outputs = []
+    with MockNavegador(shape) as server:
+        for run in range(2):
+            scraper = ConsultaAmigable(headless=True, cache=tmp_path / "cache")
+            scraper.URL_ANUAL = server.url_anual
+            outputs.append(
+                asyncio.run(
+                    scraper.navegar_ruta(
+                        route=RUTA_MUNICIPALIDADES,
+                        years=2020,
+                        output_dir=tmp_path / f"run{run}",
+                        engine="http",
+                    )
+                )
+            )
+            if run == 0:
+                assert server.postbacks == 3 + 2 + 2 * 2
+                server.postbacks = 0
+        # Con la caché caliente no se envía ningún postback
+        assert server.postbacks == 0
+        assert scraper._cache.misses == 0
+
+    pd.testing.assert_frame_equal(pd.read_excel(outputs[0]), pd.read_excel(outputs[1]))
+
+
+def test_cache_ttl_anio_en_curso(tmp_path):
+    now = [1_000_000.0]
+    cache = ResponseCache(tmp_path, current_year_ttl=60, clock=lambda: now[0])
+    current = date.fromtimestamp(now[0]).year
+    for year in (current - 1, current):
+        cache.put("http", year, (("TOTAL", "Nivel de Gobierno"),), "page", {"year": year})
+
+    now[0] += 120
+    assert cache.get("http", current - 1, (("TOTAL", "Nivel de Gobierno"),), "page") == {"year": current - 1}
+    assert cache.get("http", current, (("TOTAL", "Nivel de Gobierno"),), "page") is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_cache_ttl_cruza_fin_de_anio(tmp_path):
+    now = [datetime(2024, 12, 31, 23, 0).timestamp()]
+    cache = ResponseCache(tmp_path, current_year_ttl=6 * 3600, clock=lambda: now[0])
+    path = (("TOTAL", "Nivel de Gobierno"),)
+    cache.put("http", 202412, path, "page", {"guardada": "diciembre"})
+
+    # Ya en 2025 la entrada sigue siendo la de un año en curso: vence igual
+    now[0] = datetime(2025, 1, 1, 2, 0).timestamp()
+    assert cache.get("http", 202412, path, "page") == {"guardada": "diciembre"}
+    now[0] = datetime(2025, 1, 1, 6, 0).timestamp()
+    assert cache.get("http", 202412, path, "page") is None
+
+    # Guardada con 2024 ya cerrado, no vence
+    cache.put("http", 202412, path, "page", {"guardada": "enero"})
+    now[0] = datetime(2026, 1, 1).timestamp()
+    assert cache.get("http", 202412, path, "page") == {"guardada": "enero"}
+
+
+def test_cache_playwright_recorrido(tmp_path):
+    cache = ResponseCache(tmp_path)
+    scraper = ConsultaAmigable(headless=True, cache=cache)
+    scraper.route_config = RUTA_MUNICIPALIDADES
+    fijos = (
+        ("TOTAL", "Nivel de Gobierno"),
+        ("M: GOBIERNOS LOCALES", "Gob.Loc./Mancom."),
+        ("M: MUNICIPALIDADES", "Departamento"),
+    )
+    cache.put("playwright", 2020, fijos, "rows", {"row_names": ["01: AMAZONAS"]})
+    provincia = fijos + (("01: AMAZONAS", "Provincia"),)
+    cache.put("playwright", 2020, provincia, "rows", {"row_names": ["0101: CHACHAPOYAS"]})
+    municipalidad = provincia + (("0101: CHACHAPOYAS", "Municipalidad"),)
+    cache.put(
+        "playwright", 2020, municipalidad, "table",
+        {"headers": ["Municipalidad", *MONTOS], "rows": [["", "010101-300001: CHACHAPOYAS", *"12345678"]]},
+    )
+
+    assert scraper._extract_year_from_cache(2020)
+    df = scraper._extracted_data.to_frame(["Año", "Departamento", "Provincia", "", "Municipalidad", *MONTOS])
+    assert df.astype(object).values.tolist() == [
+        [2020, "01: AMAZONAS", "0101: CHACHAPOYAS", "", "010101-300001: CHACHAPOYAS", *range(1, 9)]
+    ]
+    assert not scraper._extract_year_from_cache(2021)
@@ -0,0 +1,28 @@
+import pandas as pd
+from consulta_amigable.c_cleaner import CCleaner
+
+COLUMNAS = [
+    "Año", "Departamento", "", "PIA", "PIM", "Certificación", "Compromiso Anual",
+    "Atención de Compromiso Mensual", "Devengado", "Girado", "Avance %",
+]
+
+
+def test_transform_vectorizado():
+    df = pd.DataFrame(
+        [
+            [2024, "22: SAN MARTIN", "", "1,000", "2000", "", "5", "5", "5", "5", "59.6"],
+            [2024, "01: AMAZONAS", "", "300", "400", "7", "5", "5", "5", "5", "10.0"],
+            [2025, "22: SAN MARTIN", "", "10", "20", "7", "5", "5", "5", "5", "0.5"],
+        ],
+        columns=COLUMNAS,
+    )
+    out = CCleaner(input=df, output_path=None).transform()
+
+    assert list(out.columns[:3]) == ["Año", "UBI_DPTO", "Departamento"]
+    assert isinstance(out["Departamento"].dtype, pd.CategoricalDtype)
+    assert out["Departamento"].tolist() == ["San Martín", "Amazonas", "San Martín"]
+    assert out["UBI_DPTO"].tolist() == ["22", "01", "22"]
+    assert out["PIA"].tolist() == [1000, 300, 10]
+    assert out["PIA"].dtype == "int64"
+    assert out["Certificación"].isna().tolist() == [True, False, False]
+    assert out["Avance %"].tolist() == [59.6, 10.0, 0.5]
@@ -0,0 +1,39 @@
+from pathlib import Path
+from consulta_amigable import cargar_ruta_yaml
+
+YAML_DIR = Path(__file__).parent / "yamls"
+
+RUTA_ANTIGUA = """\
+route_name: antigua
+output_path: .
+levels:
+- name: Nivel 1
+  button: Departamento
+  fila: TOTAL
+  iterate: false
+  extract_table: false
+- name: Nivel 2
+  button: Provincia
+  fila: ITERAR
+  iterate: true
+  extract_table: false
+- name: Nivel 3
+  button: ''
+  fila: ITERAR
+  iterate: false
+  extract_table: true
+"""
+
+
+def test_fila_iterar_antigua(tmp_path):
+    path = tmp_path / "antigua.yaml"
+    path.write_text(RUTA_ANTIGUA, encoding="utf-8")
+    route = cargar_ruta_yaml(path)
+
+    assert [level.fila for level in route.levels] == ["TOTAL", "", "ITERAR"]
+    assert [level.iterate for level in route.levels] == [False, True, False]
+
+
+def test_yaml_antiguo_del_repositorio():
+    route = cargar_ruta_yaml(YAML_DIR / "municipalidades.yaml")
+    assert all(level.fila == "" for level in route.levels if level.iterate)
@@ -0,0 +1,79 @@
+import asyncio
+import json
+
+import pandas as pd
+from consulta_amigable import ConsultaAmigable
+from consulta_amigable.w_governor import ConcurrencyGovernor
+from mock_server import Latency, MockNavegador, TreeShape
+from test_http_engine import RUTA_MUNICIPALIDADES
+
+
+async def _navegar(governor: ConcurrencyGovernor, n: int, seconds: float, fail: bool = False) -> None:
+    async def one():
+        async with governor.slot():
+            await asyncio.sleep(seconds)
+            if fail:
+                raise TimeoutError
+
+    await asyncio.gather(*(one() for _ in range(n)), return_exceptions=True)
+
+
+def test_governor_aimd():
+    governor = ConcurrencyGovernor(max_limit=6, initial=2)
+    # Aumento aditivo mientras no hay errores ni latencia alta, hasta el tope
+    asyncio.run(_navegar(governor, 40, 0.001))
+    assert governor.limit == 6
+    assert governor.peak_in_flight <= 6
+
+    # Reducción multiplicativa con errores (una vez por ventana)
+    asyncio.run(_navegar(governor, 6, 0.001, fail=True))
+    assert governor.limit == 3
+
+    # Latencia muy por encima de la base
+    asyncio.run(_navegar(governor, 3, 0.2))
+    assert governor.limit == 1
+    assert [limit for _, limit, _ in governor.history] == [2, 3, 4, 5, 6, 3, 1]
+
+
+def test_governor_http_con_servidor_saturado(tmp_path):
+    shape = TreeShape(departamentos=4, provincias_por_departamento=4, municipalidades_por_provincia=3)
+    scraper = ConsultaAmigable(headless=True, retries=6, backoff=0.01)
+    governor = ConcurrencyGovernor(max_limit=8, initial=8)
+    with MockNavegador(shape, latency=Latency(postback=0.02, load=0.01)) as server:
+        server.capacity = 2
+        scraper.URL_ANUAL = server.url_anual
+        output = asyncio.run(
+            scraper.navegar_ruta(
+                route=RUTA_MUNICIPALIDADES,
+                years=2024,
+                output_dir=tmp_path,
+                concurrency=8,
+                engine="http",
+                adaptive=governor,
+            )
+        )
+        assert server.throttled > 0
+
+    # El límite bajó hasta lo que el servidor atiende y la ruta terminó completa
+    assert any(reason.startswith("errores") for _, _, reason in governor.history)
+    assert min(limit for _, limit, _ in governor.history) <= 2
+    assert len(pd.read_excel(output)) == 4 * 4 * 3
+    history = json.loads((tmp_path / "municipalidades.concurrency.json").read_text(encoding="utf-8"))
+    assert history["max_limit"] == 8
+    assert history["history"][0]["limit"] == 8
+
+
+def test_governor_playwright_un_anio_reparte_subarboles():
+    # Con un solo año el modo por años navegaría en una sola página y el
+    # gobernador no tendría nada que ajustar
+    scraper = ConsultaAmigable(headless=True)
+    scraper.years = [2024]
+    scraper._governor = ConcurrencyGovernor(max_limit=3)
+    modos = []
+
+    async def work_stealing(concurrency):
+        modos.append(("work_stealing", concurrency))
+
+    scraper._extract_data_work_stealing = work_stealing
+    asyncio.run(scraper._extract("playwright", 3, work_stealing=False))
+    assert modos == [("work_stealing", 3)]
@@ -0,0 +1,105 @@
+from pathlib import Path
+import asyncio
+import pandas as pd
+from consulta_amigable import ConsultaAmigable, RouteConfig, LevelConfig
+from consulta_amigable.h_http_engine import parse_navegador_page
+from mock_server import MockNavegador, TreeShape
+
+YAML_DIR = Path(__file__).parent / "yamls"
+
+RUTA_MUNICIPALIDADES = RouteConfig(
+    route_name="municipalidades",
+    output_path=".",
+    levels=[
+        LevelConfig(name="Nivel 1", button="Nivel de Gobierno", fila="TOTAL"),
+        LevelConfig(name="Nivel 2", button="Gob.Loc./Mancom.", fila="M: GOBIERNOS LOCALES"),
+        LevelConfig(name="Nivel 3", button="Departamento", fila="M: MUNICIPALIDADES"),
+        LevelConfig(name="Nivel 4", button="Provincia", fila="", iterate=True),
+        LevelConfig(name="Nivel 5", button="Municipalidad", fila="", iterate=True),
+        LevelConfig(name="Nivel 6", button="", fila="", extract_table=True),
+    ],
+)
+
+
+def test_http_ruta_salud(tmp_path):
+    scraper = ConsultaAmigable(headless=True)
+    with MockNavegador(TreeShape(departamentos=25)) as server:
+        scraper.URL_ANUAL = server.url_anual
+        output = asyncio.run(
+            scraper.navegar_ruta(
+                route=YAML_DIR / "salud.yaml",
+                years=[2021, 2020],
+                output_dir=tmp_path,
+                engine="http",
+            )
+        )
+        assert server.postbacks == 2 * 3
+
+    df = pd.read_excel(output)
+    assert len(df) == 2 * 25
+    assert list(df["Año"].unique()) == [2020, 2021]
+    assert list(df.columns[:3]) == ["Año", "UBI_DPTO", "Departamento"]
+    assert df["Girado"].dtype.kind in "if"
+
+
+def test_http_ruta_iterada(tmp_path):
+    shape = TreeShape(departamentos=2, provincias_por_departamento=3, municipalidades_por_provincia=4)
+    scraper = ConsultaAmigable(headless=True)
+    with MockNavegador(shape) as server:
+        scraper.URL_ANUAL = server.url_anual
+        output = asyncio.run(
+            scraper.navegar_ruta(
+                route=RUTA_MUNICIPALIDADES,
+                years=2024,
+                output_dir=tmp_path,
+                concurrency=4,
+                engine="http",
+            )
+        )
+        # 3 postbacks fijos + 1 por departamento + 1 por provincia
+        assert server.postbacks == 3 + 2 + 2 * 3
+
+    df = pd.read_excel(output)
+    assert len(df) == 2 * 3 * 4
+    assert list(df.columns[:8]) == [
+        "Año", "UBI_DPTO", "Departamento", "UBI_PROV", "Provincia",
+        "UBI_DIST", "COD_SIAF", "Municipalidad",
+    ]
+    # Mismo orden que el recorrido secuencial
+    assert df["UBI_DIST"].astype(str).str.zfill(6).is_monotonic_increasing
+
+
+def test_snapshot_encabezados_agrupados():
+    server = MockNavegador()
+    html = server.render_navegar(2024, [["TOTAL", "Departamento"]])
+    snapshot = parse_navegador_page("http://localhost/Navegar.aspx", html).snapshot()
+
+    assert snapshot.headers == [
+        "Departamento", "PIA", "PIM", "Certificación", "Compromiso Anual",
+        "Atención de Compromiso Mensual", "Devengado", "Girado", "Avance %",
+    ]
+    # Cada fila trae la celda del botón más una celda por encabezado
+    assert snapshot.rows[0][1] == "01: AMAZONAS"
+    assert all(len(row) == len(snapshot.headers) + 1 for row in snapshot.rows)
+    server.stop()
+
+
+def test_http_yaml_desbalanceado(tmp_path):
+    # municipalidades.yaml es de una versión anterior de crear_ruta (fila "ITERAR")
+    shape = TreeShape(departamentos=2, provincias_por_departamento=[1, 3], municipalidades_por_provincia=[2, 1])
+    scraper = ConsultaAmigable(headless=True)
+    with MockNavegador(shape, latency=0.001) as server:
+        scraper.URL_ANUAL = server.url_anual
+        output = asyncio.run(
+            scraper.navegar_ruta(
+                route=YAML_DIR / "municipalidades.yaml",
+                years=2024,
+                output_dir=tmp_path,
+                concurrency=3,
+                engine="http",
+            )
+        )
+        hojas = [path for _, path in server.history if len(path) == 5]
+
+    assert len(hojas) == 1 + 3
+    assert len(pd.read_excel(output)) == sum(len(server.rows_for(path)) for path in hojas)
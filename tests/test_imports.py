@@ -0,0 +1,39 @@
+import subprocess
+import sys
+
+import consulta_amigable
+
+
+def test_import_minimo_no_carga_dependencias_pesadas():
+    code = (
+        "import logging, sys\n"
+        "from consulta_amigable import RouteConfig, cargar_ruta_yaml\n"
+        "heavy = ['playwright', 'pandas', 'questionary', 'rich', 'consulta_amigable.b_scraper']\n"
+        "print([m for m in heavy if m in sys.modules])\n"
+        "print(logging.getLogger('consulta_amigable').handlers)\n"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.splitlines() == ["[]", "[]"]
+
+
+def test_import_scraper_no_carga_dependencias_pesadas():
+    code = (
+        "import sys\n"
+        "from consulta_amigable import ConsultaAmigable\n"
+        "ConsultaAmigable(headless=True)\n"
+        "heavy = ['playwright', 'httpx', 'pandas', 'numpy', 'rich', 'pyarrow', 'ubigeos_peru']\n"
+        "print([m for m in heavy if m in sys.modules])\n"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.splitlines() == ["[]"]
+
+
+def test_nombres_publicos_al_primer_uso():
+    assert set(consulta_amigable.__all__) <= set(dir(consulta_amigable))
+    assert consulta_amigable.ConsultaAmigable.__module__ == "consulta_amigable.b_scraper"
+    try:
+        consulta_amigable.NoExiste
+    except AttributeError:
+        pass
+    else:
+        raise AssertionError("Se esperaba AttributeError")
@@ -0,0 +1,83 @@
+import asyncio
+import pandas as pd
+import pytest
+from consulta_amigable import ConsultaAmigable, PartitionedStore
+from consulta_amigable.h_http_engine import monthly_url_template
+from consulta_amigable.s_period import expand_periods, split_period
+from mock_server import MockNavegador, TreeShape
+from test_http_engine import YAML_DIR
+
+
+def navegar_mensual(server, output_dir, months, output_format="excel"):
+    scraper = ConsultaAmigable(headless=True)
+    scraper.URL_MENSUAL = server.url_mensual
+    return asyncio.run(
+        scraper.navegar_ruta(
+            route=YAML_DIR / "salud.yaml",
+            years=2024,
+            months=months,
+            output_dir=output_dir,
+            concurrency=4,
+            engine="http",
+            output_format=output_format,
+        )
+    )
+
+
+def test_mensual_excel(tmp_path):
+    with MockNavegador(TreeShape(departamentos=3)) as server:
+        output = navegar_mensual(server, tmp_path, months=[2, 1])
+
+    df = pd.read_excel(output)
+    assert list(df.columns[:4]) == ["Año", "Mes", "UBI_DPTO", "Departamento"]
+    assert list(zip(df["Año"], df["Mes"])) == [(2024, 1)] * 3 + [(2024, 2)] * 3
+    # Cada mes tiene sus propios montos
+    assert not df[df["Mes"] == 1]["PIM"].equals(df[df["Mes"] == 2]["PIM"])
+
+
+def test_mensual_incremental(tmp_path):
+    with MockNavegador(TreeShape(departamentos=3)) as server:
+        navegar_mensual(server, tmp_path, months=[1, 2], output_format="parquet")
+        navegar_mensual(server, tmp_path, months=3, output_format="parquet")
+
+    store = PartitionedStore(tmp_path / "salud")
+    assert store.years() == [2024]
+    assert store.months(2024) == [1, 2, 3]
+    df = store.read()
+    assert len(df) == 3 * 3
+    assert sorted(df["Mes"].unique()) == [1, 2, 3]
+
+
+def test_periodos():
+    assert expand_periods([2023, 2024], [12, 1]) == [202312, 202301, 202412, 202401]
+    assert split_period(202403) == (2024, 3)
+    assert split_period(2024) == (2024, None)
+
+
+def test_mensual_desde_la_pagina(tmp_path):
+    # Con la URL por defecto (sin `{}`) el año y el mes se eligen en la página
+    with MockNavegador(TreeShape(departamentos=3)) as server:
+        esperado = pd.read_excel(navegar_mensual(server, tmp_path / "plantilla", months=[1, 2]))
+        scraper = ConsultaAmigable(headless=True)
+        scraper.URL_MENSUAL = server.url_mensual_pagina
+        output = asyncio.run(
+            scraper.navegar_ruta(
+                route=YAML_DIR / "salud.yaml", years=2024, months=[1, 2],
+                output_dir=tmp_path / "pagina", engine="http",
+            )
+        )
+
+    pd.testing.assert_frame_equal(pd.read_excel(output), esperado)
+
+
+def test_url_mensual_mal_configurada(tmp_path):
+    assert not monthly_url_template(ConsultaAmigable.URL_MENSUAL)
+    scraper = ConsultaAmigable(headless=True)
+    for url in ("", "https://ejemplo/mensual/?y={}"):
+        scraper.URL_MENSUAL = url
+        with pytest.raises(ValueError):
+            asyncio.run(
+                scraper.navegar_ruta(
+                    route=YAML_DIR / "salud.yaml", years=2024, months=1, output_dir=tmp_path, engine="http"
+                )
+            )
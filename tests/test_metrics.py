@@ -0,0 +1,42 @@
+import asyncio
+import json
+from consulta_amigable import ConsultaAmigable, RunMetrics
+from mock_server import MockNavegador, TreeShape
+from test_http_engine import RUTA_MUNICIPALIDADES
+
+
+def test_metricas_ruta_http(tmp_path):
+    shape = TreeShape(departamentos=2, provincias_por_departamento=3, municipalidades_por_provincia=4)
+    scraper = ConsultaAmigable(headless=True)
+    with MockNavegador(shape) as server:
+        scraper.URL_ANUAL = server.url_anual
+        asyncio.run(
+            scraper.navegar_ruta(
+                route=RUTA_MUNICIPALIDADES,
+                years=2024,
+                output_dir=tmp_path,
+                engine="http",
+                metrics_interval=0.01,
+            )
+        )
+        postbacks = server.postbacks
+
+    data = json.loads((tmp_path / "municipalidades.metrics.json").read_text(encoding="utf-8"))
+    assert data["by_action"]["postback"]["count"] == postbacks
+    assert data["by_action"]["clean"]["count"] == 1
+    assert data["rows_by_level"] == {"Nivel 6": 2 * 3 * 4}
+    assert "Nivel 5" in data["by_level"]
+
+    prom = (tmp_path / "municipalidades.prom").read_text(encoding="utf-8")
+    assert 'consulta_amigable_rows_total{route="municipalidades",level="Nivel 6"} 24' in prom
+
+
+def test_histograma_cuantiles():
+    metrics = RunMetrics("r")
+    for seconds in (0.02, 0.02, 0.02, 3.0):
+        metrics.observe("click_row", "Provincia", seconds)
+    hist = metrics.by_action()["click_row"]
+    assert hist.count == 4
+    assert hist.quantile(0.5) == 0.025
+    assert hist.quantile(0.95) == 3.0
+    assert 'le="+Inf"} 4' in metrics.to_prometheus()
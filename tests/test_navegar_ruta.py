@@ -12,14 +12,14 @@ scraper = ConsultaAmigable(
 def test_ruta_municipalidades():
     pass
 
-def test_ruta_salud():
+def test_ruta_salud(tmp_path):
     asyncio.run(
         scraper.navegar_ruta(
             route=YAML_DIR / "salud.yaml",
             years=range(2020, 2025),
-            output_dir=PRODUCTOS_DIR,
+            output_dir=tmp_path,
         )
     )
 
 if __name__ == "__main__":
-    test_ruta_salud()
+    test_ruta_salud(PRODUCTOS_DIR)
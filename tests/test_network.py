@@ -0,0 +1,57 @@
+import asyncio
+from types import SimpleNamespace
+
+from consulta_amigable.j_network import BlockingProfile, RequestBlocker
+
+
+class FakeRoute:
+    def __init__(self, resource_type: str, url: str):
+        self.request = SimpleNamespace(resource_type=resource_type, url=url)
+        self.aborted = False
+
+    async def abort(self, reason: str) -> None:
+        self.aborted = True
+
+    async def continue_(self) -> None:
+        pass
+
+
+def fake_context(heads: list):
+    async def head(url, timeout):
+        heads.append(url)
+        await asyncio.sleep(3600)
+
+    return SimpleNamespace(request=SimpleNamespace(head=head))
+
+
+def test_blocker_no_mide_por_defecto():
+    heads = []
+    blocker = RequestBlocker()
+
+    async def run():
+        route = FakeRoute("image", "http://x/logo.png")
+        await blocker._handle(fake_context(heads), route)
+        await blocker.close()
+        return route
+
+    route = asyncio.run(run())
+    assert route.aborted and blocker.blocked == 1
+    assert heads == [] and "KB" not in blocker.summary()
+    assert "bytes ahorrados: no medidos" in blocker.summary()
+
+
+def test_blocker_cancela_mediciones_pendientes():
+    heads = []
+    blocker = RequestBlocker(BlockingProfile(measure_savings=True))
+
+    async def run():
+        await blocker._handle(fake_context(heads), FakeRoute("image", "http://x/logo.png"))
+        await asyncio.sleep(0)
+        pending = set(blocker._pending)
+        await blocker.close()
+        return pending
+
+    pending = asyncio.run(run())
+    assert heads == ["http://x/logo.png"]
+    assert pending and all(task.cancelled() for task in pending)
+    assert not blocker._pending
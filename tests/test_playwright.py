@@ -0,0 +1,98 @@
+import asyncio
+import pandas as pd
+import pytest
+from playwright.async_api import async_playwright
+from consulta_amigable import ConsultaAmigable
+from fake_browser import ConsultaSimulada
+from mock_server import MockNavegador, TreeShape
+from test_http_engine import RUTA_MUNICIPALIDADES
+
+# Motor "playwright" contra el mock local; las filas se comparan con las del
+# motor "http". Cada prueba corre con páginas simuladas sobre HTTP
+# (`fake_browser`) y con Chromium; sin Chromium (`playwright install chromium`)
+# solo se omiten las de Chromium.
+SHAPE = TreeShape(departamentos=3, provincias_por_departamento=2, municipalidades_por_provincia=2)
+# Clicks para llegar a la tabla de departamentos: fila y botón de 3 niveles fijos
+CLICKS_FIJOS = 3 * 2
+
+
+async def chromium_disponible() -> bool:
+    try:
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=True)
+            await browser.close()
+        return True
+    except Exception:
+        return False
+
+
+@pytest.fixture(scope="module", params=["simulado", "chromium"])
+def navegador(request):
+    if request.param == "simulado":
+        return ConsultaSimulada
+    if not asyncio.run(chromium_disponible()):
+        pytest.skip("Chromium no está instalado (playwright install chromium)")
+    return ConsultaAmigable
+
+
+def navegar(
+    server, output_dir, years, navegador=ConsultaAmigable, engine="playwright", navigation="back", **kwargs
+):
+    scraper = navegador(headless=True, navigation=navigation)
+    scraper.URL_ANUAL = server.url_anual
+    output = asyncio.run(
+        scraper.navegar_ruta(
+            route=RUTA_MUNICIPALIDADES, years=years, output_dir=output_dir, engine=engine, **kwargs
+        )
+    )
+    return scraper, pd.read_excel(output)
+
+
+def test_playwright_anios_en_paralelo(navegador, tmp_path):
+    with MockNavegador(SHAPE) as server:
+        _, esperado = navegar(server, tmp_path / "http", [2023, 2024], engine="http")
+        scraper, df = navegar(server, tmp_path / "playwright", [2023, 2024], navegador, concurrency=2)
+
+    pd.testing.assert_frame_equal(df, esperado)
+    # Por año: cada departamento cuesta fila + botón + volver, más lo mismo por
+    # cada una de sus provincias
+    assert scraper._clicks_number == 2 * (CLICKS_FIJOS + 3 * (3 + 2 * 3))
+
+
+def test_playwright_work_stealing(navegador, tmp_path):
+    with MockNavegador(SHAPE) as server:
+        _, esperado = navegar(server, tmp_path / "http", 2024, engine="http")
+        scraper, df = navegar(
+            server, tmp_path / "playwright", 2024, navegador, concurrency=3, work_stealing=True
+        )
+
+    pd.testing.assert_frame_equal(df, esperado)
+    # Cada subárbol (el año, 2 departamentos y 3 provincias publicados) repite su
+    # camino desde la página inicial hasta una tabla de municipalidades: 5 pasos
+    assert scraper._clicks_number == (1 + 2 + 3) * 5 * 2
+
+
+def test_playwright_navegacion_back(navegador, tmp_path):
+    with MockNavegador(SHAPE, latency=0.02) as server:
+        _, esperado = navegar(server, tmp_path / "http", 2024, engine="http")
+        scraper, df = navegar(server, tmp_path / "playwright", 2024, navegador, navigation="back")
+
+    pd.testing.assert_frame_equal(df, esperado)
+    # Cada postback y cada `go_back` se espera hasta que llega la tabla nueva:
+    # ninguna fila se lee de la página anterior ni hace falta reintentar
+    assert scraper._clicks_number == CLICKS_FIJOS + 3 * (3 + 2 * 3)
+    assert scraper.metrics.events["retry"] == 0 and scraper.metrics.events["desync"] == 0
+
+
+def test_playwright_navegacion_jump(navegador, tmp_path):
+    with MockNavegador(SHAPE) as server:
+        _, esperado = navegar(server, tmp_path / "http", 2024, engine="http")
+        server.reset_stats()
+        scraper, df = navegar(server, tmp_path / "playwright", 2024, navegador, navigation="jump")
+        postbacks = server.postbacks
+
+    pd.testing.assert_frame_equal(df, esperado)
+    # Cada fila iterada es un solo postback reenviado desde la página actual,
+    # sin volver atrás: los mismos postbacks que el motor "http"
+    assert scraper._clicks_number == CLICKS_FIJOS + 3 * (1 + 2 * 1)
+    assert postbacks == 3 + 3 + 3 * 2
@@ -0,0 +1,50 @@
+import asyncio
+import json
+import pandas as pd
+from consulta_amigable import ConsultaAmigable
+from consulta_amigable.t_process import decode_frame, encode_frame, plan_units, split_units
+from mock_server import MockNavegador, TreeShape
+from test_http_engine import RUTA_MUNICIPALIDADES
+
+
+def navegar(server, output_dir, years, processes):
+    scraper = ConsultaAmigable(headless=True)
+    scraper.URL_ANUAL = server.url_anual
+    output = asyncio.run(
+        scraper.navegar_ruta(
+            route=RUTA_MUNICIPALIDADES,
+            years=years,
+            output_dir=output_dir,
+            concurrency=2,
+            engine="http",
+            processes=processes,
+        )
+    )
+    return scraper, output
+
+
+def test_procesos_igual_que_un_proceso(tmp_path):
+    shape = TreeShape(departamentos=3, provincias_por_departamento=2, municipalidades_por_provincia=2)
+    with MockNavegador(shape) as server:
+        _, esperado = navegar(server, tmp_path / "uno", [2023, 2024], processes=1)
+        # Más procesos que años: cada año se parte en bloques de provincias
+        scraper, output = navegar(server, tmp_path / "dos", [2023, 2024], processes=3)
+
+    assert scraper._completed
+    pd.testing.assert_frame_equal(pd.read_excel(output), pd.read_excel(esperado))
+    summary = json.loads((tmp_path / "dos" / "municipalidades.processes.json").read_text(encoding="utf-8"))
+    assert summary["processes"] == 3
+    assert summary["rows"] == 2 * 3 * 2 * 2
+
+
+def test_reparto_de_unidades():
+    units = plan_units([2024], RUTA_MUNICIPALIDADES.levels, processes=3)
+    assert units == [(2024, (0, 3)), (2024, (1, 3)), (2024, (2, 3))]
+    assert plan_units([2023, 2024], RUTA_MUNICIPALIDADES.levels, 2) == [(2023, None), (2024, None)]
+    assert split_units(units, 2) == [[units[0], units[2]], [units[1]]]
+
+    df = pd.DataFrame(
+        {"Año": [2024, 2024], "Provincia": pd.Categorical(["01: AMAZONAS", "02: ANCASH"]),
+         "": pd.Categorical(["", ""]), "PIM": [1000.0, 2000.5]}
+    )
+    pd.testing.assert_frame_equal(decode_frame(encode_frame(df)), df)
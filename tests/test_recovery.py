@@ -0,0 +1,80 @@
+import asyncio
+import pandas as pd
+import pytest
+from playwright.async_api import Error as PlaywrightError
+from consulta_amigable import ConsultaAmigable
+from consulta_amigable.g_frontier import FrontierQueue, SubtreeTask
+from mock_server import MockNavegador, TreeShape
+from test_http_engine import RUTA_MUNICIPALIDADES
+
+
+def test_http_reintenta_postbacks(tmp_path):
+    shape = TreeShape(departamentos=2, provincias_por_departamento=2, municipalidades_por_provincia=2)
+    scraper = ConsultaAmigable(headless=True, backoff=0.01)
+    with MockNavegador(shape) as server:
+        server.fail_postbacks = 2
+        scraper.URL_ANUAL = server.url_anual
+        output = asyncio.run(
+            scraper.navegar_ruta(
+                route=RUTA_MUNICIPALIDADES, years=2024, output_dir=tmp_path, engine="http"
+            )
+        )
+
+    assert len(pd.read_excel(output)) == 2 * 2 * 2
+    assert scraper.metrics.events["retry"] == 2
+
+
+def test_recuperacion_repite_camino():
+    scraper = ConsultaAmigable(headless=True, retries=2, backoff=0)
+    scraper.route_config = RUTA_MUNICIPALIDADES
+    replays = []
+    attempts = []
+
+    async def replay(upto):
+        replays.append(upto)
+
+    async def step():
+        attempts.append(len(attempts))
+        if len(attempts) < 3:
+            raise PlaywrightError("Timeout 15000ms exceeded")
+        return "ok"
+
+    scraper._replay_path = replay
+    assert asyncio.run(scraper._with_recovery(step, upto=3)) == "ok"
+    assert replays == [3, 3]
+    assert scraper.metrics.events["retry"] == 2
+
+    attempts.clear()
+    scraper._retries = 1
+    with pytest.raises(PlaywrightError):
+        asyncio.run(scraper._with_recovery(step, upto=3))
+
+
+def test_reintento_no_repite_tablas_emitidas():
+    scraper = ConsultaAmigable(headless=True, retries=2, backoff=0)
+    scraper.route_config = RUTA_MUNICIPALIDADES
+    scraper._year = 2024
+    scraper._context = {"Departamento": "AMAZONAS"}
+    attempts = []
+
+    async def step():
+        # Cada intento vuelve a extraer la tabla del departamento antes de fallar
+        scraper._emit_rows([["001", "CHACHAPOYAS"]], ["AMAZONAS"], (0,), 1)
+        attempts.append(len(attempts))
+        if len(attempts) < 2:
+            raise PlaywrightError("Timeout 15000ms exceeded")
+
+    asyncio.run(scraper._with_recovery(step, upto=None))
+    assert len(attempts) == 2
+    assert len(scraper._extracted_data) == 1
+
+
+def test_frontier_publica_cada_subarbol_una_vez():
+    frontier = FrontierQueue()
+    root = SubtreeTask(year=2024)
+    child = root.child(1, "AMAZONAS", "Provincia", "Departamento")
+
+    assert frontier.put(root) and frontier.put(child)
+    # Un reintento del padre vuelve a publicar el mismo hijo
+    assert not frontier.put(root.child(1, "AMAZONAS", "Provincia", "Departamento"))
+    assert frontier.published == 2 and frontier.qsize() == 2
@@ -0,0 +1,128 @@
+import json
+from pathlib import Path
+import asyncio
+import pandas as pd
+from consulta_amigable import ConsultaAmigable, LevelConfig, ResponseCache, RouteConfig
+from consulta_amigable.k_checkpoint import RunJournal
+from mock_server import MockNavegador
+
+YAML_DIR = Path(__file__).parent / "yamls"
+
+
+def test_reanudar_ruta(tmp_path):
+    journal = tmp_path / "salud.journal.jsonl"
+    with MockNavegador() as server:
+        server.fail_years = {2021}
+        scraper = ConsultaAmigable(headless=True)
+        scraper.URL_ANUAL = server.url_anual
+        asyncio.run(
+            scraper.navegar_ruta(
+                route=YAML_DIR / "salud.yaml",
+                years=[2020, 2021],
+                output_dir=tmp_path,
+                engine="http",
+                journal=True,
+            )
+        )
+        # La ejecución falló en 2021: la bitácora se conserva con 2020
+        assert journal.exists()
+
+        server.fail_years = set()
+        server.postbacks = 0
+        scraper = ConsultaAmigable(headless=True)
+        scraper.URL_ANUAL = server.url_anual
+        output = asyncio.run(
+            scraper.navegar_ruta(
+                route=YAML_DIR / "salud.yaml",
+                years=[2020, 2021],
+                output_dir=tmp_path,
+                engine="http",
+                resume=True,
+            )
+        )
+        # Solo se navegó 2021
+        assert server.postbacks == 3
+
+    assert not journal.exists()
+    df = pd.read_excel(output)
+    assert list(df["Año"].unique()) == [2020, 2021]
+    assert len(df) == 2 * 3
+
+
+def test_bitacora_tablas_de_varios_niveles(tmp_path):
+    # Dos niveles extraen tabla con el mismo contexto (ningún nivel iterado)
+    route = RouteConfig(
+        route_name="dos_tablas",
+        output_path=".",
+        levels=[
+            LevelConfig(name="Nivel 1", button="Nivel de Gobierno", fila="TOTAL", extract_table=True),
+            LevelConfig(name="Nivel 2", button="", fila="", extract_table=True),
+        ],
+    )
+    cache = ResponseCache(tmp_path / "cache")
+    cache.put("playwright", 2020, (), "table", {"headers": ["Nombre", "PIA"], "rows": [["", "TOTAL", "30"]]})
+    cache.put(
+        "playwright", 2020, (("TOTAL", "Nivel de Gobierno"),), "table",
+        {"headers": ["Nombre", "PIA"], "rows": [["", "E: GOBIERNO NACIONAL", "10"], ["", "R: GOBIERNOS REGIONALES", "20"]]},
+    )
+    scraper = ConsultaAmigable(headless=True, cache=cache)
+    scraper.route_config = route
+    scraper._journal = RunJournal(tmp_path / "dos_tablas.journal.jsonl", route_name="dos_tablas")
+
+    assert scraper._extract_year_from_cache(2020)
+    rows = list(scraper._journal.iter_rows())
+    assert len(scraper._extracted_data) == len(rows) == 3
+    assert [row[2] for row in rows] == ["TOTAL", "E: GOBIERNO NACIONAL", "R: GOBIERNOS REGIONALES"]
+
+    # Al reanudar se recuperan las dos tablas
+    scraper._journal.close()
+    journal = RunJournal(tmp_path / "dos_tablas.journal.jsonl", route_name="dos_tablas", resume=True)
+    assert list(journal.iter_rows(previous_only=True)) == rows
+    assert journal.has_previous_rows(2020, (), 0) and journal.has_previous_rows(2020, (), 1)
+    journal.close()
+
+
+def test_sin_bitacora_por_defecto(tmp_path):
+    with MockNavegador() as server:
+        server.fail_years = {2021}
+        scraper = ConsultaAmigable(headless=True)
+        scraper.URL_ANUAL = server.url_anual
+        asyncio.run(
+            scraper.navegar_ruta(
+                route=YAML_DIR / "salud.yaml", years=[2020, 2021], output_dir=tmp_path, engine="http"
+            )
+        )
+
+    assert not list(tmp_path.glob("*.journal.jsonl"))
+    # Sin bitácora, las filas del año que sí se extrajo se guardan igual
+    assert len(pd.read_excel(tmp_path / "salud.xlsx")) == 3
+
+
+def test_bitacora_agrupa_fsync(tmp_path, monkeypatch):
+    fsyncs = []
+    monkeypatch.setattr("consulta_amigable.k_checkpoint.os.fsync", fsyncs.append)
+    journal = RunJournal(tmp_path / "r.journal.jsonl", route_name="r", fsync_interval=3600)
+    for year in range(2000, 2010):
+        journal.record_rows(year, [], (), [["a", 1]])
+        journal.mark_done(year, [])
+    assert fsyncs == []
+    journal.close()
+    assert len(fsyncs) == 1
+
+    journal = RunJournal(tmp_path / "r.journal.jsonl", route_name="r", resume=True)
+    assert journal.is_done(2009, []) and len(list(journal.iter_rows())) == 10
+    journal.close(delete=True)
+
+
+def test_bitacora_guarda_prefijo_una_vez(tmp_path):
+    journal = RunJournal(tmp_path / "r.journal.jsonl", route_name="r")
+    journal.record_rows(2024, ["AMAZONAS"], (0,), [["001", "10"], ["002", "20"]], 1, [2024, "AMAZONAS"])
+    journal.close()
+
+    record = json.loads((tmp_path / "r.journal.jsonl").read_text(encoding="utf-8"))
+    assert record["prefix"] == [2024, "AMAZONAS"] and record["rows"] == [["001", "10"], ["002", "20"]]
+    journal = RunJournal(tmp_path / "r.journal.jsonl", route_name="r", resume=True)
+    assert list(journal.iter_rows(previous_only=True)) == [
+        [2024, "AMAZONAS", "001", "10"], [2024, "AMAZONAS", "002", "20"],
+    ]
+    journal.close(delete=True)
@@ -0,0 +1,94 @@
+import asyncio
+import subprocess
+import sys
+import pandas as pd
+import pytest
+from consulta_amigable import ConsultaAmigable, guardar_ruta_yaml
+from consulta_amigable.g_frontier import keeps_table
+from consulta_amigable.u_shard import fusionar_partes, parse_shard
+from mock_server import MockNavegador, TreeShape
+from test_http_engine import RUTA_MUNICIPALIDADES
+
+SHAPE = TreeShape(departamentos=3, provincias_por_departamento=2, municipalidades_por_provincia=2)
+
+PARTE = """
+import asyncio, sys
+from consulta_amigable import ConsultaAmigable
+scraper = ConsultaAmigable(headless=True)
+scraper.URL_ANUAL = sys.argv[1]
+asyncio.run(
+    scraper.navegar_ruta(
+        route=sys.argv[2], years=[2023, 2024], output_dir=sys.argv[3], engine="http",
+        shard=sys.argv[4],
+    )
+)
+"""
+
+
+def navegar(server, output_dir, **kwargs):
+    scraper = ConsultaAmigable(headless=True)
+    scraper.URL_ANUAL = server.url_anual
+    return asyncio.run(
+        scraper.navegar_ruta(
+            route=RUTA_MUNICIPALIDADES, years=[2023, 2024], output_dir=output_dir,
+            engine="http", **kwargs,
+        )
+    )
+
+
+def test_partes_en_procesos_y_fusion(tmp_path):
+    route = tmp_path / "municipalidades.yaml"
+    guardar_ruta_yaml(RUTA_MUNICIPALIDADES, path=route)
+    partes = tmp_path / "partes"
+    with MockNavegador(SHAPE) as server:
+        esperado = navegar(server, tmp_path / "completo")
+        procesos = [
+            subprocess.Popen(
+                [sys.executable, "-c", PARTE, server.url_anual, str(route), str(partes), f"{i}/3"]
+            )
+            for i in range(3)
+        ]
+        assert [p.wait(timeout=120) for p in procesos] == [0, 0, 0]
+
+    subprocess.run(
+        [sys.executable, "-m", "consulta_amigable.u_shard", str(partes), "municipalidades"],
+        check=True,
+    )
+    pd.testing.assert_frame_equal(
+        pd.read_excel(partes / "municipalidades.xlsx"), pd.read_excel(esperado)
+    )
+
+
+def test_fusion_valida_las_partes(tmp_path):
+    with MockNavegador(SHAPE) as server:
+        navegar(server, tmp_path, shard="0/3")
+        navegar(server, tmp_path, shard=(2, 3))
+    with pytest.raises(ValueError, match=r"Faltan las partes \[1\]"):
+        fusionar_partes(tmp_path, "municipalidades")
+
+    with pytest.raises(ValueError):
+        parse_shard("3/3")
+
+
+
+def test_tablas_comunes_solo_en_el_primer_bloque():
+    levels = RUTA_MUNICIPALIDADES.levels
+    # Nivel 4 es el primer `iterate`: su tabla la ven todos los bloques del periodo
+    assert keeps_table(levels, 3, None) and keeps_table(levels, 3, (0, 2))
+    assert not keeps_table(levels, 3, (1, 2)) and not keeps_table(levels, 0, (1, 2))
+    assert keeps_table(levels, 5, (1, 2))
+
+
+def test_fusion_conserva_filas_iguales(tmp_path):
+    with MockNavegador(SHAPE) as server:
+        esperado = navegar(server, tmp_path / "completo")
+        for i in range(2):
+            navegar(server, tmp_path, shard=(i, 2), sink="jsonl")
+
+    # Dos filas idénticas en los datos no son un error de la fusión
+    parte = tmp_path / "municipalidades.shard-0-of-2.jsonl"
+    lineas = parte.read_text(encoding="utf-8").splitlines(keepends=True)
+    parte.write_text("".join([lineas[0], *lineas]), encoding="utf-8")
+
+    df = pd.read_excel(fusionar_partes(tmp_path, "municipalidades"))
+    assert len(df) == len(pd.read_excel(esperado)) + 1
@@ -0,0 +1,84 @@
+from pathlib import Path
+import asyncio
+import pandas as pd
+import pytest
+from consulta_amigable import ConsultaAmigable
+from consulta_amigable.l_sink import CsvSink, RowSink
+from mock_server import MockNavegador, TreeShape
+from test_http_engine import RUTA_MUNICIPALIDADES
+
+YAML_DIR = Path(__file__).parent / "yamls"
+
+
+def test_sink_csv_por_lotes(tmp_path):
+    shape = TreeShape(departamentos=2, provincias_por_departamento=3, municipalidades_por_provincia=4)
+    sink = CsvSink(tmp_path / "municipalidades_raw.csv", batch_size=5)
+    scraper = ConsultaAmigable(headless=True)
+    with MockNavegador(shape) as server:
+        scraper.URL_ANUAL = server.url_anual
+        output = asyncio.run(
+            scraper.navegar_ruta(
+                route=RUTA_MUNICIPALIDADES,
+                years=2024,
+                output_dir=tmp_path,
+                concurrency=4,
+                engine="http",
+                sink=sink,
+            )
+        )
+
+    assert len(scraper._extracted_data) == 0
+    assert sink.rows_written == 2 * 3 * 4
+    df = pd.read_csv(output)
+    assert len(df) == 2 * 3 * 4
+    assert list(df.columns[:8]) == [
+        "Año", "UBI_DPTO", "Departamento", "UBI_PROV", "Provincia",
+        "UBI_DIST", "COD_SIAF", "Municipalidad",
+    ]
+    assert df["Girado"].dtype.kind in "if"
+
+
+def test_sink_parquet_reanudado(tmp_path):
+    with MockNavegador() as server:
+        server.fail_years = {2021}
+        scraper = ConsultaAmigable(headless=True)
+        scraper.URL_ANUAL = server.url_anual
+        asyncio.run(
+            scraper.navegar_ruta(
+                route=YAML_DIR / "salud.yaml",
+                years=[2020, 2021],
+                output_dir=tmp_path,
+                engine="http",
+                sink="parquet",
+                journal=True,
+            )
+        )
+
+        server.fail_years = set()
+        scraper = ConsultaAmigable(headless=True)
+        scraper.URL_ANUAL = server.url_anual
+        output = asyncio.run(
+            scraper.navegar_ruta(
+                route=YAML_DIR / "salud.yaml",
+                years=[2020, 2021],
+                output_dir=tmp_path,
+                engine="http",
+                resume=True,
+                sink="parquet",
+            )
+        )
+
+    assert Path(output).name == "salud.parquet"
+    df = pd.read_parquet(output)
+    assert sorted(df["Año"].unique()) == [2020, 2021]
+    assert len(df) == 2 * 3
+
+
+def test_sink_incompleto_no_se_instancia(tmp_path):
+    class SoloEscribe(RowSink):
+        def _write_batch(self, df):
+            pass
+
+    for cls in (RowSink, SoloEscribe):
+        with pytest.raises(TypeError):
+            cls(tmp_path / "filas.csv")
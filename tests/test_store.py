@@ -0,0 +1,58 @@
+from pathlib import Path
+import asyncio
+import pandas as pd
+from consulta_amigable import ConsultaAmigable, PartitionedStore
+from mock_server import MockNavegador
+
+YAML_DIR = Path(__file__).parent / "yamls"
+
+
+def _navegar(server, years, output_dir, **kwargs):
+    scraper = ConsultaAmigable(headless=True)
+    scraper.URL_ANUAL = server.url_anual
+    return asyncio.run(
+        scraper.navegar_ruta(
+            route=YAML_DIR / "salud.yaml",
+            years=years,
+            output_dir=output_dir,
+            engine="http",
+            **kwargs,
+        )
+    )
+
+
+def test_parquet_particionado_por_anio(tmp_path):
+    with MockNavegador() as server:
+        output = _navegar(server, [2020, 2021], tmp_path, output_format="parquet")
+        store = PartitionedStore(output, "parquet")
+        assert Path(output) == tmp_path / "salud"
+        assert store.years() == [2020, 2021]
+        antes = (store.partition(2020) / "part-0.parquet").stat().st_mtime_ns
+
+        # Agregar un año solo escribe su partición
+        _navegar(server, [2022], tmp_path, output_format="parquet")
+
+    assert store.years() == [2020, 2021, 2022]
+    assert (store.partition(2020) / "part-0.parquet").stat().st_mtime_ns == antes
+    df = store.read()
+    assert df["Año"].tolist() == [2020] * 3 + [2021] * 3 + [2022] * 3
+    assert list(df.columns[:3]) == ["Año", "UBI_DPTO", "Departamento"]
+
+
+def test_feather_con_excel(tmp_path):
+    with MockNavegador() as server:
+        output = _navegar(
+            server, [2020], tmp_path, output_format="feather", export_excel=True, sink="csv"
+        )
+
+    assert len(PartitionedStore(output, "feather").read()) == 3
+    assert len(pd.read_excel(tmp_path / "salud.xlsx")) == 3
+
+
+def test_partes_en_orden_de_escritura(tmp_path):
+    store = PartitionedStore(tmp_path / "salud", "parquet")
+    for i in range(12):
+        store.write_frame(pd.DataFrame({"Año": [2024], "Fila": [i]}))
+
+    assert (store.partition(2024) / "part-11.parquet").exists()
+    assert store.read()["Fila"].tolist() == list(range(12))
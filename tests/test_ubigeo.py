@@ -0,0 +1,52 @@
+import pandas as pd
+import ubigeos_peru as ubg
+from consulta_amigable import n_ubigeo
+from consulta_amigable.c_cleaner import CCleaner
+from consulta_amigable.n_ubigeo import UbigeoNormalizer
+
+
+def test_normalizador_persistente(tmp_path):
+    path = tmp_path / "ubigeos.json"
+    valores = pd.Series(["SAN MARTIN", "AMAZONAS", "NACIONAL"])
+    esperado = ubg.validate_departamento(valores, on_error="capitalize").tolist()
+
+    normalizer = UbigeoNormalizer(path)
+    assert normalizer.normalize("departamento", valores).tolist() == esperado
+    assert (normalizer.hits, normalizer.misses) == (0, 3)
+    normalizer.save()
+
+    # Otra ejecución lee la tabla de disco y no vuelve a validar
+    normalizer = UbigeoNormalizer(path)
+    assert normalizer.normalize("departamento", valores).tolist() == esperado
+    assert (normalizer.hits, normalizer.misses) == (3, 0)
+
+
+def test_normalizador_lru(tmp_path):
+    normalizer = UbigeoNormalizer(tmp_path / "ubigeos.json", maxsize=2)
+    normalizer.normalize("departamento", pd.Series(["LIMA", "CUSCO"]))
+    normalizer.normalize("departamento", pd.Series(["LIMA"]))
+    normalizer.normalize("departamento", pd.Series(["PUNO"]))
+    assert [valor for _, valor in normalizer._values] == ["LIMA", "PUNO"]
+
+
+def test_resolucion_por_codigo(tmp_path):
+    normalizer = UbigeoNormalizer(tmp_path / "ubigeos.json")
+    nombres = normalizer.resolve(
+        "departamento",
+        codes=pd.Series(["07", "22", "98"]),
+        names=pd.Series(["PROVINCIA CONSTITUCIONAL DEL CALLAO", "SAN MARTIN", "EXTERIOR"]),
+        counts=pd.Series([10, 5, 1]).to_numpy(),
+    )
+    assert nombres.tolist() == ["Callao", "San Martín", "Exterior"]
+    assert (normalizer.code_hits, normalizer.fallbacks) == (15, 1)
+
+
+def test_normalizador_no_se_guarda_por_defecto(tmp_path):
+    normalizer = n_ubigeo.get_normalizer()
+    normalizer.normalize("departamento", pd.Series(["LIMA"]))
+    CCleaner._report_normalizer()
+    assert not normalizer.path.exists()
+
+    CCleaner._report_normalizer(save=True)
+    assert normalizer.path == tmp_path / "cache" / "ubigeos.json"
+    assert normalizer.path.exists()